@@ -0,0 +1,80 @@
+"""
+Reports memory used by AST nodes of generated program,
+compares slotted nodes with packed line spans against plain dataclasses with per instance dictionaries
+
+Usage: python -m benchmarks.ast_memory [number of statements]
+"""
+import dataclasses
+import gc
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, Tuple
+
+from compiler.parser import MParser, AST
+from compiler.scanner import MLexer
+
+
+def generate_source(statements: int) -> str:
+    chunk = (
+        'a = b + c * 2 - d;\n'
+        'while (a > 0) { a -= 1; print a, b; }\n'
+        'if (a == 1) x = A[i, j]; else x = -a;\n'
+        'for i = 0:n { s += A[i, 0] .* x; }\n'
+    )
+    return chunk * (statements // 4)
+
+
+def legacy_classes() -> Dict[type, type]:
+    """ Returns plain dataclasses with the same fields as AST nodes, as nodes were defined before """
+    classes = {}
+    for node_class in vars(AST).values():
+        if isinstance(node_class, type) and dataclasses.is_dataclass(node_class) and node_class is not AST.Node:
+            fields = [(f.name, f.type) for f in dataclasses.fields(node_class)]
+            classes[node_class] = dataclasses.make_dataclass(node_class.__name__, fields)
+    return classes
+
+
+def to_legacy(node: Any, classes: Dict[type, type]) -> Any:
+    if isinstance(node, list):
+        return [to_legacy(n, classes) for n in node]
+    if isinstance(node, AST.Node):
+        return classes[node.__class__](**{f.name: to_legacy(getattr(node, f.name), classes)
+                                          for f in dataclasses.fields(node)})
+    return node
+
+
+def count_nodes(node: Any) -> int:
+    if isinstance(node, list):
+        return sum(count_nodes(n) for n in node)
+    if dataclasses.is_dataclass(node):
+        return 1 + sum(count_nodes(getattr(node, f.name)) for f in dataclasses.fields(node))
+    return 0
+
+
+def measure(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """ Returns result of given function and number of bytes that remain allocated after it """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main(statements: int = 20000):
+    sys.setrecursionlimit(10000)
+    text = generate_source(statements)
+    classes = legacy_classes()
+
+    root, slotted = measure(lambda: MParser().parse(text, lexer=MLexer(), tracking=True))
+    legacy, plain = measure(lambda: to_legacy(root, classes))
+    nodes = count_nodes(root)
+
+    print(f'nodes: {nodes}')
+    print(f'before (dict based nodes): {plain / nodes:.1f} bytes per node, {plain / 2 ** 20:.2f} MB')
+    print(f' after (slotted nodes):    {slotted / nodes:.1f} bytes per node, {slotted / 2 ** 20:.2f} MB')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
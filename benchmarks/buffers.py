@@ -0,0 +1,53 @@
+"""
+Compares execution time of loops computing large matrices of the same shape in every iteration
+with and without pool of buffers reused by them
+
+Usage: python -m benchmarks.buffers [number of iterations] [size of matrices]
+"""
+import sys
+import time
+from typing import Tuple
+
+from compiler.interpreter import Interpreter, buffers
+from compiler.parser import MParser
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+
+# pool of buffers is large enough for all matrices of programs
+CAPACITY = 256 << 20
+
+PROGRAMS = {
+    'element wise': 'n = N; A = ones(n, n); B = ones(n, n); C = ones(n, n); k = 0; s = 0.; '
+                    'while (k < K) { X = A .* B .+ C; s += X[0, 0]; k += 1; }',
+    'initialization': 'n = N; k = 0; s = 0.; while (k < K) { Z = zeros(n, n); I = eye(n, n); Z += I; s += Z[0, 0]; '
+                      'k += 1; }',
+}
+
+
+def run(program: str, capacity: int, engine: str, iterations: int, size: int) -> Tuple[float, str]:
+    """ Returns time of execution and counters of pool of buffers """
+    root = MParser().parse(program.replace('K', str(iterations)).replace('N', str(size)), lexer=MLexer(), tracking=True)
+    TypeChecker().check(root)
+    buffers.configure(capacity)
+
+    try:
+        start = time.perf_counter()
+        Interpreter(engine).execute_with_return(root)
+        elapsed = time.perf_counter() - start
+
+        pool = buffers.pool()
+        return elapsed, f'{pool.hits} hits, {pool.misses} misses' if pool else ''
+    finally:
+        buffers.configure()
+
+
+def main(iterations: int = 200, size: int = 1000):
+    for name, program in PROGRAMS.items():
+        for engine in Interpreter.ENGINES:
+            (plain, _), (pooled, counters) = run(program, 0, engine, iterations, size), \
+                run(program, CAPACITY, engine, iterations, size)
+            print(f'{name} ({engine}): {plain:.3f} s, pooled {pooled:.3f} s ({plain / pooled:.1f}x), {counters}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
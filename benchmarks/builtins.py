@@ -0,0 +1,46 @@
+"""
+Compares execution time of reductions and products written as loops with the same computations done by builtins
+
+Usage: python -m benchmarks.builtins [size of vector]
+"""
+import sys
+import time
+
+from compiler.interpreter import Interpreter
+from compiler.parser import MParser
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+
+PROGRAMS = {
+    'sum': (
+        'A = ones(N); s = 0.; for i = 0:N s += A[i]; return s;',
+        'A = ones(N); return sum(A);',
+    ),
+    'max': (
+        'A = ones(N); m = 0.; for i = 0:N { if (A[i] > m) m = A[i]; } return m;',
+        'A = ones(N); return max(A);',
+    ),
+    'dot': (
+        'A = ones(N); B = ones(N); s = 0.; for i = 0:N s += A[i] * B[i]; return s;',
+        'A = ones(N); B = ones(N); return dot(A, B);',
+    ),
+}
+
+
+def run(program: str, size: int) -> float:
+    root = MParser().parse(program.replace('N', str(size)), lexer=MLexer(), tracking=True)
+    TypeChecker().check(root)
+
+    start = time.perf_counter()
+    Interpreter('vm').execute_with_return(root)
+    return time.perf_counter() - start
+
+
+def main(size: int = 1000000):
+    for name, (loop, builtin) in PROGRAMS.items():
+        looped, called = run(loop, size), run(builtin, size)
+        print(f'{name:>4}: loop {looped:.3f} s, builtin {called:.4f} s ({looped / called:.0f}x)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
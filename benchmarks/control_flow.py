@@ -0,0 +1,66 @@
+"""
+Compares execution time of interpreter engines on loops heavy in break, continue and return
+
+Usage: python -m benchmarks.control_flow [number of iterations]
+"""
+import sys
+import time
+
+from compiler.interpreter import Interpreter
+from compiler.parser import MParser
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+
+# programs are paired with number of runs, so short programs returning from nested loops are measured as well
+PROGRAMS = {
+    'continue on most iterations': ('''
+        s = 0;
+        for i = 0:N {
+            if (i / 10 * 10 != i) continue;
+            s += i;
+        }
+        return s;
+    ''', lambda n: 1),
+    'break out of inner loop': ('''
+        s = 0;
+        for i = 0:N {
+            j = 0;
+            while (true) {
+                j += 1;
+                if (j > 3) break;
+            }
+            s += j;
+        }
+        return s;
+    ''', lambda n: 1),
+    'return from nested loops': ('''
+        for i = 0:10 {
+            for j = 0:10 {
+                if (i * j == 9) return j;
+            }
+        }
+    ''', lambda n: n // 100),
+}
+
+
+def run(program: str, runs: int, engine: str, iterations: int) -> float:
+    root = MParser().parse(program.replace('N', str(iterations)), lexer=MLexer(), tracking=True)
+    TypeChecker().check(root)
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        Interpreter(engine).execute_with_return(root)
+    return time.perf_counter() - start
+
+
+def main(iterations: int = 100000):
+    for name, (program, runs) in PROGRAMS.items():
+        times = {engine: run(program, runs(iterations), engine, iterations) for engine in Interpreter.ENGINES}
+        baseline = times['tree']
+        print(f'{name}:')
+        for engine, elapsed in times.items():
+            print(f'  {engine:>8}: {elapsed:.3f} s ({baseline / elapsed:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
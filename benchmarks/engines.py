@@ -0,0 +1,60 @@
+"""
+Compares execution time of interpreter engines on loop heavy programs
+
+Usage: python -m benchmarks.engines [number of iterations]
+"""
+import sys
+import time
+
+from compiler.interpreter import Interpreter
+from compiler.parser import MParser
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+
+PROGRAMS = {
+    'arithmetic loop': '''
+        s = 0;
+        for i = 0:N {
+            s += i * 2 - 1;
+        }
+        return s;
+    ''',
+    'while with branches': '''
+        i = 0; even = 0;
+        while (i < N) {
+            if (i / 2 * 2 == i) even += 1; else even -= 1;
+            i += 1;
+        }
+        return even;
+    ''',
+    'array scan': '''
+        A = zeros(N); m = 0.;
+        for i = 0:N {
+            A[i] = i * 0.5;
+            if (A[i] > m) m = A[i];
+        }
+        return m;
+    ''',
+}
+
+
+def run(program: str, engine: str, iterations: int) -> float:
+    root = MParser().parse(program.replace('N', str(iterations)), lexer=MLexer(), tracking=True)
+    TypeChecker().check(root)
+
+    start = time.perf_counter()
+    Interpreter(engine).execute_with_return(root)
+    return time.perf_counter() - start
+
+
+def main(iterations: int = 100000):
+    for name, program in PROGRAMS.items():
+        times = {engine: run(program, engine, iterations) for engine in Interpreter.ENGINES}
+        baseline = times['tree']
+        print(f'{name}:')
+        for engine, elapsed in times.items():
+            print(f'  {engine:>8}: {elapsed:.3f} s ({baseline / elapsed:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,54 @@
+"""
+Compares peak memory and execution time of element wise expressions evaluated with and without fusion
+
+Usage: python -m benchmarks.fusion [size of matrix]
+"""
+import sys
+import time
+import tracemalloc
+
+from compiler.interpreter import ExpressionFuser, Interpreter
+from compiler.parser import MParser
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+
+PROGRAMS = {
+    'five operands': '''
+        A = ones(N, N); B = A .+ A; C = B .* B; E = C .- A; F = eye(N, N);
+        D = A .* B .+ C ./ E .- F;
+    ''',
+    'repeated update': '''
+        A = ones(N, N); B = A .+ A; D = zeros(N, N);
+        for i = 0:5 {
+            D = D .+ A .* B .- B ./ A;
+        }
+    ''',
+}
+
+
+def run(program: str, fuse: bool, size: int):
+    root = MParser().parse(program.replace('N', str(size)), lexer=MLexer(), tracking=True)
+    TypeChecker().check(root)
+    if fuse:
+        root = ExpressionFuser().fuse(root)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    Interpreter('closure').execute_with_return(root)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(size: int = 2000):
+    matrix = size * size * 8
+    for name, program in PROGRAMS.items():
+        print(f'{name}:')
+        for fuse in (False, True):
+            elapsed, peak = run(program, fuse, size)
+            print(f'  {"fused" if fuse else "plain":>6}: {elapsed:.3f} s, peak {peak / 2 ** 20:.0f} MiB ({peak / matrix:.1f} matrices)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
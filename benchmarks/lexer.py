@@ -0,0 +1,41 @@
+"""
+Compares throughput of lexer backends on generated source
+
+Usage: python -m benchmarks.lexer [size in kB]
+"""
+import sys
+import time
+
+from compiler.scanner import LEXERS
+
+
+def generate_source(size: int) -> str:
+    chunk = (
+        'A = [[1, 2.5, 3], [4, 5, 6.E2]];  # data row\n'
+        'for i = 0:n {\n'
+        '    if (A[i, 0] >= max) max = A[i, 0];\n'
+        '    s += A[i, 1] .* 2 - "text \\" quoted";\n'
+        '}\n'
+    )
+    return chunk * (size // len(chunk) + 1)
+
+
+def measure(lexer: str, text: str) -> float:
+    instance = LEXERS[lexer]()
+    instance.input(text)
+
+    start = time.perf_counter()
+    while instance.token():
+        pass
+    return time.perf_counter() - start
+
+
+def main(size: int = 1024):
+    text = generate_source(size * 1024)
+    for lexer in LEXERS:
+        elapsed = measure(lexer, text)
+        print(f'{lexer:>6}: {elapsed:.3f} s, {len(text) / elapsed / 2 ** 20:.2f} MB/s')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,44 @@
+"""
+Compares peak memory of programs building chains of large intermediate matrices with and without releasing them
+after their last use
+
+Usage: python -m benchmarks.liveness [size of matrices]
+"""
+import sys
+import tracemalloc
+
+from compiler.interpreter import Interpreter, LivenessAnalyzer
+from compiler.parser import MParser
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+
+PROGRAMS = {
+    'pipeline': 'n = N; A = ones(n, n); B = A .+ A; C = B\' .- A; D = C .* C; E = D .+ B; s = sum(E);',
+    'loop': 'n = N; s = 0.; for i = 0:4 { A = ones(n, n); B = A .* A; C = B .+ A; s += sum(C); } D = ones(n, n);',
+}
+
+
+def run(program: str, optimize: bool, engine: str, size: int) -> int:
+    """ Returns number of bytes allocated at most during execution """
+    root = MParser().parse(program.replace('N', str(size)), lexer=MLexer(), tracking=True)
+    TypeChecker().check(root)
+    if optimize:
+        root = LivenessAnalyzer().release(root)
+
+    tracemalloc.start()
+    Interpreter(engine).execute_with_return(root)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main(size: int = 1000):
+    for name, program in PROGRAMS.items():
+        for engine in Interpreter.ENGINES:
+            plain, optimized = run(program, False, engine, size), run(program, True, engine, size)
+            print(f'{name} ({engine}): {plain / (1 << 20):.1f} MiB, released {optimized / (1 << 20):.1f} MiB '
+                  f'({plain / optimized:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
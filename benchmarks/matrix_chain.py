@@ -0,0 +1,38 @@
+"""
+Compares execution time of products of several matrices multiplied in order of source and in the cheapest order
+
+Usage: python -m benchmarks.matrix_chain [size of matrix]
+"""
+import sys
+import time
+
+from compiler.interpreter import Interpreter, MatrixChainOptimizer
+from compiler.parser import MParser
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+
+PROGRAMS = {
+    'matrices times vector': 'A = ones(N, N); B = ones(N, N); v = ones(N); r = A * B * A * v;',
+    'thin matrices': 'A = ones(N, 8); B = ones(8, N); r = A * B * A * B;',
+}
+
+
+def run(program: str, optimize: bool, size: int) -> float:
+    root = MParser().parse(program.replace('N', str(size)), lexer=MLexer(), tracking=True)
+    TypeChecker().check(root)
+    if optimize:
+        root = MatrixChainOptimizer().optimize(root)
+
+    start = time.perf_counter()
+    Interpreter('closure').execute_with_return(root)
+    return time.perf_counter() - start
+
+
+def main(size: int = 1500):
+    for name, program in PROGRAMS.items():
+        plain, ordered = run(program, False, size), run(program, True, size)
+        print(f'{name}: source order {plain:.3f} s, cheapest order {ordered:.3f} s ({plain / ordered:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,44 @@
+"""
+Measures scaling of element wise operators and initialization of large matrices with number of threads
+
+Usage: python -m benchmarks.parallel [size of matrix] [maximal number of threads]
+"""
+import os
+import sys
+import time
+
+from compiler.interpreter import Interpreter, parallel
+from compiler.parser import MParser
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+
+PROGRAMS = {
+    'initialization': 'A = zeros(N, N); B = ones(N, N); C = eye(N, N);',
+    'element wise': 'A = ones(N, N); B = A .+ A; C = A .* B; D = C ./ B; E = D .- A;',
+}
+
+
+def run(program: str, size: int, threads: int) -> float:
+    root = MParser().parse(program.replace('N', str(size)), lexer=MLexer(), tracking=True)
+    TypeChecker().check(root)
+
+    parallel.configure(threads)
+    try:
+        start = time.perf_counter()
+        Interpreter('closure').execute_with_return(root)
+        return time.perf_counter() - start
+    finally:
+        parallel.configure()
+
+
+def main(size: int = 5000, max_threads: int = os.cpu_count()):
+    threads = sorted({1, *[2 ** i for i in range(max_threads.bit_length()) if 2 ** i <= max_threads], max_threads})
+    for name, program in PROGRAMS.items():
+        times = {t: run(program, size, t) for t in threads}
+        print(f'{name}:')
+        for t, elapsed in times.items():
+            print(f'  {t:>3} threads: {elapsed:.3f} s ({times[1] / elapsed:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
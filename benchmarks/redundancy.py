@@ -0,0 +1,40 @@
+"""
+Compares execution time of loops recomputing invariant and repeated expressions with and without their elimination
+
+Usage: python -m benchmarks.redundancy [number of iterations]
+"""
+import sys
+import time
+
+from compiler.interpreter import Interpreter, RedundancyEliminator
+from compiler.parser import MParser
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+
+PROGRAMS = {
+    'scalar invariants': 'n = N; scale = 3.; A = ones(n); s = 0.; '
+                         'for i = 0:n { s += n - 1 / scale * A[i] + n - 1 / scale * 2.; }',
+    'invariant matrix': 'n = N; k = 64; r = 0.; for i = 0:n { C = ones(k, k)\'; C[0, 0] = i * 1.; r += C[0, 0]; }',
+}
+
+
+def run(program: str, optimize: bool, engine: str, iterations: int) -> float:
+    root = MParser().parse(program.replace('N', str(iterations)), lexer=MLexer(), tracking=True)
+    TypeChecker().check(root)
+    if optimize:
+        root = RedundancyEliminator().optimize(root)
+
+    start = time.perf_counter()
+    Interpreter(engine).execute_with_return(root)
+    return time.perf_counter() - start
+
+
+def main(iterations: int = 100000):
+    for name, program in PROGRAMS.items():
+        for engine in Interpreter.ENGINES:
+            plain, optimized = run(program, False, engine, iterations), run(program, True, engine, iterations)
+            print(f'{name} ({engine}): {plain:.3f} s, eliminated {optimized:.3f} s ({plain / optimized:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,4 @@
+""" Compiler and interpreter of M language """
+
+# version of compiler, has to be increased whenever format of AST changes as it invalidates cached programs
+__version__ = '0.9.0'
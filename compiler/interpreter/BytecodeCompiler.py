@@ -0,0 +1,420 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from compiler.interpreter.opcodes import (
+    MOVE, OP1, OP2, OPK, CALL, VECTOR, INDEX1, INDEX2, INDEX, STORE1, STORE, UPDATE,
+    JUMP, JUMP_IF_NOT, JUMP_IF_NOT_OP, FOR_NEXT, RETURN, VECTOR_FOR, INPLACE, NAMES, FORMATS
+)
+from compiler.interpreter.fused import evaluate_fused
+from compiler.interpreter.matrix_chain import evaluate_chain
+from compiler.interpreter.operations import OPERATIONS, INPLACE_OPERATIONS, inplace, operator_function, share, shares
+from compiler.interpreter.SlotResolver import SlotResolver
+from compiler.interpreter.vectorized import execute_vectorized
+from compiler.parser import AST
+from compiler.utils import CompilerError, method_dispatch
+
+# operators whose result decides a branch directly
+COMPARISONS = ('==', '!=', '>', '<', '>=', '<=')
+
+
+class Register(NamedTuple):
+    """ Register used during compilation, each kind is mapped to its own range of frame once compilation is done """
+    kind: str
+    index: int
+
+
+@dataclass
+class Bytecode:
+    """ Compiled program, flat list of instructions operating on frame of 'size' registers """
+    code: List[tuple]
+    size: int
+    constants: List[Tuple[int, Any]]
+    names: List[str]
+
+
+class BytecodeCompiler:
+    """
+    Lowers AST tree into flat list of instructions of register machine,
+    slots of variables resolved by SlotResolver are the first registers of frame,
+    constants are preloaded into registers and control flow is compiled into jumps
+    """
+
+    def compile(self, node: AST.Node) -> Bytecode:
+        """ Returns bytecode of given program """
+        resolver = SlotResolver()
+        resolver.resolve(node)
+
+        self.names = resolver.names
+        self.constants: List[Any] = []
+        self.constant_registers: Dict[Tuple[type, Any], Register] = {}
+        self.temps = 0
+        self.max_temps = 0
+        self.code: List[list] = []
+        self.loops: List[Tuple[int, List[int]]] = []
+
+        self._statement(node)
+        self._emit(RETURN, self._constant(None))
+        return self._link()
+
+    # ==============================================
+    #   REGISTERS AND CODE
+    # ==============================================
+    @staticmethod
+    def _slot(node: AST.Identifier) -> Register:
+        """ Returns register of variable, undefined variables have registers that stay None """
+        return Register('slot', node.slot)
+
+    def _constant(self, value: Any) -> Register:
+        """ Returns register preloaded with given constant, hashable constants share registers """
+        try:
+            key = (type(value), value)
+            register = self.constant_registers.get(key)
+        except TypeError:
+            key, register = None, None
+
+        if register is None:
+            self.constants.append(value)
+            register = Register('const', len(self.constants) - 1)
+            if key is not None:
+                self.constant_registers[key] = register
+        return register
+
+    def _temp(self) -> Register:
+        """ Returns new temporary register, temporaries are released after each statement """
+        self.temps += 1
+        self.max_temps = max(self.max_temps, self.temps)
+        return Register('temp', self.temps - 1)
+
+    def _emit(self, op: int, *operands: Any) -> int:
+        """ Appends instruction and returns its position """
+        self.code.append([op, *operands])
+        return len(self.code) - 1
+
+    def _patch(self, position: int, target: int):
+        """ Sets target of jump instruction at given position """
+        self.code[position][-1] = target
+
+    def _link(self) -> Bytecode:
+        """ Maps registers to frame indices and pads instructions to fixed length """
+        bases = {'slot': 0, 'const': len(self.names), 'temp': len(self.names) + len(self.constants)}
+        size = bases['temp'] + self.max_temps
+
+        def register(r: Register) -> int:
+            return bases[r.kind] + r.index
+
+        code = []
+        for op, *operands in self.code:
+            for i, kind in enumerate(FORMATS[op]):
+                if kind == 'r':
+                    operands[i] = register(operands[i])
+                elif kind == 'R':
+                    operands[i] = tuple(register(r) for r in operands[i])
+            code.append((op, *operands, *[None] * (4 - len(operands))))
+
+        names = self.names + [_constant_name(c) for c in self.constants] + [f't{i}' for i in range(self.max_temps)]
+        constants = [(bases['const'] + i, c) for i, c in enumerate(self.constants)]
+        return Bytecode(code, size, constants, names)
+
+    # ==============================================
+    #   EXPRESSIONS
+    # ==============================================
+    @method_dispatch
+    def _expression(self, node: AST.Node, dst: Optional[Register] = None) -> Register:
+        """ Compiles expression and returns register holding its value, result is written to 'dst' if given """
+        raise NotImplementedError(f'There is no compilation implemented for {node.__class__}')
+
+    def _result(self, register: Register, dst: Optional[Register]) -> Register:
+        """ Returns register of value that does not need evaluation, copies it to 'dst' if given """
+        if dst is None or dst == register:
+            return register
+        self._emit(MOVE, dst, register)
+        return dst
+
+    @_expression.register
+    def _(self, node: AST.ConstantExpression, dst: Optional[Register] = None) -> Register:
+        return self._result(self._constant(node.value), dst)
+
+    @_expression.register
+    def _(self, node: AST.ConstantArrayExpression, dst: Optional[Register] = None) -> Register:
+        return self._result(self._constant(node.value), dst)
+
+    @_expression.register
+    def _(self, node: AST.Identifier, dst: Optional[Register] = None) -> Register:
+        return self._result(self._slot(node), dst)
+
+    @_expression.register
+    def _(self, node: AST.VectorExpression, dst: Optional[Register] = None) -> Register:
+        items = tuple(self._expression(e) for e in node.expressions)
+        dst = dst or self._temp()
+        self._emit(VECTOR, dst, items)
+        return dst
+
+    @_expression.register
+    def _(self, node: AST.RangeExpression, dst: Optional[Register] = None) -> Register:
+        return self._call(range, [node.begin, node.end], dst)
+
+    @_expression.register
+    def _(self, node: AST.SliceExpression, dst: Optional[Register] = None) -> Register:
+        begin, end = [self._constant(None) if b is None else self._expression(b) for b in (node.begin, node.end)]
+        dst = dst or self._temp()
+        self._emit(OP2, dst, slice, begin, end)
+        return dst
+
+    @_expression.register
+    def _(self, node: AST.OperatorExpression, dst: Optional[Register] = None) -> Register:
+        return self._call(operator_function(node), node.expressions, dst)
+
+    @_expression.register
+    def _(self, node: AST.FusedExpression, dst: Optional[Register] = None) -> Register:
+        def fused(*values: Any) -> Any:
+            return evaluate_fused(node, list(values))
+
+        fused.__name__ = f'fused@{node.line_span[0]}'
+        args = tuple(self._expression(e) for e in node.leaves)
+        dst = dst or self._temp()
+        self._emit(CALL, dst, fused, args)
+        return dst
+
+    @_expression.register
+    def _(self, node: AST.MatrixChainExpression, dst: Optional[Register] = None) -> Register:
+        def chain(*values: Any) -> Any:
+            return evaluate_chain(node, list(values))
+
+        chain.__name__ = f'chain@{node.line_span[0]}'
+        args = tuple(self._expression(f) for f in node.factors)
+        dst = dst or self._temp()
+        self._emit(CALL, dst, chain, args)
+        return dst
+
+    @_expression.register
+    def _(self, node: AST.FunctionExpression, dst: Optional[Register] = None) -> Register:
+        return self._call(OPERATIONS[node.name], node.arguments, dst)
+
+    def _call(self, function: Callable, arguments: list, dst: Optional[Register]) -> Register:
+        """ Compiles call of function, common arities have their own instructions and constant operands are inlined """
+        if len(arguments) == 2 and isinstance(arguments[1], AST.ConstantExpression):
+            a = self._expression(arguments[0])
+            dst = dst or self._temp()
+            self._emit(OPK, dst, function, a, arguments[1].value)
+            return dst
+
+        args = tuple(self._expression(a) for a in arguments)
+        dst = dst or self._temp()
+
+        if len(args) == 1:
+            self._emit(OP1, dst, function, *args)
+        elif len(args) == 2:
+            self._emit(OP2, dst, function, *args)
+        else:
+            self._emit(CALL, dst, function, args)
+        return dst
+
+    @_expression.register
+    def _(self, node: AST.Selector, dst: Optional[Register] = None) -> Register:
+        var = self._expression(node.identifier)
+        index = tuple(self._expression(e) for e in node.selector.expressions)
+        dst = dst or self._temp()
+
+        if len(index) == 1:
+            self._emit(INDEX1, dst, var, *index)
+        elif len(index) == 2:
+            self._emit(INDEX2, dst, var, *index)
+        else:
+            self._emit(INDEX, dst, var, index)
+        return dst
+
+    def _jump_if_not(self, condition: AST.Expression) -> int:
+        """ Compiles conditional jump taken when condition is false, returns its position to be patched """
+        if isinstance(condition, AST.OperatorExpression) and condition.operator in COMPARISONS:
+            a, b = [self._expression(e) for e in condition.expressions]
+            return self._emit(JUMP_IF_NOT_OP, OPERATIONS[condition.operator], a, b, None)
+
+        return self._emit(JUMP_IF_NOT, self._expression(condition), None)
+
+    # ==============================================
+    #   STATEMENTS
+    # ==============================================
+    def _statement(self, node: AST.Statement):
+        """ Compiles statement, temporaries used by it are released afterwards """
+        temps = self.temps
+        self._lower_statement(node)
+        self.temps = temps
+
+    @method_dispatch
+    def _lower_statement(self, node: AST.Node):
+        raise NotImplementedError(f'There is no compilation implemented for {node.__class__}')
+
+    @_lower_statement.register
+    def _(self, node: AST.ProgramStatement):
+        for s in node.statements:
+            self._statement(s)
+
+    @_lower_statement.register
+    def _(self, node: AST.AssignmentStatement):
+
+        # if its an assignment to identifier, expression is evaluated straight into register of variable,
+        # matrix of other variable is shared until one of them writes it
+        if isinstance(node.variable, AST.Identifier):
+            if shares(node.expression):
+                self._call(share, [node.expression], self._slot(node.variable))
+            else:
+                self._expression(node.expression, self._slot(node.variable))
+            return
+
+        # if its an assignment to selector
+        var = self._slot(node.variable.identifier)
+        index = tuple(self._expression(e) for e in node.variable.selector.expressions)
+        exp = self._expression(node.expression)
+
+        if len(index) == 1:
+            self._emit(STORE1, var, *index, exp)
+        else:
+            self._emit(STORE, var, index, exp)
+
+    @_lower_statement.register
+    def _(self, node: AST.AssignmentWithOperatorStatement):
+        operation = operator_function(node)
+
+        # matrices proven by type checker to keep their type are updated in place
+        if inplace(node):
+            exp = self._expression(node.expression)
+            if isinstance(node.variable, AST.Identifier):
+                var, index = self._slot(node.variable), ()
+            else:
+                var = self._slot(node.variable.identifier)
+                index = tuple(self._expression(e) for e in node.variable.selector.expressions)
+            self._emit(INPLACE, var, index, INPLACE_OPERATIONS[node.operator[:1]], exp)
+            return
+
+        # if its an assignment to identifier
+        if isinstance(node.variable, AST.Identifier):
+            var = self._slot(node.variable)
+
+            if isinstance(node.expression, AST.ConstantExpression):
+                self._emit(OPK, var, operation, var, node.expression.value)
+            else:
+                self._emit(OP2, var, operation, var, self._expression(node.expression))
+            return
+
+        # if its an assignment to selector
+        exp = self._expression(node.expression)
+        var = self._slot(node.variable.identifier)
+        index = tuple(self._expression(e) for e in node.variable.selector.expressions)
+        self._emit(UPDATE, var, index, operation, exp)
+
+    @_lower_statement.register
+    def _(self, node: AST.InstructionStatement):
+
+        # jumps out of innermost loop, type checker rejects them outside of loops
+        if node.name in ('break', 'continue'):
+            if not self.loops:
+                raise CompilerError('BytecodeCompiler', node.line_span[0], f'Instruction {node.name} outside of a loop')
+            start, breaks = self.loops[-1]
+            if node.name == 'break':
+                breaks.append(self._emit(JUMP, None))
+            else:
+                self._emit(JUMP, start)
+            return
+
+        if node.name == 'return':
+            self._emit(RETURN, self._expression(node.arguments[0]))
+            return
+
+        args = tuple(self._expression(a) for a in node.arguments)
+        self._emit(CALL, self._temp(), OPERATIONS[node.name], args)
+
+    def _loop(self, start: int, body: Callable[[], None]) -> List[int]:
+        """ Compiles loop body followed by jump back to start, returns positions of jumps of break instructions """
+        self.loops.append((start, []))
+        body()
+        self._emit(JUMP, start)
+        return self.loops.pop()[1]
+
+    @_lower_statement.register
+    def _(self, node: AST.WhileStatement):
+        start = len(self.code)
+        exit_jump = self._jump_if_not(node.condition)
+        breaks = self._loop(start, lambda: self._statement(node.statement))
+
+        after = len(self.code)
+        for position in [exit_jump, *breaks]:
+            self._patch(position, after)
+
+    @_lower_statement.register
+    def _(self, node: AST.ForStatement):
+        # range is evaluated once into hidden counter and end registers
+        counter, end = self._temp(), self._temp()
+        self._expression(node.range.begin, counter)
+        self._expression(node.range.end, end)
+
+        start = self._emit(FOR_NEXT, counter, end, self._slot(node.identifier), None)
+        breaks = self._loop(start, lambda: self._statement(node.statement))
+
+        after = len(self.code)
+        for position in [start, *breaks]:
+            self._patch(position, after)
+
+    @_lower_statement.register
+    def _(self, node: AST.VectorizedForStatement):
+        # slots of variables are the first registers, so vectorized loop runs directly on registers
+        def vectorized(regs: list) -> bool:
+            return execute_vectorized(node, regs)
+
+        vectorized.__name__ = f'vectorized@{node.line_span[0]}'
+        skip = self._emit(VECTOR_FOR, vectorized, None)
+        self._statement(node.loop)
+        self._patch(skip, len(self.code))
+
+    @_lower_statement.register
+    def _(self, node: AST.ReleaseStatement):
+        for identifier in node.identifiers:
+            self._emit(MOVE, self._slot(identifier), self._constant(None))
+
+    @_lower_statement.register
+    def _(self, node: AST.IfStatement):
+        else_jump = self._jump_if_not(node.condition)
+        self._statement(node.statement_then)
+
+        if node.statement_else:
+            end_jump = self._emit(JUMP, None)
+            self._patch(else_jump, len(self.code))
+            self._statement(node.statement_else)
+            self._patch(end_jump, len(self.code))
+        else:
+            self._patch(else_jump, len(self.code))
+
+
+# ==============================================
+#   DISASSEMBLER
+# ==============================================
+_SYMBOLS: Dict[Callable, str] = {f: name for name, f in OPERATIONS.items()}
+
+
+def _constant_name(value: Any) -> str:
+    if isinstance(value, np.ndarray):
+        return ' '.join(np.array2string(value, separator=', ', threshold=16).split())
+    return repr(value)
+
+
+def disassemble(bytecode: Bytecode) -> str:
+    """ Returns human readable listing of bytecode, registers are named after variables, constants and temporaries """
+    names = bytecode.names
+
+    def operand(kind: str, value: Any) -> str:
+        if kind == 'r':
+            return names[value]
+        if kind == 'R':
+            return '(' + ', '.join(names[r] for r in value) + ')'
+        if kind == 'f':
+            return _SYMBOLS.get(value, getattr(value, '__name__', repr(value)))
+        if kind == 'j':
+            return f'-> {value}'
+        return _constant_name(value)
+
+    lines = []
+    for pc, (op, *operands) in enumerate(bytecode.code):
+        args = ', '.join(operand(kind, value) for kind, value in zip(FORMATS[op], operands))
+        lines.append(f'{pc:>4}  {NAMES[op]:<15}{args}')
+    return '\n'.join(lines)
@@ -0,0 +1,329 @@
+from typing import Any, Callable, List
+
+import numpy as np
+
+from compiler.interpreter.fused import evaluate_fused
+from compiler.interpreter.interuptions import BREAK, CONTINUE, RETURN
+from compiler.interpreter.matrix_chain import evaluate_chain
+from compiler.interpreter.operations import (
+    OPERATIONS, INPLACE_OPERATIONS, apply_inplace, inplace, make_writable, operator_function, share, shares
+)
+from compiler.interpreter.vectorized import execute_vectorized
+from compiler.parser import AST
+from compiler.utils import method_dispatch
+
+
+class ClosureCompiler:
+    """
+    Compiles AST tree into tree of closures,
+    operator functions, constants, children and slots of variables are resolved once during compilation
+    instead of on every execution
+    """
+
+    def __init__(self, frame: List[Any]):
+        self.frame = frame
+        self.result = None
+
+    @method_dispatch
+    def compile(self, node: AST.Node) -> Callable[[], Any]:
+        """ Returns closure executing given AST tree """
+        raise NotImplementedError(f'There is no compilation implemented for {node.__class__}')
+
+    # ==============================================
+    #   EXPRESSIONS
+    # ==============================================
+    @compile.register
+    def _(self, node: AST.ConstantExpression) -> Callable[[], Any]:
+        value = node.value
+        return lambda: value
+
+    @compile.register
+    def _(self, node: AST.ConstantArrayExpression) -> Callable[[], Any]:
+        value = node.value
+        return lambda: value
+
+    @compile.register
+    def _(self, node: AST.VectorExpression) -> Callable[[], Any]:
+        expressions = [self.compile(e) for e in node.expressions]
+        return lambda: np.asarray([e() for e in expressions])
+
+    @compile.register
+    def _(self, node: AST.RangeExpression) -> Callable[[], Any]:
+        begin = self.compile(node.begin)
+        end = self.compile(node.end)
+        return lambda: range(begin(), end())
+
+    @compile.register
+    def _(self, node: AST.SliceExpression) -> Callable[[], Any]:
+        begin, end = [(lambda: None) if b is None else self.compile(b) for b in (node.begin, node.end)]
+        return lambda: slice(begin(), end())
+
+    @compile.register
+    def _(self, node: AST.OperatorExpression) -> Callable[[], Any]:
+        return self._compile_call(operator_function(node), node.expressions)
+
+    @compile.register
+    def _(self, node: AST.FusedExpression) -> Callable[[], Any]:
+        leaves = [self.compile(e) for e in node.leaves]
+        return lambda: evaluate_fused(node, [e() for e in leaves])
+
+    @compile.register
+    def _(self, node: AST.MatrixChainExpression) -> Callable[[], Any]:
+        factors = [self.compile(f) for f in node.factors]
+        return lambda: evaluate_chain(node, [f() for f in factors])
+
+    @compile.register
+    def _(self, node: AST.FunctionExpression) -> Callable[[], Any]:
+        return self._compile_call(OPERATIONS[node.name], node.arguments)
+
+    def _compile_call(self, function: Callable, arguments: list) -> Callable[[], Any]:
+        """ Returns closure calling function with results of given expressions, common arities are unrolled """
+        args = [self.compile(a) for a in arguments]
+
+        if len(args) == 1:
+            a, = args
+            return lambda: function(a())
+
+        if len(args) == 2:
+            a, b = args
+            return lambda: function(a(), b())
+
+        return lambda: function(*[a() for a in args])
+
+    # ==============================================
+    #   VARIABLES
+    # ==============================================
+    @compile.register
+    def _(self, node: AST.Identifier) -> Callable[[], Any]:
+        frame = self.frame
+        slot = node.slot
+        return lambda: frame[slot]
+
+    @compile.register
+    def _(self, node: AST.Selector) -> Callable[[], Any]:
+        var = self.compile(node.identifier)
+        index = self._compile_index(node.selector)
+        return lambda: var()[index()]
+
+    def _compile_index(self, node: AST.VectorExpression) -> Callable[[], Any]:
+        """ Returns closure evaluating selector to index, single index is not wrapped in tuple """
+        items = [self.compile(e) for e in node.expressions]
+
+        if len(items) == 1:
+            return items[0]
+
+        if len(items) == 2:
+            a, b = items
+            return lambda: (a(), b())
+
+        return lambda: tuple([i() for i in items])
+
+    def _compile_writable(self, node: AST.Identifier) -> Callable[[], Any]:
+        """ Returns closure returning value of variable that is about to be written, shared arrays are copied and rebound first """
+        frame = self.frame
+        slot = node.slot
+
+        def writable():
+            return make_writable(frame, slot)
+
+        return writable
+
+    # ==============================================
+    #   STATEMENTS
+    # ==============================================
+    @compile.register
+    def _(self, node: AST.ProgramStatement) -> Callable[[], Any]:
+        statements = [self.compile(s) for s in node.statements]
+
+        def program():
+            for s in statements:
+                status = s()
+                if status:
+                    return status
+
+        return program
+
+    @compile.register
+    def _(self, node: AST.AssignmentStatement) -> Callable[[], Any]:
+        exp = self.compile(node.expression)
+
+        # if its an assignment to identifier, matrix of other variable is shared until one of them writes it
+        if isinstance(node.variable, AST.Identifier):
+            frame = self.frame
+            slot = node.variable.slot
+
+            if shares(node.expression):
+                def assign():
+                    frame[slot] = share(exp())
+            else:
+                def assign():
+                    frame[slot] = exp()
+
+            return assign
+
+        # if its an assignment to selector
+        var = self._compile_writable(node.variable.identifier)
+        index = self._compile_index(node.variable.selector)
+
+        def assign():
+            v = var()
+            i = index()
+            v[i] = exp()
+
+        return assign
+
+    @compile.register
+    def _(self, node: AST.AssignmentWithOperatorStatement) -> Callable[[], Any]:
+        exp = self.compile(node.expression)
+        operation = operator_function(node)
+
+        # matrices proven by type checker to keep their type are updated in place if their buffers allow it
+        if inplace(node):
+            return self._compile_inplace(node, exp, operation)
+
+        # if its an assignment to identifier
+        if isinstance(node.variable, AST.Identifier):
+            frame = self.frame
+            slot = node.variable.slot
+
+            def assign():
+                e = exp()
+                frame[slot] = operation(frame[slot], e)
+
+            return assign
+
+        # if its an assignment to selector
+        var = self._compile_writable(node.variable.identifier)
+        index = self._compile_index(node.variable.selector)
+
+        def assign():
+            e = exp()
+            v = var()
+            i = index()
+            v[i] = operation(v[i], e)
+
+        return assign
+
+    def _compile_inplace(self, node: AST.AssignmentWithOperatorStatement, exp: Callable[[], Any],
+                         operation: Callable) -> Callable[[], Any]:
+        """ Returns closure of compound assignment that writes into buffer of matrix, copying is the fallback """
+        ufunc = INPLACE_OPERATIONS[node.operator[:1]]
+
+        # if its an assignment to identifier
+        if isinstance(node.variable, AST.Identifier):
+            frame = self.frame
+            slot = node.variable.slot
+            var = self._compile_writable(node.variable)
+
+            def assign():
+                e = exp()
+                if not apply_inplace(ufunc, var(), e):
+                    frame[slot] = operation(frame[slot], e)
+
+            return assign
+
+        # if its an assignment to selector, selector with fewer indices than dimensions is a view of matrix
+        var = self._compile_writable(node.variable.identifier)
+        index = self._compile_index(node.variable.selector)
+
+        def assign():
+            e = exp()
+            v = var()
+            i = index()
+            if not apply_inplace(ufunc, v[i], e):
+                v[i] = operation(v[i], e)
+
+        return assign
+
+    @compile.register
+    def _(self, node: AST.InstructionStatement) -> Callable[[], Any]:
+        if node.name == 'break':
+            return lambda: BREAK
+
+        if node.name == 'continue':
+            return lambda: CONTINUE
+
+        if node.name == 'return':
+            exp = self.compile(node.arguments[0])
+
+            def ret():
+                self.result = exp()
+                return RETURN
+
+            return ret
+
+        call = self._compile_call(OPERATIONS[node.name], node.arguments)
+
+        def instruction():
+            call()
+
+        return instruction
+
+    @compile.register
+    def _(self, node: AST.WhileStatement) -> Callable[[], Any]:
+        condition = self.compile(node.condition)
+        statement = self.compile(node.statement)
+
+        def loop():
+            while condition():
+                status = statement()
+                if status == BREAK:
+                    break
+                if status == RETURN:
+                    return status
+
+        return loop
+
+    @compile.register
+    def _(self, node: AST.ForStatement) -> Callable[[], Any]:
+        frame = self.frame
+        slot = node.identifier.slot
+        iterable = self.compile(node.range)
+        statement = self.compile(node.statement)
+
+        def loop():
+            for i in iterable():
+                frame[slot] = i
+                status = statement()
+                if status == BREAK:
+                    break
+                if status == RETURN:
+                    return status
+
+        return loop
+
+    @compile.register
+    def _(self, node: AST.VectorizedForStatement) -> Callable[[], Any]:
+        frame = self.frame
+        loop = self.compile(node.loop)
+
+        def vectorized():
+            if not execute_vectorized(node, frame):
+                return loop()
+
+        return vectorized
+
+    @compile.register
+    def _(self, node: AST.ReleaseStatement) -> Callable[[], Any]:
+        frame = self.frame
+        slots = [identifier.slot for identifier in node.identifiers]
+
+        def release():
+            for slot in slots:
+                frame[slot] = None
+
+        return release
+
+    @compile.register
+    def _(self, node: AST.IfStatement) -> Callable[[], Any]:
+        condition = self.compile(node.condition)
+        then = self.compile(node.statement_then)
+        otherwise = self.compile(node.statement_else) if node.statement_else else None
+
+        def branch():
+            if condition():
+                return then()
+            elif otherwise:
+                return otherwise()
+
+        return branch
@@ -0,0 +1,120 @@
+from dataclasses import fields
+from typing import Callable, List
+
+import numpy as np
+
+from compiler.interpreter.operations import OPERATIONS, operator_function
+from compiler.parser import AST
+from compiler.parser.MParser import constant_array
+from compiler.types import TypeChecker
+from compiler.utils import method_dispatch
+
+# larger matrices are created during execution instead of being kept in program
+FOLD_LIMIT = 1 << 16
+
+
+class ConstantFolder:
+    """ Replaces operators and functions of constant arguments with constants and removes branches of constant conditions """
+
+    def __init__(self):
+        self.folded = 0
+        self.pruned = 0
+
+    def optimize(self, root: AST.Node) -> AST.Node:
+        """ Returns folded program checked again, so shapes of matrices made constant are known to following passes """
+        root = self.fold(root)
+        TypeChecker().check(root)
+        return root
+
+    @method_dispatch
+    def fold(self, node: AST.Node) -> AST.Node:
+        """ Returns given node with constant subtrees replaced, children of nodes are rewritten in place """
+        for field in fields(node):
+            value = getattr(node, field.name)
+            if isinstance(value, AST.Node):
+                setattr(node, field.name, self.fold(value))
+            elif isinstance(value, list):
+                setattr(node, field.name, [self.fold(v) if isinstance(v, AST.Node) else v for v in value])
+
+        return node
+
+    # ==============================================
+    #   EXPRESSIONS
+    # ==============================================
+    @fold.register
+    def _(self, node: AST.VectorExpression) -> AST.Node:
+        node.expressions = [self.fold(e) for e in node.expressions]
+        return constant_array(node) if node.expressions else node
+
+    @fold.register
+    def _(self, node: AST.OperatorExpression) -> AST.Node:
+        node.expressions = [self.fold(e) for e in node.expressions]
+        return self._constant(node, operator_function(node), node.expressions)
+
+    @fold.register
+    def _(self, node: AST.FunctionExpression) -> AST.Node:
+        node.arguments = [self.fold(a) for a in node.arguments]
+        return self._constant(node, OPERATIONS[node.name], node.arguments)
+
+    def _constant(self, node: AST.Expression, function: Callable, arguments: List[AST.Expression]) -> AST.Expression:
+        """ Returns constant value of expression or expression itself if it fails or its value cannot be constant """
+        if not all(isinstance(a, (AST.ConstantExpression, AST.ConstantArrayExpression)) for a in arguments):
+            return node
+
+        # errors and floating point warnings are left to be reported during execution
+        try:
+            with np.errstate(all='raise'):
+                value = function(*[a.value for a in arguments])
+        except Exception:
+            return node
+
+        # numpy scalars are not folded, type checker types constants by their python types
+        if type(value) in (bool, int, float, str):
+            self.folded += 1
+            return AST.ConstantExpression(node.line_span, value)
+
+        if isinstance(value, np.ndarray) and value.dtype.kind in 'bif' and value.size <= FOLD_LIMIT:
+            if value.flags.writeable:
+                value.flags.writeable = False
+            self.folded += 1
+            return AST.ConstantArrayExpression(node.line_span, value)
+
+        return node
+
+    # ==============================================
+    #   VARIABLES
+    # ==============================================
+    @fold.register
+    def _(self, node: AST.Selector) -> AST.Node:
+        # items of selector are folded one by one, selector itself is never a matrix
+        node.selector.expressions = [self.fold(e) for e in node.selector.expressions]
+        return node
+
+    # ==============================================
+    #   STATEMENTS
+    # ==============================================
+    @fold.register
+    def _(self, node: AST.IfStatement) -> AST.Node:
+        node.condition = self.fold(node.condition)
+        if not isinstance(node.condition, AST.ConstantExpression):
+            node.statement_then = self.fold(node.statement_then)
+            if node.statement_else:
+                node.statement_else = self.fold(node.statement_else)
+            return node
+
+        self.pruned += 1
+        if node.condition.value:
+            return self.fold(node.statement_then)
+        if node.statement_else:
+            return self.fold(node.statement_else)
+        return AST.ProgramStatement(node.line_span, [])
+
+    @fold.register
+    def _(self, node: AST.WhileStatement) -> AST.Node:
+        node.condition = self.fold(node.condition)
+        if isinstance(node.condition, AST.ConstantExpression) and not node.condition.value:
+            self.pruned += 1
+            return AST.ProgramStatement(node.line_span, [])
+
+        node.statement = self.fold(node.statement)
+        return node
@@ -0,0 +1,39 @@
+from dataclasses import fields
+
+from compiler.interpreter.fused import fusable, fused_leaves
+from compiler.parser import AST
+
+
+class ExpressionFuser:
+    """ Replaces trees of element wise matrix operators with FusedExpression evaluated without full size temporaries """
+
+    def __init__(self):
+        self.fused = 0
+
+    def fuse(self, node: AST.Node) -> AST.Node:
+        """ Returns given node with fusable trees replaced, children of other nodes are rewritten in place """
+        if fusable(node) and _operators(node) > 1 and not node.mtype.is_scalar():
+            leaves = fused_leaves(node)
+            for leaf in leaves:
+                self.fuse(leaf)
+
+            self.fused += 1
+            fused = AST.FusedExpression(node.line_span, node, leaves)
+            fused.mtype = node.mtype
+            return fused
+
+        for field in fields(node):
+            value = getattr(node, field.name)
+            if isinstance(value, AST.Node):
+                setattr(node, field.name, self.fuse(value))
+            elif isinstance(value, list):
+                setattr(node, field.name, [self.fuse(v) if isinstance(v, AST.Node) else v for v in value])
+
+        return node
+
+
+def _operators(node: AST.Expression) -> int:
+    """ Returns number of operators of fusable tree """
+    if not fusable(node):
+        return 0
+    return 1 + sum(_operators(e) for e in node.expressions)
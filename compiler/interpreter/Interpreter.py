@@ -1,25 +1,57 @@
-from typing import Any, Tuple
+from typing import Any, List, Optional, Tuple
 
 import numpy as np
 
-from compiler.interpreter.interuptions import BreakInterruption, ContinueInterruption, ReturnInterruption
-from compiler.interpreter.operations import OPERATIONS
+from compiler.interpreter.BytecodeCompiler import BytecodeCompiler
+from compiler.interpreter.ClosureCompiler import ClosureCompiler
+from compiler.interpreter.fused import evaluate_fused
+from compiler.interpreter.interuptions import BREAK, CONTINUE, RETURN
+from compiler.interpreter.matrix_chain import evaluate_chain
+from compiler.interpreter.operations import (
+    OPERATIONS, INPLACE_OPERATIONS, apply_inplace, inplace, make_writable, operator_function, share, shares
+)
+from compiler.interpreter.SlotResolver import SlotResolver
+from compiler.interpreter.VirtualMachine import VirtualMachine
+from compiler.interpreter.vectorized import execute_vectorized
 from compiler.parser import AST
-from compiler.utils import SymbolTable, method_dispatch, CompilerError
+from compiler.utils import method_dispatch, CompilerError
 
 
 class Interpreter:
     """ Class responsible for executing code provided in form of AST tree """
 
-    def __init__(self):
-        self.memory = SymbolTable()
+    # available execution engines
+    ENGINES = ('tree', 'closure', 'vm')
+
+    def __init__(self, engine: str = 'tree'):
+        """
+        Creates interpreter, 'tree' engine walks AST tree, 'closure' engine compiles it to closures first
+        and 'vm' engine compiles it to bytecode of register machine
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f'Unknown engine {engine}')
+
+        self.frame: List[Any] = []
+        self.result = None
+        self.engine = engine
 
     def execute_with_return(self, node: AST.Node):
-        """ Executes given AST tree and catches return interruption """
-        try:
-            return self.execute(node)
-        except ReturnInterruption as err:
-            return err.value
+        """ Resolves slots of variables, executes given AST tree and returns value of return instruction """
+        if self.engine == 'vm':
+            return VirtualMachine().run(BytecodeCompiler().compile(node))
+
+        resolver = SlotResolver()
+        resolver.resolve(node)
+        self.frame = [None] * len(resolver.names)
+        self.result = None
+
+        if self.engine == 'closure':
+            compiler = ClosureCompiler(self.frame)
+            compiler.compile(node)()
+            return compiler.result
+
+        self.execute(node)
+        return self.result
 
     @method_dispatch
     def execute(self, node: AST.Node) -> Any:
@@ -33,6 +65,10 @@ class Interpreter:
     def _(self, node: AST.ConstantExpression) -> Any:
         return node.value
 
+    @execute.register
+    def _(self, node: AST.ConstantArrayExpression) -> np.ndarray:
+        return node.value
+
     @execute.register
     def _(self, node: AST.VectorExpression) -> np.ndarray:
         return np.asarray([self.execute(e) for e in node.expressions])
@@ -41,10 +77,22 @@ class Interpreter:
     def _(self, node: AST.RangeExpression) -> range:
         return range(self.execute(node.begin), self.execute(node.end))
 
+    @execute.register
+    def _(self, node: AST.SliceExpression) -> slice:
+        return slice(*[None if b is None else self.execute(b) for b in (node.begin, node.end)])
+
     @execute.register
     def _(self, node: AST.OperatorExpression) -> Any:
         args = [self.execute(a) for a in node.expressions]
-        return OPERATIONS[node.operator](*args)
+        return operator_function(node)(*args)
+
+    @execute.register
+    def _(self, node: AST.FusedExpression) -> Any:
+        return evaluate_fused(node, [self.execute(e) for e in node.leaves])
+
+    @execute.register
+    def _(self, node: AST.MatrixChainExpression) -> Any:
+        return evaluate_chain(node, [self.execute(f) for f in node.factors])
 
     @execute.register
     def _(self, node: AST.FunctionExpression) -> Any:
@@ -56,38 +104,50 @@ class Interpreter:
     # ==============================================
     @execute.register
     def _(self, node: AST.Identifier) -> Any:
-        return self.memory[node.name]
+        return self.frame[node.slot]
+
+    def _writable(self, node: AST.Identifier) -> Any:
+        """ Returns value of variable that is about to be written, shared arrays are copied and rebound first """
+        return make_writable(self.frame, node.slot)
 
     @execute.register
     def _(self, node: AST.Selector) -> Any:
         var = self.execute(node.identifier)
-        sel = self.execute(node.selector)
+        sel = self._index(node.selector)
 
-        return var[tuple(sel)]
+        return var[sel]
+
+    def _index(self, node: AST.VectorExpression) -> tuple:
+        """ Evaluates items of selector to index, slices select views of matrix """
+        return tuple(self.execute(e) for e in node.expressions)
 
     # ==============================================
     #   STATEMENTS
     # ==============================================
+    # statements return BREAK, CONTINUE or RETURN status to be handled by enclosing loop or program, None otherwise
+
     @execute.register
-    def _(self, node: AST.ProgramStatement) -> None:
-        with self.memory.context_scope('program'):
-            for s in node.statements:
-                self.execute(s)
+    def _(self, node: AST.ProgramStatement) -> Optional[int]:
+        for s in node.statements:
+            status = self.execute(s)
+            if status:
+                return status
 
     @execute.register
     def _(self, node: AST.AssignmentStatement) -> None:
 
-        # if its an assignment to identifier
+        # if its an assignment to identifier, matrix of other variable is shared until one of them writes it
         if isinstance(node.variable, AST.Identifier):
-            self.memory[node.variable.name] = self.execute(node.expression)
+            exp = self.execute(node.expression)
+            self.frame[node.variable.slot] = share(exp) if shares(node.expression) else exp
 
         # if its an assignment to selector
         if isinstance(node.variable, AST.Selector):
-            var = self.execute(node.variable.identifier)
-            sel = self.execute(node.variable.selector)
+            var = self._writable(node.variable.identifier)
+            sel = self._index(node.variable.selector)
             exp = self.execute(node.expression)
 
-            var[tuple(sel)] = exp
+            var[sel] = exp
 
     @execute.register
     def _(self, node: AST.AssignmentWithOperatorStatement) -> None:
@@ -95,54 +155,77 @@ class Interpreter:
 
         # if its an assignment to identifier
         if isinstance(node.variable, AST.Identifier):
+            if inplace(node) and apply_inplace(INPLACE_OPERATIONS[node.operator[:1]], self._writable(node.variable), exp):
+                return
+
             var = self.execute(node.variable)
 
-            self.memory[node.variable.name] = OPERATIONS[node.operator[:1]](var, exp)
+            self.frame[node.variable.slot] = operator_function(node)(var, exp)
 
         # if its an assignment to selector
         if isinstance(node.variable, AST.Selector):
-            var = self.execute(node.variable.identifier)
-            sel = tuple(self.execute(node.variable.selector))
+            var = self._writable(node.variable.identifier)
+            sel = self._index(node.variable.selector)
+
+            # selector of matrix with fewer indices than dimensions is a view of it
+            if inplace(node) and apply_inplace(INPLACE_OPERATIONS[node.operator[:1]], var[sel], exp):
+                return
 
-            var[sel] = OPERATIONS[node.operator[:1]](var[sel], exp)
+            var[sel] = operator_function(node)(var[sel], exp)
 
     @execute.register
-    def _(self, node: AST.InstructionStatement) -> None:
+    def _(self, node: AST.InstructionStatement) -> Optional[int]:
+        if node.name == 'break':
+            return BREAK
+
+        if node.name == 'continue':
+            return CONTINUE
+
         args = [self.execute(a) for a in node.arguments]
-        return OPERATIONS[node.name](*args)
+
+        if node.name == 'return':
+            self.result, = args
+            return RETURN
+
+        OPERATIONS[node.name](*args)
 
     @execute.register
-    def _(self, node: AST.WhileStatement) -> None:
+    def _(self, node: AST.WhileStatement) -> Optional[int]:
         while self.execute(node.condition):
-            with self.memory.context_scope('while'):
-                try:
-                    self.execute(node.statement)
-                except BreakInterruption:
-                    return
-                except ContinueInterruption:
-                    pass
+            status = self.execute(node.statement)
+            if status == BREAK:
+                break
+            if status == RETURN:
+                return status
 
     @execute.register
-    def _(self, node: AST.ForStatement) -> None:
+    def _(self, node: AST.ForStatement) -> Optional[int]:
+        frame, slot = self.frame, node.identifier.slot
         for i in self.execute(node.range):
-            with self.memory.context_scope('for'):
-                self.memory[node.identifier.name] = i
-                try:
-                    self.execute(node.statement)
-                except BreakInterruption:
-                    return
-                except ContinueInterruption:
-                    pass
+            frame[slot] = i
+            status = self.execute(node.statement)
+            if status == BREAK:
+                break
+            if status == RETURN:
+                return status
+
+    @execute.register
+    def _(self, node: AST.VectorizedForStatement) -> Optional[int]:
+        if not execute_vectorized(node, self.frame):
+            return self.execute(node.loop)
+
+    @execute.register
+    def _(self, node: AST.ReleaseStatement) -> None:
+        for identifier in node.identifiers:
+            self.frame[identifier.slot] = None
 
     @execute.register
-    def _(self, node: AST.IfStatement) -> None:
+    def _(self, node: AST.IfStatement) -> Optional[int]:
         if self.execute(node.condition):
-            with self.memory.context_scope('then'):
-                self.execute(node.statement_then)
+            return self.execute(node.statement_then)
 
         elif node.statement_else:
-            with self.memory.context_scope('else'):
-                self.execute(node.statement_else)
+            return self.execute(node.statement_else)
 
 
 class ExecutionError(CompilerError):
@@ -0,0 +1,182 @@
+from math import prod
+from typing import Dict, List, Set, Tuple
+
+from compiler.interpreter.assignments import read_identifiers, subtree
+from compiler.parser import AST
+from compiler.types import MType
+from compiler.utils import method_dispatch
+
+# matrices of known shape with fewer elements are not worth releasing
+RELEASE_LIMIT = 1 << 12
+
+
+class LivenessAnalyzer:
+    """
+    Inserts ReleaseStatement freeing matrices of variables that may be large after the last statement reading them,
+    it has to be the last pass so that no statement reading released variable is added after it
+    """
+
+    def __init__(self):
+        self.released = 0
+        self._live_after: Dict[int, Set[str]] = {}
+
+        # variables live after break and continue of enclosing loops
+        self._loops: List[Tuple[Set[str], Set[str]]] = []
+        self._large: Set[str] = set()
+
+    def release(self, root: AST.Statement) -> AST.Statement:
+        """ Returns program with releases of dead matrices inserted, blocks are rewritten in place """
+        self._large = _large_variables(root)
+        self._live(root, set())
+        return self._block(root, set())
+
+    # ==============================================
+    #   LIVENESS
+    # ==============================================
+    def _live(self, node: AST.Statement, live: Set[str]) -> Set[str]:
+        """ Returns variables live before statement given variables live after it, which are recorded for it """
+        self._live_after[id(node)] = live
+        return self._transfer(node, live)
+
+    @method_dispatch
+    def _transfer(self, node: AST.Statement, live: Set[str]) -> Set[str]:
+        raise NotImplementedError(f'There is no liveness analysis implemented for {node.__class__}')
+
+    @_transfer.register
+    def _(self, node: AST.ProgramStatement, live: Set[str]) -> Set[str]:
+        for s in reversed(node.statements):
+            live = self._live(s, live)
+        return live
+
+    @_transfer.register
+    def _(self, node: AST.AssignmentStatement, live: Set[str]) -> Set[str]:
+        # elements written into selected matrix do not replace the rest of it
+        if isinstance(node.variable, AST.Identifier):
+            live = live - {node.variable.name}
+        else:
+            live = live | _names(node.variable)
+        return live | _names(node.expression)
+
+    @_transfer.register
+    def _(self, node: AST.AssignmentWithOperatorStatement, live: Set[str]) -> Set[str]:
+        return live | _names(node.variable) | _names(node.expression)
+
+    @_transfer.register
+    def _(self, node: AST.InstructionStatement, live: Set[str]) -> Set[str]:
+        # outside of loops break and continue end the program like return
+        if node.name in ('break', 'continue'):
+            if not self._loops:
+                return set()
+            after_break, after_continue = self._loops[-1]
+            return after_break if node.name == 'break' else after_continue
+        if node.name == 'return':
+            return _names(node.arguments[0])
+        return live | set().union(*[_names(a) for a in node.arguments])
+
+    @_transfer.register
+    def _(self, node: AST.IfStatement, live: Set[str]) -> Set[str]:
+        live_else = self._live(node.statement_else, live) if node.statement_else else live
+        return _names(node.condition) | self._live(node.statement_then, live) | live_else
+
+    @_transfer.register
+    def _(self, node: AST.WhileStatement, live: Set[str]) -> Set[str]:
+        # variables live before condition are found by iterating body until they do not change
+        head = live | _names(node.condition)
+        while True:
+            self._loops.append((live, head))
+            body = self._live(node.statement, head)
+            self._loops.pop()
+
+            if body <= head:
+                return head
+            head = head | body
+
+    @_transfer.register
+    def _(self, node: AST.ForStatement, live: Set[str]) -> Set[str]:
+        # range is evaluated once, loop variable is assigned before every iteration
+        head = live
+        while True:
+            self._loops.append((live, head))
+            body = self._live(node.statement, head) - {node.identifier.name}
+            self._loops.pop()
+
+            if body <= head:
+                return head | _names(node.range)
+            head = head | body
+
+    @_transfer.register
+    def _(self, node: AST.VectorizedForStatement, live: Set[str]) -> Set[str]:
+        return self._live(node.loop, live)
+
+    # ==============================================
+    #   RELEASES
+    # ==============================================
+    def _block(self, node: AST.Statement, visible: Set[str]) -> AST.Statement:
+        """ Inserts releases into block, single statement becomes block if variables are released after it """
+        if isinstance(node, AST.ProgramStatement):
+            return self._insert(node, visible)
+
+        block = self._insert(AST.ProgramStatement(node.line_span, [node]), visible)
+        return block.statements[0] if len(block.statements) == 1 else block
+
+    def _insert(self, node: AST.ProgramStatement, visible: Set[str]) -> AST.ProgramStatement:
+        """ Releases matrices of variables visible in block after the last statement using them """
+        visible = set(visible)
+        statements = []
+
+        for s in node.statements:
+            statements.append(self._nested(s, visible))
+
+            # assignment of new variable declares it in scope of the block
+            if isinstance(s, (AST.AssignmentStatement, AST.AssignmentWithOperatorStatement)) \
+                    and isinstance(s.variable, AST.Identifier):
+                visible.add(s.variable.name)
+
+            dead = sorted((_names(s) & visible & self._large) - self._live_after[id(s)])
+            if dead:
+                self.released += len(dead)
+                statements.append(AST.ReleaseStatement(s.line_span, [AST.Identifier(s.line_span, n) for n in dead]))
+
+        node.statements = statements
+        return node
+
+    def _nested(self, node: AST.Statement, visible: Set[str]) -> AST.Statement:
+        """ Inserts releases into blocks nested in statement, vectorized loops have to keep their bodies """
+        if isinstance(node, AST.ProgramStatement):
+            return self._insert(node, visible)
+
+        if isinstance(node, AST.IfStatement):
+            node.statement_then = self._block(node.statement_then, visible)
+            if node.statement_else:
+                node.statement_else = self._block(node.statement_else, visible)
+
+        if isinstance(node, AST.WhileStatement):
+            node.statement = self._block(node.statement, visible)
+
+        if isinstance(node, AST.ForStatement):
+            node.statement = self._block(node.statement, visible | {node.identifier.name})
+
+        return node
+
+
+def _names(node: AST.Node) -> Set[str]:
+    """ Returns names of variables used by expression or statement """
+    return {identifier.name for identifier in read_identifiers(node)}
+
+
+def _large_variables(root: AST.Node) -> Set[str]:
+    """ Returns names of variables holding matrices at some point, except those known to be small """
+    def large(mtype: MType) -> bool:
+        return not mtype.is_scalar() and (None in mtype.shape or prod(mtype.shape) >= RELEASE_LIMIT)
+
+    names = set()
+    for node in subtree(root):
+        if isinstance(node, AST.Identifier) and large(getattr(node, 'mtype', MType.NONE)):
+            names.add(node.name)
+
+        # targets of assignments are not annotated, their types are types of assigned expressions
+        if isinstance(node, AST.AssignmentStatement) and isinstance(node.variable, AST.Identifier) \
+                and large(node.expression.mtype):
+            names.add(node.variable.name)
+
+    return names
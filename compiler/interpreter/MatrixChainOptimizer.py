@@ -0,0 +1,47 @@
+from dataclasses import fields
+from typing import List
+
+from compiler.interpreter.matrix_chain import chain_dimensions, chain_order
+from compiler.interpreter.operations import matrix_product
+from compiler.parser import AST
+
+
+class MatrixChainOptimizer:
+    """ Replaces products of at least three matrices with MatrixChainExpression multiplied in the cheapest order """
+
+    def __init__(self):
+        self.chains = 0
+
+    def optimize(self, node: AST.Node) -> AST.Node:
+        """ Returns given node with chains of products replaced, children of other nodes are rewritten in place """
+        if isinstance(node, AST.OperatorExpression) and matrix_product(node):
+            factors = _factors(node)
+
+            # vector inside of chain would change meaning of products next to it
+            if len(factors) > 2 and all(f.mtype.is_matrix() for f in factors[1:-1]):
+                factors = [self.optimize(f) for f in factors]
+
+                self.chains += 1
+                chain = AST.MatrixChainExpression(node.line_span, factors)
+                chain.mtype = node.mtype
+
+                dims = chain_dimensions([f.mtype.shape for f in factors])
+                if dims is not None:
+                    chain.plan = (tuple(f.mtype.shape for f in factors), chain_order(dims)[0])
+                return chain
+
+        for field in fields(node):
+            value = getattr(node, field.name)
+            if isinstance(value, AST.Node):
+                setattr(node, field.name, self.optimize(value))
+            elif isinstance(value, list):
+                setattr(node, field.name, [self.optimize(v) if isinstance(v, AST.Node) else v for v in value])
+
+        return node
+
+
+def _factors(node: AST.Expression) -> List[AST.Expression]:
+    """ Returns factors of tree of matrix products in order of source """
+    if not (isinstance(node, AST.OperatorExpression) and matrix_product(node)):
+        return [node]
+    return [f for e in node.expressions for f in _factors(e)]
@@ -0,0 +1,292 @@
+from copy import deepcopy
+from dataclasses import fields
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from compiler.interpreter.assignments import Assignments
+from compiler.interpreter.operations import shares
+from compiler.parser import AST
+from compiler.types import MType
+from compiler.utils import method_dispatch
+
+
+class RedundancyEliminator:
+    """
+    Hoists loop invariant expressions into temporaries assigned before loops and computes expressions repeated
+    in a block once, only expressions evaluated on every execution before any side effect are moved
+    """
+
+    def __init__(self):
+        self.hoisted = 0
+        self.eliminated = 0
+        self._temporaries = 0
+
+    @method_dispatch
+    def optimize(self, node: AST.Statement) -> AST.Statement:
+        """ Returns given statement with redundant expressions replaced, nested statements are rewritten in place """
+        return node
+
+    @optimize.register
+    def _(self, node: AST.ProgramStatement) -> AST.Statement:
+        node.statements = self._eliminate([self.optimize(s) for s in node.statements])
+        return node
+
+    @optimize.register
+    def _(self, node: AST.IfStatement) -> AST.Statement:
+        node.statement_then = self._block(node.statement_then)
+        if node.statement_else:
+            node.statement_else = self._block(node.statement_else)
+        return node
+
+    @optimize.register
+    def _(self, node: AST.WhileStatement) -> AST.Statement:
+        # condition has no side effects, it is evaluated once more before the hoisted expressions
+        guard = None if _true(node.condition) else deepcopy(node.condition)
+
+        assignments = Assignments(node.statement)
+        hoisted = {}
+        node.condition = self._hoist(node.condition, assignments, hoisted)
+        for statement in _leading(node.statement):
+            _rewrite_evaluated(statement, lambda e: self._hoist(e, assignments, hoisted))
+
+        node.statement = self._block(node.statement)
+        return _guarded(node, guard, list(hoisted.values())) if hoisted else node
+
+    @optimize.register
+    def _(self, node: AST.ForStatement) -> AST.Statement:
+        assignments = Assignments(node)
+        hoisted = {}
+        for statement in _leading(node.statement):
+            _rewrite_evaluated(statement, lambda e: self._hoist(e, assignments, hoisted))
+
+        node.statement = self._block(node.statement)
+        if not hoisted:
+            return node
+
+        # range of constant bounds is known not to be empty, otherwise they are compared once more
+        begin, end = node.range.begin, node.range.end
+        guard = None
+        if not (isinstance(begin, AST.ConstantExpression) and isinstance(end, AST.ConstantExpression)
+                and begin.value < end.value):
+            guard = AST.OperatorExpression(node.range.line_span, '<', [deepcopy(begin), deepcopy(end)])
+            guard.mtype = MType.BOOL
+        return _guarded(node, guard, list(hoisted.values()))
+
+    def _block(self, node: AST.Statement) -> AST.Statement:
+        """ Optimizes nested statement, single statement becomes block if temporaries are assigned before it """
+        if isinstance(node, AST.ProgramStatement):
+            return self.optimize(node)
+
+        statements = self._eliminate([self.optimize(node)])
+        return statements[0] if len(statements) == 1 else AST.ProgramStatement(node.line_span, statements)
+
+    def _temporary(self, node: AST.Expression) -> AST.Identifier:
+        """ Returns identifier of new temporary holding value of expression, names cannot appear in programs """
+        self._temporaries += 1
+        return _identifier(node, f'${self._temporaries}')
+
+    # ==============================================
+    #   LOOP INVARIANTS
+    # ==============================================
+    def _hoist(self, node: AST.Expression, assignments: Assignments,
+               hoisted: Dict[tuple, AST.AssignmentStatement]) -> AST.Expression:
+        """ Returns expression with largest invariant subexpressions replaced by temporaries assigned in hoisted """
+        if _storable(node) and not assignments.changes(node):
+            key = _key(node)
+            if key not in hoisted:
+                self.hoisted += 1
+                hoisted[key] = _assignment(self._temporary(node), node)
+            return _identifier(node, hoisted[key].variable.name)
+
+        _rewrite_children(node, lambda e: self._hoist(e, assignments, hoisted))
+        return node
+
+    # ==============================================
+    #   COMMON SUBEXPRESSIONS
+    # ==============================================
+    def _eliminate(self, statements: List[AST.Statement]) -> List[AST.Statement]:
+        """ Returns statements of block with subexpressions evaluated more than once stored in temporaries """
+        groups: List[_Group] = []
+        live: Dict[tuple, _Group] = {}
+
+        for index, statement in enumerate(statements):
+            for node, ancestors in _occurrences(statement):
+                key = _key(node)
+                if key not in live:
+                    live[key] = _Group(_size(node))
+                    groups.append(live[key])
+                live[key].occurrences.append((node, ancestors, index))
+
+            # value computed before assignment of its operand cannot be reused after it
+            assignments = Assignments(statement)
+            for key in [k for k, g in live.items() if assignments.changes(g.occurrences[0][0])]:
+                del live[key]
+
+        # larger expressions are chosen first, their repeated occurrences do not evaluate their subexpressions
+        replaced, temporaries = set(), {}
+        for group in sorted(groups, key=lambda g: -g.size):
+            evaluated = [(n, i) for n, ancestors, i in group.occurrences if not replaced.intersection(ancestors)]
+            if len(evaluated) < 2:
+                continue
+
+            self.eliminated += len(evaluated) - 1
+            group.first, group.index = evaluated[0]
+            temporary = self._temporary(group.first)
+            replaced.update(id(n) for n, _ in evaluated[1:])
+            for node, _ in evaluated:
+                temporaries[id(node)] = (temporary.name, group)
+
+        if not temporaries:
+            return statements
+
+        def substitute(node: AST.Expression) -> AST.Expression:
+            if id(node) in temporaries:
+                return _identifier(node, temporaries[id(node)][0])
+            _rewrite_children(node, substitute)
+            return node
+
+        # temporaries of subexpressions of the same statement are assigned from the smallest one
+        chosen = sorted({id(g): (n, g) for n, g in temporaries.values()}.values(), key=lambda c: (c[1].index, c[1].size))
+        definitions: Dict[int, List[AST.Statement]] = {}
+        for name, group in chosen:
+            _rewrite_children(group.first, substitute)
+            definitions.setdefault(group.index, []).append(_assignment(_identifier(group.first, name), group.first))
+
+        for statement in statements:
+            _rewrite_evaluated(statement, substitute)
+
+        return [d for i, s in enumerate(statements) for d in definitions.get(i, []) + [s]]
+
+
+class _Group:
+    """ Occurrences of the same subexpression between its first evaluation and assignment of its operand """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.occurrences: List[Tuple[AST.Expression, Tuple[int, ...], int]] = []
+
+        # first evaluated occurrence and index of its statement, set when the group is stored in temporary
+        self.first: Optional[AST.Expression] = None
+        self.index = 0
+
+
+# ==============================================
+#   EXPRESSIONS
+# ==============================================
+def _storable(node: AST.Node) -> bool:
+    """ Checks if value of expression can be stored in temporary, matrices have to be new ones and not views """
+    if not isinstance(node, (AST.OperatorExpression, AST.FunctionExpression, AST.VectorExpression)):
+        return False
+    return getattr(node, 'mtype', None) is not None and not shares(node)
+
+
+def _key(node: AST.Node) -> tuple:
+    """ Returns key of expression equal for expressions computing the same value from the same variables """
+    if isinstance(node, AST.ConstantExpression):
+        return 'constant', type(node.value), node.value
+    if isinstance(node, AST.ConstantArrayExpression):
+        return 'array', id(node.value)
+    if isinstance(node, AST.Identifier):
+        return 'identifier', node.name
+
+    children = tuple(_key(c) if isinstance(c, AST.Node) else c for c in _fields(node))
+    return (node.__class__.__name__, ) + children
+
+
+def _size(node: AST.Node) -> int:
+    return 1 + sum(_size(c) for c in _fields(node) if isinstance(c, AST.Node))
+
+
+def _fields(node: AST.Node) -> Iterator:
+    """ Yields values of fields of node except its position, lists are flattened and missing bounds are kept as None """
+    for field in fields(node):
+        if field.name == 'line_span':
+            continue
+
+        value = getattr(node, field.name)
+        if isinstance(value, list):
+            yield len(value)
+            yield from value
+        else:
+            yield value
+
+
+def _occurrences(statement: AST.Statement) -> Iterator[Tuple[AST.Expression, Tuple[int, ...]]]:
+    """ Yields storable subexpressions evaluated by statement together with ids of storable expressions containing them """
+    def visit(node: AST.Expression, ancestors: Tuple[int, ...]) -> AST.Expression:
+        if _storable(node):
+            found.append((node, ancestors))
+            ancestors += (id(node), )
+        _rewrite_children(node, lambda e: visit(e, ancestors))
+        return node
+
+    found = []
+    _rewrite_evaluated(statement, lambda e: visit(e, ()))
+    return iter(found)
+
+
+def _rewrite_children(node: AST.Node, rewrite: Callable[[AST.Expression], AST.Expression]):
+    """ Replaces child expressions of expression or variable with their rewritten versions """
+    if isinstance(node, AST.Selector):
+        node.selector.expressions = [rewrite(e) for e in node.selector.expressions]
+        return
+
+    for field in fields(node):
+        value = getattr(node, field.name)
+        if isinstance(value, AST.Node):
+            setattr(node, field.name, rewrite(value))
+        elif isinstance(value, list):
+            setattr(node, field.name, [rewrite(v) if isinstance(v, AST.Node) else v for v in value])
+
+
+def _identifier(node: AST.Expression, name: str) -> AST.Identifier:
+    identifier = AST.Identifier(node.line_span, name)
+    identifier.mtype = node.mtype
+    return identifier
+
+
+def _true(node: AST.Expression) -> bool:
+    return isinstance(node, AST.ConstantExpression) and node.value is True
+
+
+# ==============================================
+#   STATEMENTS
+# ==============================================
+def _rewrite_evaluated(node: AST.Statement, rewrite: Callable[[AST.Expression], AST.Expression]):
+    """ Replaces expressions evaluated whenever statement is executed, before any of its assignments """
+    if isinstance(node, (AST.AssignmentStatement, AST.AssignmentWithOperatorStatement)):
+        if isinstance(node.variable, AST.Selector):
+            _rewrite_children(node.variable, rewrite)
+        node.expression = rewrite(node.expression)
+
+    elif isinstance(node, AST.InstructionStatement):
+        node.arguments = [rewrite(a) for a in node.arguments]
+
+    elif isinstance(node, AST.IfStatement):
+        node.condition = rewrite(node.condition)
+
+    elif isinstance(node, AST.ForStatement):
+        node.range.begin = rewrite(node.range.begin)
+        node.range.end = rewrite(node.range.end)
+
+
+def _leading(body: AST.Statement) -> List[AST.Statement]:
+    """ Returns statements of loop body executed in every iteration before any other statement """
+    statements = body.statements if isinstance(body, AST.ProgramStatement) else [body]
+    for i, statement in enumerate(statements):
+        if not isinstance(statement, (AST.AssignmentStatement, AST.AssignmentWithOperatorStatement)):
+            return statements[:i + 1]
+    return statements
+
+
+def _assignment(identifier: AST.Identifier, node: AST.Expression) -> AST.AssignmentStatement:
+    """ Returns assignment of expression to temporary, matrices are made read-only """
+    if not node.mtype.is_scalar():
+        node = AST.FunctionExpression(node.line_span, 'freeze', [node])
+        node.mtype = identifier.mtype
+    return AST.AssignmentStatement(node.line_span, identifier, node)
+
+
+def _guarded(loop: AST.Statement, guard: Optional[AST.Expression], hoisted: List[AST.Statement]) -> AST.Statement:
+    """ Returns block assigning hoisted temporaries before loop, executed only if guard holds """
+    block = AST.ProgramStatement(loop.line_span, hoisted + [loop])
+    return block if guard is None else AST.IfStatement(loop.line_span, guard, block, None)
@@ -0,0 +1,158 @@
+from typing import Dict, List
+
+from compiler.parser import AST
+from compiler.utils import SymbolTable, method_dispatch
+
+
+class SlotResolver:
+    """
+    Assigns every identifier fixed slot of runtime frame,
+    scopes pushed by interpreter on every program block, iteration and branch are simulated once at compile time,
+    so variables declared in a scope get their own slots and reads of undefined variables get slots that stay None
+    """
+
+    def __init__(self):
+        self.scopes = SymbolTable()
+        self.names: List[str] = []
+        self.undefined: Dict[str, int] = {}
+
+    def _declare(self, node: AST.Identifier):
+        """ Resolves written identifier, existing variable is updated, otherwise new one is created in current scope """
+        if node.name not in self.scopes:
+            self.names.append(node.name)
+            self.scopes[node.name] = len(self.names) - 1
+        node.slot = self.scopes[node.name]
+
+    @method_dispatch
+    def resolve(self, node: AST.Node):
+        """ Resolves slots of all identifiers in given AST tree, frame has to have length of 'names' """
+        raise NotImplementedError(f'There is no resolution implemented for {node.__class__}')
+
+    # ==============================================
+    #   EXPRESSIONS
+    # ==============================================
+    @resolve.register
+    def _(self, node: AST.ConstantExpression):
+        pass
+
+    @resolve.register
+    def _(self, node: AST.ConstantArrayExpression):
+        pass
+
+    @resolve.register
+    def _(self, node: AST.VectorExpression):
+        for e in node.expressions:
+            self.resolve(e)
+
+    @resolve.register
+    def _(self, node: AST.RangeExpression):
+        self.resolve(node.begin)
+        self.resolve(node.end)
+
+    @resolve.register
+    def _(self, node: AST.SliceExpression):
+        for bound in (node.begin, node.end):
+            if bound is not None:
+                self.resolve(bound)
+
+    @resolve.register
+    def _(self, node: AST.OperatorExpression):
+        for e in node.expressions:
+            self.resolve(e)
+
+    @resolve.register
+    def _(self, node: AST.FusedExpression):
+        self.resolve(node.expression)
+
+    @resolve.register
+    def _(self, node: AST.MatrixChainExpression):
+        for f in node.factors:
+            self.resolve(f)
+
+    @resolve.register
+    def _(self, node: AST.FunctionExpression):
+        for a in node.arguments:
+            self.resolve(a)
+
+    # ==============================================
+    #   VARIABLES
+    # ==============================================
+    @resolve.register
+    def _(self, node: AST.Identifier):
+        if node.name in self.scopes:
+            node.slot = self.scopes[node.name]
+            return
+
+        if node.name not in self.undefined:
+            self.names.append(node.name)
+            self.undefined[node.name] = len(self.names) - 1
+        node.slot = self.undefined[node.name]
+
+    @resolve.register
+    def _(self, node: AST.Selector):
+        self.resolve(node.identifier)
+        self.resolve(node.selector)
+
+    # ==============================================
+    #   STATEMENTS
+    # ==============================================
+    @resolve.register
+    def _(self, node: AST.ProgramStatement):
+        with self.scopes.context_scope('program'):
+            for s in node.statements:
+                self.resolve(s)
+
+    @resolve.register
+    def _(self, node: AST.AssignmentStatement):
+        self.resolve(node.expression)
+
+        if isinstance(node.variable, AST.Identifier):
+            self._declare(node.variable)
+        else:
+            self.resolve(node.variable)
+
+    @resolve.register
+    def _(self, node: AST.AssignmentWithOperatorStatement):
+        self.resolve(node.expression)
+
+        if isinstance(node.variable, AST.Identifier):
+            self._declare(node.variable)
+        else:
+            self.resolve(node.variable)
+
+    @resolve.register
+    def _(self, node: AST.InstructionStatement):
+        for a in node.arguments:
+            self.resolve(a)
+
+    @resolve.register
+    def _(self, node: AST.WhileStatement):
+        self.resolve(node.condition)
+        with self.scopes.context_scope('while'):
+            self.resolve(node.statement)
+
+    @resolve.register
+    def _(self, node: AST.ForStatement):
+        self.resolve(node.range)
+        with self.scopes.context_scope('for'):
+            self._declare(node.identifier)
+            self.resolve(node.statement)
+
+    @resolve.register
+    def _(self, node: AST.VectorizedForStatement):
+        self.resolve(node.loop)
+
+    @resolve.register
+    def _(self, node: AST.ReleaseStatement):
+        for identifier in node.identifiers:
+            self.resolve(identifier)
+
+    @resolve.register
+    def _(self, node: AST.IfStatement):
+        self.resolve(node.condition)
+        with self.scopes.context_scope('then'):
+            self.resolve(node.statement_then)
+
+        if node.statement_else:
+            with self.scopes.context_scope('else'):
+                self.resolve(node.statement_else)
@@ -0,0 +1,274 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from compiler.interpreter.vectorized import VECTOR_OPERATIONS, loop_body, single_statement
+from compiler.parser import AST
+from compiler.types import MType
+from compiler.utils import method_dispatch
+
+# operators of conditions of min and max reductions, mirrored ones are used when reduced variable is on the left
+EXTREMES: Dict[str, str] = {'>': 'max', '>=': 'max', '<': 'min', '<=': 'min'}
+MIRRORED: Dict[str, str] = {'>': '<', '>=': '<=', '<': '>', '<=': '>='}
+
+
+class NotVectorizable(Exception):
+    """ Raised during analysis of loop, message tells why the loop has to be executed iteration by iteration """
+    pass
+
+
+class Vectorizer:
+    """ Replaces for loops with independent iterations with VectorizedForStatement, report tells why others are not """
+
+    def __init__(self):
+        self.report: List[Tuple[int, str]] = []
+
+    @method_dispatch
+    def vectorize(self, node: AST.Statement) -> AST.Statement:
+        """ Returns given statement with vectorizable loops replaced, nested statements are rewritten in place """
+        return node
+
+    @vectorize.register
+    def _(self, node: AST.ProgramStatement) -> AST.Statement:
+        node.statements = [self.vectorize(s) for s in node.statements]
+        return node
+
+    @vectorize.register
+    def _(self, node: AST.WhileStatement) -> AST.Statement:
+        node.statement = self.vectorize(node.statement)
+        return node
+
+    @vectorize.register
+    def _(self, node: AST.IfStatement) -> AST.Statement:
+        node.statement_then = self.vectorize(node.statement_then)
+        if node.statement_else:
+            node.statement_else = self.vectorize(node.statement_else)
+        return node
+
+    @vectorize.register
+    def _(self, node: AST.ForStatement) -> AST.Statement:
+        name = node.identifier.name
+
+        try:
+            kinds = self._analyze(node)
+        except NotVectorizable as err:
+            self.report.append((node.line_span[0], f'loop over {name} not vectorized: {err}'))
+            node.statement = self.vectorize(node.statement)
+            return node
+
+        self.report.append((node.line_span[0], f'loop over {name} vectorized ({", ".join(kinds) or "empty"})'))
+        return AST.VectorizedForStatement(node.line_span, node, kinds)
+
+    # ==============================================
+    #   ANALYSIS
+    # ==============================================
+    def _analyze(self, loop: AST.ForStatement) -> List[str]:
+        """ Returns kinds of statements of loop body, raises NotVectorizable if loop has to stay as it is """
+        name = loop.identifier.name
+
+        # bounds are evaluated once before the loop, only scalars are allowed there
+        for bound in (loop.range.begin, loop.range.end):
+            if self._selectors(bound) != []:
+                raise NotVectorizable('range bounds are not simple scalar expressions')
+
+        kinds, targets, reads = [], [], set()
+        for statement in loop_body(loop):
+            kind, target, read = self._classify(statement, name)
+            kinds.append(kind)
+            reads |= read
+            if kind not in ('map', 'masked_map'):
+                targets.append(target)
+
+        # every reduced variable has single statement updating it and is not read anywhere else
+        for target in targets:
+            if target == name:
+                raise NotVectorizable(f'loop variable {name} is assigned')
+            if targets.count(target) > 1:
+                raise NotVectorizable(f'{target} is reduced by more than one statement')
+            if target in reads:
+                raise NotVectorizable(f'{target} is reduced and read in the same loop')
+
+        return kinds
+
+    def _classify(self, node: AST.Statement, name: str) -> Tuple[str, str, Set[str]]:
+        """ Returns kind of statement of loop body, its target and names of variables read by it """
+        line = node.line_span[0]
+
+        # X[i] = e and X[i] op= e
+        if isinstance(node, (AST.AssignmentStatement, AST.AssignmentWithOperatorStatement)) \
+                and isinstance(node.variable, AST.Selector):
+            target = self._indexed(node.variable, name)
+            if isinstance(node, AST.AssignmentWithOperatorStatement) and node.operator[:1] not in VECTOR_OPERATIONS:
+                raise NotVectorizable(f'operator {node.operator} at line {line} has no elementwise counterpart')
+            return 'map', target, self._elementwise(node.expression, name)
+
+        # s += e and s -= e
+        if isinstance(node, AST.AssignmentWithOperatorStatement):
+            return self._sum('sum', node, name)
+
+        if isinstance(node, AST.AssignmentStatement):
+            raise NotVectorizable(f'assignment to {node.variable.name} at line {line} is carried between iterations')
+
+        if not isinstance(node, AST.IfStatement):
+            raise NotVectorizable(f'{_describe(node)} at line {line} cannot be vectorized')
+
+        then = single_statement(node.statement_then)
+        if node.statement_else or then is None:
+            raise NotVectorizable(f'if statement at line {line} is not a reduction or conditional map')
+
+        # if (c) X[i] = e and if (c) X[i] op= e
+        if isinstance(then, (AST.AssignmentStatement, AST.AssignmentWithOperatorStatement)) \
+                and isinstance(then.variable, AST.Selector):
+            reads = self._condition(node.condition, name)
+            _, target, read = self._classify(then, name)
+            return 'masked_map', target, reads | read
+
+        # if (c) s += e and if (c) s += 1, floats are summed in order so they are rounded like in loop
+        if isinstance(then, AST.AssignmentWithOperatorStatement) and isinstance(then.variable, AST.Identifier):
+            reads = self._condition(node.condition, name)
+            counted = isinstance(then.expression, AST.ConstantExpression) and then.expression.mtype == MType.INT
+            kind = 'count' if counted and then.variable.mtype == MType.INT else 'masked_sum'
+            kind, target, read = self._sum(kind, then, name)
+            return kind, target, reads | read
+
+        # if (e > m) m = e and its variants
+        if isinstance(then, AST.AssignmentStatement) and isinstance(then.variable, AST.Identifier):
+            return self._extreme(node.condition, then, name)
+
+        raise NotVectorizable(f'if statement at line {line} is not a reduction or conditional map')
+
+    def _sum(self, kind: str, node: AST.AssignmentWithOperatorStatement, name: str) -> Tuple[str, str, Set[str]]:
+        """ Checks sum reduction into scalar variable """
+        line = node.line_span[0]
+
+        if node.operator not in ('+=', '-='):
+            raise NotVectorizable(f'operator {node.operator} at line {line} is not a sum reduction')
+        if not _numeric(node.variable) or not _numeric(node.expression):
+            raise NotVectorizable(f'sum into {node.variable.name} at line {line} is not numeric')
+
+        return kind, node.variable.name, self._elementwise(node.expression, name)
+
+    def _extreme(self, condition: AST.Expression, node: AST.AssignmentStatement, name: str) -> Tuple[str, str, Set[str]]:
+        """ Checks min or max reduction, condition has to compare assigned expression with assigned variable """
+        line = node.line_span[0]
+        target = node.variable.name
+
+        if not isinstance(condition, AST.OperatorExpression) or condition.operator not in EXTREMES:
+            raise NotVectorizable(f'if statement at line {line} is not a reduction')
+
+        left, right = condition.expressions
+        operator = condition.operator
+        if isinstance(left, AST.Identifier) and left.name == target:
+            left, right, operator = right, left, MIRRORED[operator]
+
+        if not (isinstance(right, AST.Identifier) and right.name == target and _same(left, node.expression)):
+            raise NotVectorizable(f'conditional assignment to {target} at line {line} is not min or max')
+
+        # type of assigned variable is known from condition only, assignments are not annotated
+        if not _numeric(right) or not _numeric(node.expression):
+            raise NotVectorizable(f'min or max into {target} at line {line} is not numeric')
+
+        return EXTREMES[operator], target, self._elementwise(node.expression, name)
+
+    def _condition(self, node: AST.Expression, name: str) -> Set[str]:
+        """ Checks condition of masked reduction, returns names it reads """
+        reads = self._elementwise(node, name)
+        if node.mtype.type is not bool:
+            raise NotVectorizable(f'condition at line {node.line_span[0]} is not boolean')
+        return reads
+
+    def _indexed(self, node: AST.Selector, name: str) -> str:
+        """ Checks that vector is indexed by loop variable only and returns its name """
+        line = node.line_span[0]
+        var = node.identifier
+
+        index = node.selector.expressions
+        if len(index) != 1 or not isinstance(index[0], AST.Identifier) or index[0].name != name:
+            raise NotVectorizable(f'{var.name} at line {line} is not indexed by loop variable {name}')
+        if not var.mtype.is_vector() or var.mtype.type not in (int, float, bool):
+            raise NotVectorizable(f'{var.name} at line {line} is not numeric vector')
+
+        return var.name
+
+    def _elementwise(self, node: AST.Expression, name: str) -> Set[str]:
+        """ Checks that expression is computed elementwise from scalars and vectors indexed by loop variable """
+        selectors = self._selectors(node)
+        if selectors is None:
+            raise NotVectorizable(f'expression at line {node.line_span[0]} is not elementwise')
+
+        for selector in selectors:
+            self._indexed(selector, name)
+        return _names(node)
+
+    def _selectors(self, node: AST.Expression) -> Optional[List[AST.Selector]]:
+        """ Returns selectors of scalar numeric expression or None if it cannot be evaluated on whole arrays """
+        if not _numeric(node) and not _boolean(node):
+            return None
+
+        if isinstance(node, AST.ConstantExpression):
+            return []
+
+        if isinstance(node, AST.Identifier):
+            return []
+
+        if isinstance(node, AST.Selector):
+            return [node]
+
+        if isinstance(node, AST.OperatorExpression) and node.operator in VECTOR_OPERATIONS:
+            selectors = []
+            for e in node.expressions:
+                # arithmetic of booleans differs between python and numpy
+                if not _numeric(e):
+                    return None
+                nested = self._selectors(e)
+                if nested is None:
+                    return None
+                selectors += nested
+            return selectors
+
+        return None
+
+
+def _numeric(node: AST.Node) -> bool:
+    mtype = getattr(node, 'mtype', None)
+    return mtype is not None and mtype.is_scalar() and mtype.type in (int, float)
+
+
+def _boolean(node: AST.Node) -> bool:
+    mtype = getattr(node, 'mtype', None)
+    return mtype is not None and mtype.is_scalar() and mtype.type is bool
+
+
+def _names(node: AST.Node) -> Set[str]:
+    """ Returns names of variables read by elementwise expression """
+    if isinstance(node, AST.Identifier):
+        return {node.name}
+    if isinstance(node, AST.Selector):
+        return {node.identifier.name}
+    if isinstance(node, AST.OperatorExpression):
+        return set().union(*[_names(e) for e in node.expressions])
+    return set()
+
+
+def _same(a: AST.Node, b: AST.Node) -> bool:
+    """ Compares elementwise expressions ignoring their positions in source """
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, AST.ConstantExpression):
+        return type(a.value) is type(b.value) and a.value == b.value
+    if isinstance(a, AST.Identifier):
+        return a.name == b.name
+    if isinstance(a, AST.Selector):
+        return _same(a.identifier, b.identifier) and len(a.selector.expressions) == len(b.selector.expressions) \
+            and all(_same(x, y) for x, y in zip(a.selector.expressions, b.selector.expressions))
+    if isinstance(a, AST.OperatorExpression):
+        return a.operator == b.operator and all(_same(x, y) for x, y in zip(a.expressions, b.expressions))
+    return False
+
+
+def _describe(node: AST.Statement) -> str:
+    if isinstance(node, AST.InstructionStatement):
+        return f'{node.name} instruction'
+    if isinstance(node, (AST.ForStatement, AST.VectorizedForStatement)):
+        return 'nested for loop'
+    if isinstance(node, AST.WhileStatement):
+        return 'while loop'
+    return 'block'
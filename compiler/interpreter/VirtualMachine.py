@@ -0,0 +1,94 @@
+from typing import Any
+
+import numpy as np
+
+from compiler.interpreter.BytecodeCompiler import Bytecode
+from compiler.interpreter.opcodes import (
+    MOVE, OP1, OP2, OPK, CALL, VECTOR, INDEX1, INDEX2, INDEX, STORE1, STORE, UPDATE,
+    JUMP, JUMP_IF_NOT, JUMP_IF_NOT_OP, FOR_NEXT, RETURN, VECTOR_FOR, INPLACE
+)
+from compiler.interpreter.operations import apply_inplace, make_writable
+
+
+class VirtualMachine:
+    """ Register machine executing bytecode produced by BytecodeCompiler """
+
+    def run(self, bytecode: Bytecode) -> Any:
+        """ Executes bytecode in fresh frame and returns value of return instruction """
+        regs = [None] * bytecode.size
+        for register, value in bytecode.constants:
+            regs[register] = value
+
+        code = bytecode.code
+        pc = 0
+
+        # instructions are ordered by how often they are executed in loops
+        while True:
+            op, a, b, c, d = code[pc]
+            pc += 1
+
+            if op == OPK:
+                regs[a] = b(regs[c], d)
+            elif op == OP2:
+                regs[a] = b(regs[c], regs[d])
+            elif op == FOR_NEXT:
+                i = regs[a]
+                if i < regs[b]:
+                    regs[c] = i
+                    regs[a] = i + 1
+                else:
+                    pc = d
+            elif op == JUMP_IF_NOT_OP:
+                if not a(regs[b], regs[c]):
+                    pc = d
+            elif op == JUMP:
+                pc = a
+            elif op == INDEX1:
+                regs[a] = regs[b][regs[c]]
+            elif op == MOVE:
+                regs[a] = regs[b]
+            elif op == STORE1:
+                self._writable(regs, a)[regs[b]] = regs[c]
+            elif op == INDEX2:
+                regs[a] = regs[b][regs[c], regs[d]]
+            elif op == OP1:
+                regs[a] = b(regs[c])
+            elif op == JUMP_IF_NOT:
+                if not regs[a]:
+                    pc = b
+            elif op == CALL:
+                regs[a] = b(*[regs[r] for r in c])
+            elif op == UPDATE:
+                var = self._writable(regs, a)
+                index = tuple([regs[r] for r in b])
+                var[index] = c(var[index], regs[d])
+
+                # reference kept until the next write would make matrix look shared with another variable
+                del var
+            elif op == STORE:
+                self._writable(regs, a)[tuple([regs[r] for r in b])] = regs[c]
+            elif op == INDEX:
+                regs[a] = regs[b][tuple([regs[r] for r in c])]
+            elif op == VECTOR:
+                regs[a] = np.asarray([regs[r] for r in b])
+            elif op == RETURN:
+                return regs[a]
+            elif op == VECTOR_FOR:
+                if a(regs):
+                    pc = b
+            elif op == INPLACE:
+                var = self._writable(regs, a)
+                if b:
+                    index = tuple([regs[r] for r in b])
+                    if not apply_inplace(c, var[index], regs[d]):
+                        var[index] = c(var[index], regs[d])
+                elif not apply_inplace(c, var, regs[d]):
+                    regs[a] = c(var, regs[d])
+                del var
+            else:
+                raise ValueError(f'Unknown opcode {op}')
+
+    @staticmethod
+    def _writable(regs: list, register: int) -> Any:
+        """ Returns value of variable that is about to be written, shared arrays are copied and rebound first """
+        return make_writable(regs, register)
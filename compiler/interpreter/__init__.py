@@ -1,2 +1,11 @@
 """ Interpreter module """
 from .Interpreter import Interpreter, ExecutionError
+from .SlotResolver import SlotResolver
+from .Vectorizer import Vectorizer
+from .ConstantFolder import ConstantFolder
+from .RedundancyEliminator import RedundancyEliminator
+from .ExpressionFuser import ExpressionFuser
+from .MatrixChainOptimizer import MatrixChainOptimizer
+from .LivenessAnalyzer import LivenessAnalyzer
+from .BytecodeCompiler import BytecodeCompiler, disassemble
+from .VirtualMachine import VirtualMachine
@@ -0,0 +1,62 @@
+from dataclasses import fields
+from typing import Iterator, Set
+
+from compiler.interpreter.operations import inplace
+from compiler.parser import AST
+
+
+class Assignments:
+    """
+    Variables assigned by statement and its nested statements, collected from assignments and loop variables,
+    writes into elements of matrices are tracked separately as they change every variable referring to the matrix
+    """
+
+    def __init__(self, node: AST.Node):
+        self.names: Set[str] = set()
+        self.elements = False
+        self._collect(node)
+
+    def _collect(self, node: AST.Node):
+        if isinstance(node, (AST.AssignmentStatement, AST.AssignmentWithOperatorStatement)):
+            if isinstance(node.variable, AST.Selector):
+                self.names.add(node.variable.identifier.name)
+                self.elements = True
+            else:
+                self.names.add(node.variable.name)
+                self.elements |= inplace(node)
+
+        if isinstance(node, AST.ForStatement):
+            self.names.add(node.identifier.name)
+
+        for child in _children(node):
+            self._collect(child)
+
+    def changes(self, node: AST.Expression) -> bool:
+        """ Checks if value of expression may be different after the assignments """
+        for identifier in read_identifiers(node):
+            if identifier.name in self.names:
+                return True
+            if self.elements and not identifier.mtype.is_scalar():
+                return True
+        return False
+
+
+def read_identifiers(node: AST.Node) -> Iterator[AST.Identifier]:
+    """ Yields identifiers of variables read by expression, selected matrices included """
+    return (n for n in subtree(node) if isinstance(n, AST.Identifier))
+
+
+def subtree(node: AST.Node) -> Iterator[AST.Node]:
+    """ Yields given node and all nodes nested in it """
+    yield node
+    for child in _children(node):
+        yield from subtree(child)
+
+
+def _children(node: AST.Node) -> Iterator[AST.Node]:
+    for field in fields(node):
+        value = getattr(node, field.name)
+        if isinstance(value, AST.Node):
+            yield value
+        elif isinstance(value, list):
+            yield from (v for v in value if isinstance(v, AST.Node))
@@ -0,0 +1,107 @@
+import sys
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# matrices with fewer elements are allocated by numpy directly
+DEFAULT_THRESHOLD = 1 << 18
+
+# references to buffer while its matrix is finalized, local variable, argument of getrefcount and the dying matrix
+_FINALIZED_REFERENCES = 3
+
+
+class BufferPool:
+    """
+    Keeps buffers of matrices that are not used anymore to be reused by following matrices of the same shape and type,
+    matrices are handed out as views of buffers and buffers return to the pool when their views die,
+    buffer still viewed by other matrices is left to numpy, pool keeps at most 'capacity' bytes
+    and drops buffers of shapes returned least recently when it is full
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._free: OrderedDict[Tuple[tuple, str], List[np.ndarray]] = OrderedDict()
+        self._lent: Dict[int, Tuple[weakref.ref, np.ndarray]] = {}
+
+    def empty(self, shape: tuple, dtype: np.dtype) -> np.ndarray:
+        """ Returns uninitialized matrix, from free buffer of the same shape and type if there is one """
+        key = (shape, np.dtype(dtype).str)
+        buffers = self._free.get(key)
+
+        if buffers:
+            self.hits += 1
+            buffer = buffers.pop()
+            if not buffers:
+                del self._free[key]
+            self.size -= buffer.nbytes
+
+            # buffer could be shared as read-only, nothing refers to it anymore
+            buffer.flags.writeable = True
+        else:
+            self.misses += 1
+            buffer = np.empty(shape, dtype)
+
+        # weak reference is kept with the buffer so its callback is called when the matrix dies
+        matrix = buffer.view()
+        reference = weakref.ref(matrix, self._return)
+        self._lent[id(reference)] = (reference, buffer)
+        return matrix
+
+    def clear(self):
+        """ Drops all free buffers, buffers of living matrices return to the pool later """
+        self._free.clear()
+        self.size = 0
+
+    def _return(self, reference: weakref.ref):
+        _, buffer = self._lent.pop(id(reference))
+        if sys.getrefcount(buffer) > _FINALIZED_REFERENCES or buffer.nbytes > self.capacity:
+            return
+
+        key = (buffer.shape, buffer.dtype.str)
+        self._free.setdefault(key, []).append(buffer)
+        self._free.move_to_end(key)
+        self.size += buffer.nbytes
+
+        while self.size > self.capacity:
+            oldest = next(iter(self._free))
+            buffers = self._free[oldest]
+            self.size -= buffers.pop(0).nbytes
+            self.evictions += 1
+            if not buffers:
+                del self._free[oldest]
+
+
+_pool: Optional[BufferPool] = None
+_threshold = DEFAULT_THRESHOLD
+
+
+def configure(capacity: int = 0, threshold: int = DEFAULT_THRESHOLD):
+    """ Sets size in bytes of pool of buffers of matrices with at least 'threshold' elements, zero disables the pool """
+    global _pool, _threshold
+
+    _pool = BufferPool(capacity) if capacity > 0 else None
+    _threshold = threshold
+
+
+def pool() -> Optional[BufferPool]:
+    """ Returns configured pool with its counters, None if it is disabled """
+    return _pool
+
+
+def enabled(size: int) -> bool:
+    """ Checks if matrix of given number of elements is allocated from the pool """
+    return _pool is not None and size >= _threshold
+
+
+def empty(shape: tuple, dtype: np.dtype = np.float64) -> np.ndarray:
+    """ Returns uninitialized matrix, large matrices are taken from the pool if it is enabled """
+    if enabled(int(np.prod(shape))):
+        return _pool.empty(tuple(shape), dtype)
+    return np.empty(shape, dtype)
@@ -0,0 +1,108 @@
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from compiler.interpreter import buffers
+from compiler.interpreter.parallel import result_dtype
+from compiler.interpreter.operations import OPERATIONS
+from compiler.parser import AST
+
+# element wise operators evaluated without temporaries of full size
+FUSED_OPERATIONS: Dict[str, np.ufunc] = {
+    '.+':   np.add,
+    '.-':   np.subtract,
+    '.*':   np.multiply,
+    './':   np.true_divide,
+}
+
+# number of elements computed at once, scratch buffers of this size stay in cache
+BLOCK_SIZE = 1 << 14
+
+
+def fusable(node: AST.Node) -> bool:
+    """ Checks if node is an operator that can be fused with its operands """
+    return isinstance(node, AST.OperatorExpression) and node.operator in FUSED_OPERATIONS
+
+
+def fused_leaves(node: AST.Expression) -> List[AST.Expression]:
+    """ Returns operands of fused tree of operators in order of evaluation """
+    if not fusable(node):
+        return [node]
+    return [leaf for e in node.expressions for leaf in fused_leaves(e)]
+
+
+def evaluate_fused(node: AST.FusedExpression, values: List[Any]) -> Any:
+    """
+    Evaluates fused tree of operators on already evaluated leaves,
+    matrices of the same shape are processed in blocks written straight into preallocated result,
+    intermediate results of block live in small scratch buffers reused by following blocks
+    """
+    shape = np.shape(values[0])
+    if any(not isinstance(v, np.ndarray) or v.shape != shape for v in values) or np.prod(shape) <= BLOCK_SIZE:
+        return _evaluate(node.expression, iter(values))
+
+    plan, dtype = _plan(node.expression, enumerate([v.dtype for v in values]))
+    result = buffers.empty(shape, dtype)
+
+    # contiguous matrices are processed as flat vectors, others in blocks of rows
+    if all(v.flags.c_contiguous for v in values):
+        arrays, target = [v.reshape(-1) for v in values], result.reshape(-1)
+        step = BLOCK_SIZE
+    else:
+        arrays, target = values, result
+        step = max(1, BLOCK_SIZE // max(1, int(np.prod(shape[1:]))))
+
+    free: Dict[np.dtype, List[np.ndarray]] = {}
+    length = len(target)
+    for start in range(0, length, step):
+        stop = min(start + step, length)
+        stack: List[Tuple[np.ndarray, bool]] = []
+
+        for i, (ufunc, dtype) in enumerate(plan):
+            # leaf is given by its index instead of type
+            if ufunc is None:
+                stack.append((arrays[dtype][start:stop], False))
+                continue
+
+            (b, b_scratch), (a, a_scratch) = stack.pop(), stack.pop()
+            for value, scratch in ((a, a_scratch), (b, b_scratch)):
+                if scratch:
+                    free.setdefault(value.dtype, []).append(value.base if value.base is not None else value)
+
+            if i == len(plan) - 1:
+                out = target[start:stop]
+            else:
+                spare = free.get(dtype)
+                out = (spare.pop() if spare else np.empty((step, ) + target.shape[1:], dtype))[:stop - start]
+
+            ufunc(a, b, out=out)
+            stack.append((out, True))
+
+    return result
+
+
+def _evaluate(node: AST.Expression, values: Iterator[Any]) -> Any:
+    """ Evaluates fused tree operator by operator, used when blocks cannot be formed """
+    if not fusable(node):
+        return next(values)
+    return OPERATIONS[node.operator](*[_evaluate(e, values) for e in node.expressions])
+
+
+def _plan(node: AST.Expression, leaves: Iterator[Tuple[int, np.dtype]]) -> Tuple[List[tuple], np.dtype]:
+    """
+    Returns postfix list of ufuncs with types of their results and type of result of whole tree,
+    leaves are represented by None and their index instead of type
+    """
+    if not fusable(node):
+        index, dtype = next(leaves)
+        return [(None, index)], dtype
+
+    plan, types = [], []
+    for e in node.expressions:
+        p, t = _plan(e, leaves)
+        plan += p
+        types.append(t)
+
+    ufunc = FUSED_OPERATIONS[node.operator]
+    dtype = result_dtype(ufunc, *types)
+    return plan + [(ufunc, dtype)], dtype
@@ -1,22 +1,3 @@
-from typing import Any
+# statuses returned by executed statements to interrupt enclosing loops and program, None means normal completion
+BREAK, CONTINUE, RETURN = 1, 2, 3
 
-
-class Interruption(Exception):
-    """ Base exception used for control flow """
-    pass
-
-
-class BreakInterruption(Interruption):
-    """ Control flow exception raised in case of break instruction """
-    pass
-
-
-class ContinueInterruption(Interruption):
-    """ Control flow exception raised in case of continue instruction """
-    pass
-
-
-class ReturnInterruption(Interruption):
-    """ Control flow exception raised is case of return instruction """
-    def __init__(self, value: Any):
-        self.value = value
@@ -0,0 +1,63 @@
+from typing import Any, List, Optional, Tuple, Union
+
+import numpy as np
+
+from compiler.parser import AST
+
+# order of multiplication, index of factor or pair of orders of multiplied subchains
+Order = Union[int, Tuple['Order', 'Order']]
+
+
+def chain_dimensions(shapes: List[tuple]) -> Optional[List[int]]:
+    """
+    Returns dimensions of chain of matrices, i-th factor has shape dims[i] x dims[i + 1],
+    vector is row when it is the first factor and column when it is the last one, None if some dimension is unknown
+    """
+    dims = [1 if len(shapes[0]) == 1 else shapes[0][0]]
+    for i, shape in enumerate(shapes):
+        dims.append(shape[1] if len(shape) == 2 else shape[0] if i == 0 else 1)
+    return None if None in dims else dims
+
+
+def chain_order(dims: List[int]) -> Tuple[Order, int]:
+    """
+    Returns cheapest order of multiplication of chain of matrices with given dimensions and number of scalar
+    multiplications it takes, classic dynamic programming over subchains, ties keep order of source
+    """
+    n = len(dims) - 1
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            cost[i][j] = None
+            for k in range(i, j):
+                c = cost[i][k] + cost[k + 1][j] + dims[i] * dims[k + 1] * dims[j + 1]
+                if cost[i][j] is None or c <= cost[i][j]:
+                    cost[i][j], split[i][j] = c, k
+
+    def order(i: int, j: int) -> Order:
+        if i == j:
+            return i
+        k = split[i][j]
+        return order(i, k), order(k + 1, j)
+
+    return order(0, n - 1), cost[0][n - 1]
+
+
+def evaluate_chain(node: AST.MatrixChainExpression, values: List[Any]) -> Any:
+    """ Multiplies evaluated factors of chain in the cheapest order, order is found once for shapes of factors and reused """
+    shapes = tuple(np.shape(v) for v in values)
+    plan = getattr(node, 'plan', None)
+
+    if plan is None or plan[0] != shapes:
+        plan = node.plan = (shapes, chain_order(chain_dimensions(shapes))[0])
+
+    return _multiply(plan[1], values)
+
+
+def _multiply(order: Order, values: List[Any]) -> Any:
+    if isinstance(order, int):
+        return values[order]
+    return np.matmul(_multiply(order[0], values), _multiply(order[1], values))
@@ -0,0 +1,68 @@
+from typing import Dict
+
+# Every instruction is a tuple of opcode and exactly four operands, unused operands are None.
+# Formats describe operands: 'r' register, 'R' tuple of registers, 'f' function, 'k' inline constant, 'j' jump target
+
+MOVE = 0            # a = b
+OP1 = 1             # a = b(c)
+OP2 = 2             # a = b(c, d)
+OPK = 3             # a = b(c, d), superinstruction of load, constant, operation and store
+CALL = 4            # a = b(*c)
+VECTOR = 5          # a = array(b)
+INDEX1 = 6          # a = b[c], superinstruction of scalar index read
+INDEX2 = 7          # a = b[c, d], superinstruction of scalar index read
+INDEX = 8           # a = b[c]
+STORE1 = 9          # a[b] = c, copies read-only array in a first
+STORE = 10          # a[b] = c, copies read-only array in a first
+UPDATE = 11         # a[b] = c(a[b], d), copies read-only array in a first
+JUMP = 12           # goto a
+JUMP_IF_NOT = 13    # if not a: goto b
+JUMP_IF_NOT_OP = 14 # if not a(b, c): goto d, superinstruction of comparison and branch
+FOR_NEXT = 15       # if a < b: c = a, a += 1 else goto d
+RETURN = 16         # return a
+VECTOR_FOR = 17     # if a(regs): goto b, vectorized loop, its ordinary loop follows as fallback
+INPLACE = 18        # a[b] = c(a[b], d) or a = c(a, d) if b is empty, written into buffer of a[b] if possible
+
+NAMES: Dict[int, str] = {
+    MOVE: 'MOVE',
+    OP1: 'OP1',
+    OP2: 'OP2',
+    OPK: 'OPK',
+    CALL: 'CALL',
+    VECTOR: 'VECTOR',
+    INDEX1: 'INDEX1',
+    INDEX2: 'INDEX2',
+    INDEX: 'INDEX',
+    STORE1: 'STORE1',
+    STORE: 'STORE',
+    UPDATE: 'UPDATE',
+    JUMP: 'JUMP',
+    JUMP_IF_NOT: 'JUMP_IF_NOT',
+    JUMP_IF_NOT_OP: 'JUMP_IF_NOT_OP',
+    FOR_NEXT: 'FOR_NEXT',
+    RETURN: 'RETURN',
+    VECTOR_FOR: 'VECTOR_FOR',
+    INPLACE: 'INPLACE',
+}
+
+FORMATS: Dict[int, str] = {
+    MOVE: 'rr',
+    OP1: 'rfr',
+    OP2: 'rfrr',
+    OPK: 'rfrk',
+    CALL: 'rfR',
+    VECTOR: 'rR',
+    INDEX1: 'rrr',
+    INDEX2: 'rrrr',
+    INDEX: 'rrR',
+    STORE1: 'rrr',
+    STORE: 'rRr',
+    UPDATE: 'rRfr',
+    JUMP: 'j',
+    JUMP_IF_NOT: 'rj',
+    JUMP_IF_NOT_OP: 'frrj',
+    FOR_NEXT: 'rrrj',
+    RETURN: 'r',
+    VECTOR_FOR: 'fj',
+    INPLACE: 'rRfr',
+}
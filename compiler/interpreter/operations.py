@@ -1,16 +1,11 @@
 import operator
-from typing import Type, Any, Callable, Dict
+import sys
+from typing import Any, Callable, Dict, List, Tuple
 
 import numpy as np
 
-from compiler.interpreter.interuptions import BreakInterruption, ContinueInterruption, ReturnInterruption
-
-
-def raise_operation(err: Type[Exception]) -> Callable:
-    """ Returns function that raises given exception """
-    def func(*args):
-        raise err(*args)
-    return func
+from compiler.interpreter import parallel
+from compiler.parser import AST
 
 
 def extended_add(a: Any, b: Any) -> Any:
@@ -21,11 +16,118 @@ def extended_add(a: Any, b: Any) -> Any:
     return a + b
 
 
-def parse_tuple(f: Callable) -> Callable:
-    """ Decorates given function by casting arguments to one tuple """
-    def func(*args):
-        return f(tuple(args))
-    return func
+def where(condition: Any, a: Any, b: Any) -> Any:
+    """ Selects elements of a where condition holds and elements of b elsewhere, scalar arguments give scalar """
+    result = np.where(condition, a, b)
+    return result[()] if result.ndim == 0 else result
+
+
+def make_writable(frame: List[Any], slot: int) -> Any:
+    """
+    Returns value of variable in given slot that is about to be written, array shared with other variables is copied
+    and rebound, array that nothing else refers to anymore is made writable again instead
+    """
+    value = frame[slot]
+    if not isinstance(value, np.ndarray):
+        return value
+    if value.flags.writeable and not (isinstance(value.base, np.ndarray) and not value.base.flags.writeable):
+        return value
+
+    # ownership is tracked by references, variables and views sharing array or array it is view of refer to it
+    if all(n <= owned for n, owned in zip(_references(frame, slot), _OWNED_REFERENCES)) and _unfreeze(value):
+        return value
+
+    frame[slot] = value = value.copy()
+    return value
+
+
+def _references(frame: List[Any], slot: int) -> Tuple[int, int]:
+    """ Returns numbers of references to array in given slot and to array it is view of """
+    value = frame[slot]
+    base = value.base
+    return sys.getrefcount(value), sys.getrefcount(base) if isinstance(base, np.ndarray) else 0
+
+
+def _owned_references() -> Tuple[int, int]:
+    # references counted by make_writable to view of array referred to only by the slot, they differ between versions
+    frame = [np.zeros(2)[1:]]
+    value = frame[0]
+    return _references(frame, 0)
+
+
+_OWNED_REFERENCES = _owned_references()
+
+
+def _unfreeze(value: np.ndarray) -> bool:
+    """ Makes array and array it is view of writable, returns False if memory of other object cannot be written """
+    try:
+        if isinstance(value.base, np.ndarray):
+            value.base.flags.writeable = True
+        value.flags.writeable = True
+    except ValueError:
+        return False
+    return True
+
+
+def freeze(value: Any) -> Any:
+    """ Returns given value, arrays are made read-only so that variables sharing them copy them before writing """
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    return value
+
+
+def share(value: Any) -> Any:
+    """ Returns given value, arrays and arrays they are views of are read-only until only one variable refers to them """
+    array = value
+    while isinstance(array, np.ndarray):
+        array.flags.writeable = False
+        array = array.base
+    return value
+
+
+def apply_inplace(ufunc: np.ufunc, target: Any, value: Any) -> bool:
+    """ Writes result of ufunc into buffer of target, returns False if target is not writable array or result does not fit it """
+    if not isinstance(target, np.ndarray) or not target.flags.writeable:
+        return False
+
+    try:
+        if np.result_type(target, value) != target.dtype or np.broadcast_shapes(target.shape, np.shape(value)) != target.shape:
+            return False
+    except (TypeError, ValueError):
+        return False
+
+    ufunc(target, value, out=target)
+    return True
+
+
+def matrix_product(node: Any) -> bool:
+    """ Checks if type checker found that operator expression or compound assignment multiplies two matrices """
+    if isinstance(node, AST.AssignmentWithOperatorStatement):
+        operator, operands = node.operator[:-1], [node.variable, node.expression]
+    else:
+        operator, operands = node.operator, node.expressions
+    return operator == '*' and all(getattr(e, 'mtype', None) is not None and not e.mtype.is_scalar() for e in operands)
+
+
+def operator_function(node: Any) -> Callable:
+    """ Returns function computing operator expression or compound assignment, product of matrices multiplies them """
+    if matrix_product(node):
+        return OPERATIONS['matmul']
+    return OPERATIONS[node.operator[:-1] if isinstance(node, AST.AssignmentWithOperatorStatement) else node.operator]
+
+
+def shares(node: AST.Expression) -> bool:
+    """ Checks if value of expression may be matrix of variable or its view, other expressions create new matrices """
+    if getattr(node, 'mtype', None) is not None and node.mtype.is_scalar():
+        return False
+    if isinstance(node, AST.OperatorExpression) and node.operator == '\'':
+        return shares(node.expressions[0])
+    return isinstance(node, AST.Variable)
+
+
+def inplace(node: Any) -> bool:
+    """ Checks if type checker proved that compound assignment can update matrix in place """
+    return getattr(node, 'inplace', False)
 
 
 OPERATIONS: Dict[str, Callable] = {
@@ -40,16 +142,30 @@ OPERATIONS: Dict[str, Callable] = {
     '<':        operator.lt,
     '>=':       operator.ge,
     '<=':       operator.le,
-    '.+':       np.add,
-    '.-':       np.subtract,
-    '.*':       np.multiply,
-    './':       np.divide,
+    '.+':       parallel.elementwise(np.add),
+    '.-':       parallel.elementwise(np.subtract),
+    '.*':       parallel.elementwise(np.multiply),
+    './':       parallel.elementwise(np.divide),
     '\'':       np.transpose,
-    'eye':      np.eye,
-    'zeros':    parse_tuple(np.zeros),
-    'ones':     parse_tuple(np.ones),
-    'break':    raise_operation(BreakInterruption),
-    'continue': raise_operation(ContinueInterruption),
-    'return':   raise_operation(ReturnInterruption),
-    'print':    print
+    'eye':      parallel.eye,
+    'zeros':    parallel.zeros,
+    'ones':     parallel.ones,
+    'where':    where,
+    'sum':      np.sum,
+    'mean':     np.mean,
+    'min':      np.min,
+    'max':      np.max,
+    'dot':      np.dot,
+    'matmul':   np.matmul,
+    'print':    print,
+    # not available in programs, stores matrices of temporaries created by optimizer
+    'freeze':   freeze
+}
+
+# ufuncs of compound assignments that update matrices in place
+INPLACE_OPERATIONS: Dict[str, np.ufunc] = {
+    '+':        np.add,
+    '-':        np.subtract,
+    '*':        np.multiply,
+    '/':        np.true_divide,
 }
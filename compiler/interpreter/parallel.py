@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+from compiler.interpreter import buffers
+
+# number of elements computed by one task, blocks of this size stay in cache
+BLOCK_SIZE = 1 << 16
+
+# matrices with fewer elements are computed by calling thread only
+DEFAULT_THRESHOLD = 1 << 20
+
+_pool: Optional[ThreadPoolExecutor] = None
+_threshold = DEFAULT_THRESHOLD
+
+
+def configure(workers: int = 1, threshold: int = DEFAULT_THRESHOLD):
+    """
+    Sets number of threads computing element wise operations and initialization of matrices with at least
+    'threshold' elements, single worker computes everything in calling thread
+    """
+    global _pool, _threshold
+
+    if _pool is not None:
+        _pool.shutdown()
+    _pool = ThreadPoolExecutor(workers, thread_name_prefix='mlang') if workers > 1 else None
+    _threshold = threshold
+
+
+def _blocks(out: np.ndarray, *arrays: np.ndarray) -> Optional[List[tuple]]:
+    """
+    Splits matrices of the same shape into blocks of corresponding elements, contiguous matrices are split as flat
+    vectors, others by rows, returns None if matrices are too small to be split
+    """
+    if _pool is None or out.size < _threshold or out.ndim == 0:
+        return None
+
+    if all(a.flags.c_contiguous for a in (out, *arrays)):
+        out, arrays = out.reshape(-1), [a.reshape(-1) for a in arrays]
+        step = BLOCK_SIZE
+    else:
+        step = max(1, BLOCK_SIZE // max(1, int(np.prod(out.shape[1:]))))
+
+    return [(out[i:i + step], *[a[i:i + step] for a in arrays]) for i in range(0, len(out), step)]
+
+
+def _run(function: Callable, blocks: List[tuple]):
+    """ Calls function with every block on thread pool and waits for all of them, errors are raised again """
+    for future in [_pool.submit(function, *block) for block in blocks]:
+        future.result()
+
+
+def result_dtype(ufunc: np.ufunc, *dtypes: np.dtype) -> np.dtype:
+    """ Returns type of elements of result of ufunc applied to arrays of given types """
+    # resolve_dtypes is available since numpy 1.24, older versions apply ufunc to empty arrays instead
+    if hasattr(ufunc, 'resolve_dtypes'):
+        return ufunc.resolve_dtypes((*dtypes, None))[-1]
+    return ufunc(*[np.empty(0, t) for t in dtypes]).dtype
+
+
+def elementwise(ufunc: np.ufunc) -> Callable[[Any, Any], Any]:
+    """
+    Returns binary operation, large matrices of the same shape are computed in blocks by thread pool,
+    results are written into buffers from pool of buffers when it is enabled
+    """
+
+    def operation(a: Any, b: Any) -> Any:
+        if not (isinstance(a, np.ndarray) and isinstance(b, np.ndarray) and a.shape == b.shape):
+            return ufunc(a, b)
+        if _pool is None and not buffers.enabled(a.size):
+            return ufunc(a, b)
+
+        out = buffers.empty(a.shape, result_dtype(ufunc, a.dtype, b.dtype))
+        blocks = _blocks(out, a, b)
+        if blocks is None:
+            return ufunc(a, b, out=out)
+
+        _run(lambda o, x, y: ufunc(x, y, out=o), blocks)
+        return out
+
+    operation.__name__ = ufunc.__name__
+    return operation
+
+
+def filled(function: Callable[[tuple], np.ndarray], value: float) -> Callable[..., np.ndarray]:
+    """
+    Returns initialization of matrix of given dimensions by function, large matrices are filled by thread pool,
+    matrices are filled in buffers from pool of buffers when it is enabled
+    """
+
+    def initialize(*shape: int) -> np.ndarray:
+        size = np.prod(shape)
+        if (_pool is None or size < _threshold) and not buffers.enabled(size):
+            return function(shape)
+
+        out = buffers.empty(shape)
+        blocks = _blocks(out)
+        if blocks is None:
+            out.fill(value)
+        else:
+            _run(lambda o: o.fill(value), blocks)
+        return out
+
+    initialize.__name__ = function.__name__
+    return initialize
+
+
+zeros = filled(np.zeros, 0.)
+ones = filled(np.ones, 1.)
+
+
+def eye(rows: int, columns: int) -> np.ndarray:
+    """ Returns matrix with ones on diagonal, large matrices are filled by thread pool or taken from pool of buffers """
+    size = rows * columns
+    if (_pool is None or size < _threshold) and not buffers.enabled(size):
+        return np.eye(rows, columns)
+
+    out = zeros(rows, columns)
+    out.reshape(-1)[:min(rows, columns) * (columns + 1):columns + 1] = 1
+    return out
@@ -0,0 +1,254 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from compiler.interpreter.operations import make_writable
+from compiler.parser import AST
+from compiler.utils import method_dispatch
+
+# elementwise counterparts of operations, scalar '*' and '/' are applied to every element as well
+VECTOR_OPERATIONS: Dict[str, Callable] = {
+    'u-':   np.negative,
+    '+':    np.add,
+    '-':    np.subtract,
+    '*':    np.multiply,
+    '/':    np.true_divide,
+    '==':   np.equal,
+    '!=':   np.not_equal,
+    '>':    np.greater,
+    '<':    np.less,
+    '>=':   np.greater_equal,
+    '<=':   np.less_equal,
+    '.+':   np.add,
+    '.-':   np.subtract,
+    '.*':   np.multiply,
+    './':   np.true_divide,
+}
+
+
+def loop_body(loop: AST.ForStatement) -> List[AST.Statement]:
+    """ Returns statements executed in every iteration of loop """
+    if isinstance(loop.statement, AST.ProgramStatement):
+        return loop.statement.statements
+    return [loop.statement]
+
+
+def single_statement(statement: AST.Statement) -> Optional[AST.Statement]:
+    """ Returns statement itself or the only statement of block, None if block has more statements """
+    while isinstance(statement, AST.ProgramStatement):
+        if len(statement.statements) != 1:
+            return None
+        statement = statement.statements[0]
+    return statement
+
+
+class _Evaluator:
+    """ Evaluates elementwise expressions over all iterations at once, loop variable is an array of its values """
+
+    def __init__(self, frame: List[Any], name: str, begin: int, end: int):
+        self.frame = frame
+        self.name = name
+        self.begin = begin
+        self.end = end
+        self.indices = None
+
+    @method_dispatch
+    def evaluate(self, node: AST.Node) -> Any:
+        raise NotImplementedError(f'There is no vectorized evaluation implemented for {node.__class__}')
+
+    @evaluate.register
+    def _(self, node: AST.ConstantExpression) -> Any:
+        return node.value
+
+    @evaluate.register
+    def _(self, node: AST.Identifier) -> Any:
+        if node.name != self.name:
+            return self.frame[node.slot]
+
+        if self.indices is None:
+            self.indices = np.arange(self.begin, self.end)
+        return self.indices
+
+    @evaluate.register
+    def _(self, node: AST.Selector) -> np.ndarray:
+        return self.frame[node.identifier.slot][self.begin:self.end]
+
+    @evaluate.register
+    def _(self, node: AST.OperatorExpression) -> Any:
+        return VECTOR_OPERATIONS[node.operator](*[self.evaluate(e) for e in node.expressions])
+
+
+def _reads_arrays(node: AST.Node) -> bool:
+    """ Checks if elementwise expression reads any array, otherwise the loop would compute python scalars """
+    if isinstance(node, AST.Selector):
+        return True
+    if isinstance(node, AST.OperatorExpression):
+        return any(_reads_arrays(e) for e in node.expressions)
+    return False
+
+
+def _scalar(value: Any, node: AST.Expression) -> Any:
+    """ Converts reduced value to the same kind of scalar the loop would produce """
+    if isinstance(value, np.generic) and not _reads_arrays(node):
+        return value.item()
+    return value
+
+
+def _selectors(node: AST.Node) -> List[AST.Selector]:
+    """ Returns all selectors of statement or expression of vectorized loop """
+    if isinstance(node, AST.Selector):
+        return [node]
+    if isinstance(node, AST.OperatorExpression):
+        return [s for e in node.expressions for s in _selectors(e)]
+    if isinstance(node, AST.IfStatement):
+        return _selectors(node.condition) + _selectors(single_statement(node.statement_then))
+    if isinstance(node, (AST.AssignmentStatement, AST.AssignmentWithOperatorStatement)):
+        return _selectors(node.variable) + _selectors(node.expression)
+    return []
+
+
+def execute_vectorized(node: AST.VectorizedForStatement, frame: List[Any]) -> bool:
+    """
+    Executes vectorized loop on whole arrays stored in frame, statements of body are executed one after another,
+    returns False without any side effects if arrays do not allow it, then the loop has to be executed instead
+    """
+    loop = node.loop
+    name = loop.identifier.name
+    bounds = _Evaluator(frame, None, 0, 0)
+    begin, end = int(bounds.evaluate(loop.range.begin)), int(bounds.evaluate(loop.range.end))
+
+    # loop without iterations does nothing
+    if end <= begin:
+        return True
+
+    # negative indices would wrap around
+    if begin < 0:
+        return False
+
+    body = loop_body(loop)
+    written = {_mapped(s).variable.identifier.slot for s, kind in zip(body, node.kinds) if kind in ('map', 'masked_map')}
+    slots = {s.identifier.slot for statement in body for s in _selectors(statement)}
+
+    # every indexed variable has to be vector long enough for all iterations
+    for slot in slots:
+        var = frame[slot]
+        if not isinstance(var, np.ndarray) or var.ndim != 1 or len(var) < end:
+            return False
+
+    # written arrays cannot overlap with other arrays, reads of the same array at the same index are fine
+    for w in written:
+        for slot in slots:
+            if frame[slot] is not frame[w] and np.may_share_memory(frame[slot], frame[w]):
+                return False
+
+    for slot in written:
+        make_writable(frame, slot)
+
+    evaluator = _Evaluator(frame, name, begin, end)
+    for statement, kind in zip(body, node.kinds):
+        _STEPS[kind](evaluator, statement)
+
+    frame[loop.identifier.slot] = end - 1
+    return True
+
+
+def _mapped(node: AST.Statement) -> AST.Statement:
+    """ Returns assignment of map or conditional map """
+    if isinstance(node, AST.IfStatement):
+        return single_statement(node.statement_then)
+    return node
+
+
+def _map_values(evaluator: _Evaluator, node: AST.Statement) -> Tuple[np.ndarray, Any]:
+    """ Returns written part of vector and values assigned to it in all iterations """
+    target = evaluator.frame[node.variable.identifier.slot][evaluator.begin:evaluator.end]
+    value = evaluator.evaluate(node.expression)
+
+    if isinstance(node, AST.AssignmentWithOperatorStatement):
+        value = VECTOR_OPERATIONS[node.operator[:1]](target, value)
+    return target, value
+
+
+def _map(evaluator: _Evaluator, node: AST.Statement):
+    """ X[i] = e and X[i] op= e """
+    target, value = _map_values(evaluator, node)
+    target[...] = value
+
+
+def _masked_map(evaluator: _Evaluator, node: AST.IfStatement):
+    """ if (c) X[i] = e and if (c) X[i] op= e, values of iterations whose condition fails are computed but dropped """
+    size = evaluator.end - evaluator.begin
+    mask = np.broadcast_to(evaluator.evaluate(node.condition), (size, ))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        target, value = _map_values(evaluator, single_statement(node.statement_then))
+    np.copyto(target, value, where=mask)
+
+
+def _accumulate(evaluator: _Evaluator, node: AST.AssignmentWithOperatorStatement, values: np.ndarray):
+    """ s += e and s -= e over given values, partial sums are computed in order so floats are rounded like in loop """
+    slot = node.variable.slot
+    current = evaluator.frame[slot]
+    if len(values) == 0:
+        return
+
+    if values.dtype.kind == 'f' or isinstance(current, (float, np.floating)):
+        sign = 1 if node.operator == '+=' else -1
+        total = np.cumsum(np.concatenate(([current], values * sign)))[-1]
+        evaluator.frame[slot] = _scalar(total, node.expression)
+    else:
+        total = _scalar(np.sum(values), node.expression)
+        evaluator.frame[slot] = current + total if node.operator == '+=' else current - total
+
+
+def _sum(evaluator: _Evaluator, node: AST.AssignmentWithOperatorStatement):
+    """ s += e """
+    size = evaluator.end - evaluator.begin
+    _accumulate(evaluator, node, np.broadcast_to(evaluator.evaluate(node.expression), (size, )))
+
+
+def _masked_sum(evaluator: _Evaluator, node: AST.IfStatement):
+    """ if (c) s += e """
+    size = evaluator.end - evaluator.begin
+    mask = np.broadcast_to(evaluator.evaluate(node.condition), (size, ))
+    statement = single_statement(node.statement_then)
+    _accumulate(evaluator, statement, np.broadcast_to(evaluator.evaluate(statement.expression), (size, ))[mask])
+
+
+def _count(evaluator: _Evaluator, node: AST.IfStatement):
+    """ if (c) s += 1 """
+    size = evaluator.end - evaluator.begin
+    count = int(np.count_nonzero(np.broadcast_to(evaluator.evaluate(node.condition), (size, ))))
+    statement = single_statement(node.statement_then)
+    slot = statement.variable.slot
+
+    if count:
+        step = statement.expression.value * count
+        evaluator.frame[slot] = evaluator.frame[slot] + step if statement.operator == '+=' else evaluator.frame[slot] - step
+
+
+def _extreme(evaluator: _Evaluator, node: AST.IfStatement, reduce: Callable, better: Callable):
+    """ if (e > m) m = e and its variants, NaN values never replace current value just like in loop """
+    size = evaluator.end - evaluator.begin
+    statement = single_statement(node.statement_then)
+    values = np.broadcast_to(evaluator.evaluate(statement.expression), (size, ))
+
+    best = _scalar(reduce.reduce(values), statement.expression)
+    if better(best, evaluator.frame[statement.variable.slot]):
+        evaluator.frame[statement.variable.slot] = best
+
+
+def _strict(node: AST.IfStatement) -> bool:
+    """ Checks if comparison of min or max reduction is strict, non strict one replaces equal values """
+    return node.condition.operator in ('<', '>')
+
+
+_STEPS: Dict[str, Callable[[_Evaluator, AST.Statement], None]] = {
+    'map':          _map,
+    'masked_map':   _masked_map,
+    'sum':          _sum,
+    'masked_sum':   _masked_sum,
+    'count':        _count,
+    'max':          lambda e, n: _extreme(e, n, np.fmax, np.greater if _strict(n) else np.greater_equal),
+    'min':          lambda e, n: _extreme(e, n, np.fmin, np.less if _strict(n) else np.less_equal),
+}
@@ -2,25 +2,41 @@ from abc import ABC
 from dataclasses import dataclass, field
 from typing import Any, List, Optional, Tuple
 
+import numpy as np
+
 
 # ==============================================
 #   ABSTRACT
 # ==============================================
 @dataclass
 class Node(ABC):
+    __slots__ = ('_packed_span', )
     line_span: Tuple[int, int]
 
 
+def _get_line_span(node: Node) -> Tuple[int, int]:
+    return node._packed_span >> 32, node._packed_span & 0xFFFFFFFF
+
+
+def _set_line_span(node: Node, line_span: Tuple[int, int]):
+    node._packed_span = line_span[0] << 32 | line_span[1]
+
+
+# line span is packed into single integer, property is set after the dataclass is created so it is not treated as default
+Node.line_span = property(_get_line_span, _set_line_span)
+
+
+# type of expressions and variables is not a field, it is set by type checker
 class Expression(Node):
-    pass
+    __slots__ = ('mtype', )
 
 
 class Statement(Node):
-    pass
+    __slots__ = ()
 
 
 class Variable(Node):
-    pass
+    __slots__ = ('mtype', )
 
 
 # ==============================================
@@ -28,28 +44,55 @@ class Variable(Node):
 # ==============================================
 @dataclass
 class ConstantExpression(Expression):
+    __slots__ = ('value', )
     value: Any
 
 
+@dataclass(eq=False)
+class ConstantArrayExpression(Expression):
+    __slots__ = ('value', )
+    value: np.ndarray
+
+    def __setstate__(self, state):
+        _, slots = state
+        for name, value in slots.items():
+            setattr(self, name, value)
+
+        # arrays are always unpickled as writeable
+        self.value.flags.writeable = False
+
+
 @dataclass
 class VectorExpression(Expression):
+    __slots__ = ('expressions', )
     expressions: List[Expression]
 
 
 @dataclass
 class RangeExpression(Expression):
+    __slots__ = ('begin', 'end')
     begin: Expression
     end: Expression
 
 
+@dataclass
+class SliceExpression(Expression):
+    # item of selector, missing bounds mean beginning and end of dimension
+    __slots__ = ('begin', 'end')
+    begin: Optional[Expression]
+    end: Optional[Expression]
+
+
 @dataclass
 class OperatorExpression(Expression):
+    __slots__ = ('operator', 'expressions')
     operator: str
     expressions: List[Expression]
 
 
 @dataclass
 class FunctionExpression(Expression):
+    __slots__ = ('name', 'arguments')
     name: str
     arguments: List[Expression]
 
@@ -59,11 +102,14 @@ class FunctionExpression(Expression):
 # ==============================================
 @dataclass
 class Identifier(Variable):
+    # slot of runtime frame, it is not a field and is set by interpreter before execution
+    __slots__ = ('name', 'slot')
     name: str
 
 
 @dataclass
 class Selector(Variable):
+    __slots__ = ('identifier', 'selector')
     identifier: Identifier
     selector: VectorExpression
 
@@ -73,17 +119,21 @@ class Selector(Variable):
 # ==============================================
 @dataclass
 class ProgramStatement(Statement):
+    __slots__ = ('statements', )
     statements: List[Statement]
 
 
 @dataclass
 class AssignmentStatement(Statement):
+    __slots__ = ('variable', 'expression')
     variable: Variable
     expression: Expression
 
 
 @dataclass
 class AssignmentWithOperatorStatement(Statement):
+    # whether matrix can be updated in place, it is not a field and is set by type checker
+    __slots__ = ('operator', 'variable', 'expression', 'inplace')
     operator: str
     variable: Variable
     expression: Expression
@@ -91,18 +141,21 @@ class AssignmentWithOperatorStatement(Statement):
 
 @dataclass
 class InstructionStatement(Statement):
+    __slots__ = ('name', 'arguments')
     name: str
     arguments: List[Expression]
 
 
 @dataclass
 class WhileStatement(Statement):
+    __slots__ = ('condition', 'statement')
     condition: Expression
     statement: Statement
 
 
 @dataclass
 class ForStatement(Statement):
+    __slots__ = ('identifier', 'range', 'statement')
     identifier: Identifier
     range: RangeExpression
     statement: Statement
@@ -110,6 +163,42 @@ class ForStatement(Statement):
 
 @dataclass
 class IfStatement(Statement):
+    __slots__ = ('condition', 'statement_then', 'statement_else')
     condition: Expression
     statement_then: Statement
     statement_else: Optional[Statement]
+
+
+# ==============================================
+#   OPTIMIZED STATEMENTS
+# ==============================================
+@dataclass
+class FusedExpression(Expression):
+    # created by expression fuser, tree of element wise operators evaluated at once on its evaluated leaves
+    __slots__ = ('expression', 'leaves')
+    expression: OperatorExpression
+    leaves: List[Expression]
+
+
+@dataclass
+class MatrixChainExpression(Expression):
+    # created by matrix chain optimizer, product of factors multiplied in the cheapest order,
+    # order found for shapes of factors is cached in plan together with them, it is not a field
+    __slots__ = ('factors', 'plan')
+    factors: List[Expression]
+
+
+@dataclass
+class VectorizedForStatement(Statement):
+    # created by vectorizer, kinds tell how each statement of loop body is executed on whole arrays,
+    # the loop itself is executed when vectorized execution is not possible at runtime
+    __slots__ = ('loop', 'kinds')
+    loop: ForStatement
+    kinds: List[str]
+
+
+@dataclass
+class ReleaseStatement(Statement):
+    # created by liveness analyzer, values of variables are not used anymore and references to them are dropped
+    __slots__ = ('identifiers', )
+    identifiers: List[Identifier]
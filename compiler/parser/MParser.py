@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+import numpy as np
 from ply import yacc
 
 from compiler.parser import AST
@@ -5,7 +8,22 @@ from compiler.scanner import MLexer
 from compiler.utils import CompilerError
 
 
+# module with precomputed LALR tables shipped with the package
+TABMODULE = 'compiler.parser.parsetab'
+
+
 def MParser():
+    """ Returns parser which is built once per process from precomputed tables """
+    return _build_parser()
+
+
+def write_tables():
+    """ Regenerates precomputed tables, has to be called after every change of grammar """
+    return _build_parser.__wrapped__(write_tables=True)
+
+
+@lru_cache(maxsize=None)
+def _build_parser(tabmodule: str = TABMODULE, write_tables: bool = False):
 
     # ==============================================
     #   PROGRAM
@@ -15,8 +33,10 @@ def MParser():
         p[0] = AST.ProgramStatement(p.linespan(0), [])
 
     def p_program_tail(p):
-        """ program : statement program """
-        p[0] = AST.ProgramStatement(p.linespan(0), [p[1]] + p[2].statements)
+        """ program : program statement """
+        p[0] = p[1]
+        p[0].statements.append(p[2])
+        p[0].line_span = p.linespan(0)
 
     # ==============================================
     #   STATEMENTS
@@ -37,6 +57,7 @@ def MParser():
     def p_statement_block(p):
         """ statement : BRACKET_CURLY_L program BRACKET_CURLY_R """
         p[0] = p[2]
+        p[0].line_span = p.linespan(0)
 
     def p_statement_print(p):
         """ statement : PRINT comma_list SEMICOLON """
@@ -106,12 +127,14 @@ def MParser():
         p[0] = AST.OperatorExpression(p.linespan(0), p[2], [p[1], p[3]])
 
     def p_expression_function(p):
-        """ expression : function BRACKET_ROUND_L comma_list BRACKET_ROUND_R """
+        """ expression : function BRACKET_ROUND_L comma_list BRACKET_ROUND_R
+                       | ID BRACKET_ROUND_L comma_list BRACKET_ROUND_R
+        """
         p[0] = AST.FunctionExpression(p.linespan(0), p[1], p[3])
 
     def p_expression_vector(p):
         """ expression : vector """
-        p[0] = p[1]
+        p[0] = constant_array(p[1])
 
     def p_expression_variable(p):
         """ expression : variable """
@@ -125,8 +148,9 @@ def MParser():
         p[0] = AST.Identifier(p.linespan(0), p[1])
 
     def p_variable_selector(p):
-        """ variable : ID vector """
-        p[0] = AST.Selector(p.linespan(0), AST.Identifier(p.linespan(1), p[1]), p[2])
+        """ variable : ID BRACKET_SQUARE_L selector_list BRACKET_SQUARE_R """
+        selector = AST.VectorExpression((p.linespan(2)[0], p.linespan(4)[1]), p[3])
+        p[0] = AST.Selector(p.linespan(0), AST.Identifier(p.linespan(1), p[1]), selector)
 
     # ==============================================
     #   HELPERS
@@ -135,6 +159,7 @@ def MParser():
         """ function : EYE
                      | ZEROS
                      | ONES
+                     | WHERE
         """
         p[0] = p[1]
 
@@ -154,7 +179,31 @@ def MParser():
 
     def p_comma_list(p):
         """ comma_list : comma_list COMMA expression  """
-        p[0] = p[1] + [p[3]]
+        p[0] = p[1]
+        p[0].append(p[3])
+
+    def p_selector_list_head(p):
+        """ selector_list : selector_item """
+        p[0] = [p[1]]
+
+    def p_selector_list(p):
+        """ selector_list : selector_list COMMA selector_item """
+        p[0] = p[1]
+        p[0].append(p[3])
+
+    def p_selector_item(p):
+        """ selector_item : expression """
+        p[0] = p[1]
+
+    def p_selector_item_slice(p):
+        """ selector_item : expression COLON expression
+                          | expression COLON
+                          | COLON expression
+                          | COLON
+        """
+        begin = p[1] if isinstance(p[1], AST.Node) else None
+        end = p[len(p) - 1] if len(p) > 2 and isinstance(p[len(p) - 1], AST.Node) else None
+        p[0] = AST.SliceExpression(p.linespan(0), begin, end)
 
     def p_range(p):
         """ range : expression COLON expression """
@@ -186,7 +235,44 @@ def MParser():
     tokens = list(lexer.lextokens)
     start = "program"
 
-    return yacc.yacc()
+    # tables are read from 'tabmodule' if they match grammar, otherwise they are generated in memory
+    return yacc.yacc(debug=False, tabmodule=tabmodule, write_tables=write_tables)
+
+
+def constant_array(node: AST.VectorExpression) -> AST.Expression:
+    """
+    Collapses vector of numeric constants of the same type (or of such already collapsed vectors with the same shape)
+    into single node holding read-only array, other vectors are returned unchanged
+    """
+    first = node.expressions[0]
+
+    # innermost vector of constants
+    if isinstance(first, AST.ConstantExpression):
+        kind = type(first.value)
+        if kind not in (int, float):
+            return node
+        if any(not isinstance(e, AST.ConstantExpression) or type(e.value) is not kind for e in node.expressions):
+            return node
+        try:
+            value = np.array([e.value for e in node.expressions])
+        except OverflowError:
+            return node
+        if value.dtype.kind not in 'if':
+            return node
+
+    # vector of already collapsed vectors
+    elif isinstance(first, AST.ConstantArrayExpression):
+        dtype, shape = first.value.dtype, first.value.shape
+        if any(not isinstance(e, AST.ConstantArrayExpression) or e.value.dtype != dtype or e.value.shape != shape
+               for e in node.expressions):
+            return node
+        value = np.stack([e.value for e in node.expressions])
+
+    else:
+        return node
+
+    value.flags.writeable = False
+    return AST.ConstantArrayExpression(node.line_span, value)
 
 
 class ParserError(CompilerError):
@@ -0,0 +1,89 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'programnonassocSIMPLE_IFnonassocELSEnonassocEQUALSNOT_EQUALSGREATERLESSGREATER_EQUALLESS_EQUALleftPLUSMINUSDOT_PLUSDOT_MINUSleftTIMESDIVIDEDOT_TIMESDOT_DIVIDErightUNARY_MINUSleftAPOSTROPHEAPOSTROPHE ASSIGN ASSIGN_DIVIDE ASSIGN_MINUS ASSIGN_PLUS ASSIGN_TIMES BRACKET_CURLY_L BRACKET_CURLY_R BRACKET_ROUND_L BRACKET_ROUND_R BRACKET_SQUARE_L BRACKET_SQUARE_R BREAK COLON COMMA CONTINUE DIVIDE DOT_DIVIDE DOT_MINUS DOT_PLUS DOT_TIMES ELSE EQUALS EYE FALSE FLOAT FOR GREATER GREATER_EQUAL ID IF INT LESS LESS_EQUAL MINUS NOT_EQUALS ONES PLUS PRINT RETURN SEMICOLON STRING TIMES TRUE WHERE WHILE ZEROS program :  program : program statement  statement : variable ASSIGN expression SEMICOLON\n         statement : variable ASSIGN_PLUS expression SEMICOLON\n                      | variable ASSIGN_MINUS expression SEMICOLON\n                      | variable ASSIGN_TIMES expression SEMICOLON\n                      | variable ASSIGN_DIVIDE expression SEMICOLON\n         statement : BRACKET_CURLY_L program BRACKET_CURLY_R  statement : PRINT comma_list SEMICOLON  statement : BREAK SEMICOLON  statement : CONTINUE SEMICOLON  statement : RETURN expression SEMICOLON  statement : WHILE BRACKET_ROUND_L expression BRACKET_ROUND_R statement  statement : FOR ID ASSIGN range statement  statement : IF BRACKET_ROUND_L expression BRACKET_ROUND_R statement %prec SIMPLE_IF\n                      | IF BRACKET_ROUND_L expression BRACKET_ROUND_R statement ELSE statement\n         expression : INT\n                       | FLOAT\n                       | STRING\n                       | bool\n         expression : MINUS expression %prec UNARY_MINUS  expression : expression APOSTROPHE  expression : expression PLUS expression\n                       | expression MINUS expression\n                       | expression TIMES expression\n                       | expression DIVIDE expression\n                       | expression GREATER expression\n                       | expression LESS expression\n                       | expression GREATER_EQUAL expression\n                       | expression LESS_EQUAL expression\n                       | expression EQUALS expression\n                       | expression NOT_EQUALS expression\n                       | expression DOT_PLUS expression\n                       | expression DOT_MINUS expression\n                       | expression DOT_TIMES expression\n                       | expression DOT_DIVIDE expression\n         expression : function BRACKET_ROUND_L comma_list BRACKET_ROUND_R\n                       | ID BRACKET_ROUND_L comma_list BRACKET_ROUND_R\n         expression : vector  expression : variable  variable : ID  variable : ID BRACKET_SQUARE_L selector_list BRACKET_SQUARE_R  function : EYE\n                     | ZEROS\n                     | ONES\n                     | WHERE\n         bool : TRUE\n                 | FALSE\n         vector : BRACKET_SQUARE_L comma_list BRACKET_SQUARE_R  comma_list : expression  comma_list : comma_list COMMA expression   selector_list : selector_item  selector_list : selector_list COMMA selector_item  selector_item : expression  selector_item : expression COLON expression\n                          | expression COLON\n                          | COLON expression\n                          | COLON\n         range : expression COLON expression '
+    
+_lr_action_items = {'BRACKET_CURLY_L':([0,1,2,4,18,21,22,23,24,27,28,29,30,31,37,38,49,50,52,67,71,79,80,81,82,83,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,102,103,105,109,110,111,112,113,117,118,119,120,],[-1,4,-2,-1,4,-17,-18,-19,-20,-41,-39,-40,-47,-48,-10,-11,-8,-9,-22,-21,-12,-3,-4,-5,-6,-7,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,4,4,-42,4,-37,-38,-13,-14,-15,-59,4,-16,]),'PRINT':([0,1,2,4,18,21,22,23,24,27,28,29,30,31,37,38,49,50,52,67,71,79,80,81,82,83,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,102,103,105,109,110,111,112,113,117,118,119,120,],[-1,5,-2,-1,5,-17,-18,-19,-20,-41,-39,-40,-47,-48,-10,-11,-8,-9,-22,-21,-12,-3,-4,-5,-6,-7,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,5,5,-42,5,-37,-38,-13,-14,-15,-59,5,-16,]),'BREAK':([0,1,2,4,18,21,22,23,24,27,28,29,30,31,37,38,49,50,52,67,71,79,80,81,82,83,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,102,103,105,109,110,111,112,113,117,118,119,120,],[-1,6,-2,-1,6,-17,-18,-19,-20,-41,-39,-40,-47,-48,-10,-11,-8,-9,-22,-21,-12,-3,-4,-5,-6,-7,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,6,6,-42,6,-37,-38,-13,-14,-15,-59,6,-16,]),'CONTINUE':([0,1,2,4,18,21,22,23,24,27,28,29,30,31,37,38,49,50,52,67,71,79,80,81,82,83,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,102,103,105,109,110,111,112,113,117,118,119,120,],[-1,7,-2,-1,7,-17,-18,-19,-20,-41,-39,-40,-47,-48,-10,-11,-8,-9,-22,-21,-12,-3,-4,-5,-6,-7,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,7,7,-42,7,-37,-38,-13,-14,-15,-59,7,-16,]),'RETURN':([0,1,2,4,18,21,22,23,24,27,28,29,30,31,37,38,49,50,52,67,71,79,80,81,82,83,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,102,103,105,109,110,111,112,113,117,118,119,120,],[-1,8,-2,-1,8,-17,-18,-19,-20,-41,-39,-40,-47,-48,-10,-11,-8,-9,-22,-21,-12,-3,-4,-5,-6,-7,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,8,8,-42,8,-37,-38,-13,-14,-15,-59,8,-16,]),'WHILE':([0,1,2,4,18,21,22,23,24,27,28,29,30,31,37,38,49,50,52,67,71,79,80,81,82,83,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,102,103,105,109,110,111,112,113,117,118,119,120,],[-1,9,-2,-1,9,-17,-18,-19,-20,-41,-39,-40,-47,-48,-10,-11,-8,-9,-22,-21,-12,-3,-4,-5,-6,-7,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,9,9,-42,9,-37,-38,-13,-14,-15,-59,9,-16,]),'FOR':([0,1,2,4,18,21,22,23,24,27,28,29,30,31,37,38,49,50,52,67,71,79,80,81,82,83,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,102,103,105,109,110,111,112,113,117,118,119,120,],[-1,10,-2,-1,10,-17,-18,-19,-20,-41,-39,-40,-47,-48,-10,-11,-8,-9,-22,-21,-12,-3,-4,-5,-6,-7,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,10,10,-42,10,-37,-38,-13,-14,-15,-59,10,-16,]),'IF':([0,1,2,4,18,21,22,23,24,27,28,29,30,31,37,38,49,50,52,67,71,79,80,81,82,83,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,102,103,105,109,110,111,112,113,117,118,119,120,],[-1,12,-2,-1,12,-17,-18,-19,-20,-41,-39,-40,-47,-48,-10,-11,-8,-9,-22,-21,-12,-3,-4,-5,-6,-7,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,12,12,-42,12,-37,-38,-13,-14,-15,-59,12,-16,]),'ID':([0,1,2,4,5,8,10,13,14,15,16,17,18,21,22,23,24,25,27,28,29,30,31,36,37,38,40,42,43,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,71,73,77,79,80,81,82,83,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,102,103,105,106,107,109,110,111,112,113,114,117,118,119,120,],[-1,11,-2,-1,27,27,41,27,27,27,27,27,11,-17,-18,-19,-20,27,-41,-39,-40,-47,-48,27,-10,-11,27,27,27,-8,-9,27,-22,27,27,27,27,27,27,27,27,27,27,27,27,27,27,-21,27,27,-12,27,27,-3,-4,-5,-6,-7,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,11,11,-42,27,27,11,-37,-38,-13,-14,27,-15,-59,11,-16,]),'$end':([0,1,2,37,38,49,50,71,79,80,81,82,83,112,113,117,120,],[-1,0,-2,-10,-11,-8,-9,-12,-3,-4,-5,-6,-7,-13,-14,-15,-16,]),'BRACKET_CURLY_R':([2,4,18,37,38,49,50,71,79,80,81,82,83,112,113,117,120,],[-2,-1,49,-10,-11,-8,-9,-12,-3,-4,-5,-6,-7,-13,-14,-15,-16,]),'ASSIGN':([3,11,41,105,],[13,-41,73,-42,]),'ASSIGN_PLUS':([3,11,105,],[14,-41,-42,]),'ASSIGN_MINUS':([3,11,105,],[15,-41,-42,]),'ASSIGN_TIMES':([3,11,105,],[16,-41,-42,]),'ASSIGN_DIVIDE':([3,11,105,],[17,-41,-42,]),'INT':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,]),'FLOAT':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,]),'STRING':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,]),'MINUS':([5,8,13,14,15,16,17,20,21,22,23,24,25,27,28,29,30,31,36,39,40,42,43,44,45,46,47,48,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,72,73,76,77,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,106,107,108,110,111,114,116,118,],[25,25,25,25,25,25,25,54,-17,-18,-19,-20,25,-41,-39,-40,-47,-48,25,54,25,25,25,54,54,54,54,54,25,-22,25,25,25,25,25,25,25,25,25,25,25,25,25,25,-21,25,25,54,25,54,25,54,54,-23,-24,-25,-26,54,54,54,54,54,54,-33,-34,-35,-36,-49,54,-42,25,25,54,-37,-38,25,54,54,]),'TRUE':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,]),'FALSE':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,]),'EYE':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,]),'ZEROS':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,]),'ONES':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,]),'WHERE':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,]),'BRACKET_SQUARE_L':([5,8,11,13,14,15,16,17,25,27,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[36,36,42,36,36,36,36,36,36,42,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,]),'SEMICOLON':([6,7,19,20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,105,110,111,],[37,38,50,-50,-17,-18,-19,-20,-41,-39,-40,-47,-48,71,79,80,81,82,83,-22,-21,-51,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,-42,-37,-38,]),'BRACKET_ROUND_L':([9,12,26,27,32,33,34,35,],[40,43,68,69,-43,-44,-45,-46,]),'COMMA':([19,20,21,22,23,24,27,28,29,30,31,52,67,70,74,75,76,77,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,107,108,110,111,115,116,],[51,-50,-17,-18,-19,-20,-41,-39,-40,-47,-48,-22,-21,51,106,-52,-54,-58,-51,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,51,51,-49,-42,-56,-57,-37,-38,-53,-55,]),'BRACKET_SQUARE_R':([20,21,22,23,24,27,28,29,30,31,52,67,70,74,75,76,77,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,105,107,108,110,111,115,116,],[-50,-17,-18,-19,-20,-41,-39,-40,-47,-48,-22,-21,101,105,-52,-54,-58,-51,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,-42,-56,-57,-37,-38,-53,-55,]),'BRACKET_ROUND_R':([20,21,22,23,24,27,28,29,30,31,52,67,72,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,110,111,],[-50,-17,-18,-19,-20,-41,-39,-40,-47,-48,-22,-21,102,109,-51,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,110,111,-49,-42,-37,-38,]),'APOSTROPHE':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[52,-17,-18,-19,-20,-41,-39,-40,-47,-48,52,52,52,52,52,52,-22,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,-49,52,-42,52,-37,-38,52,52,]),'PLUS':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[53,-17,-18,-19,-20,-41,-39,-40,-47,-48,53,53,53,53,53,53,-22,-21,53,53,53,53,-23,-24,-25,-26,53,53,53,53,53,53,-33,-34,-35,-36,-49,53,-42,53,-37,-38,53,53,]),'TIMES':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[55,-17,-18,-19,-20,-41,-39,-40,-47,-48,55,55,55,55,55,55,-22,-21,55,55,55,55,55,55,-25,-26,55,55,55,55,55,55,55,55,-35,-36,-49,55,-42,55,-37,-38,55,55,]),'DIVIDE':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[56,-17,-18,-19,-20,-41,-39,-40,-47,-48,56,56,56,56,56,56,-22,-21,56,56,56,56,56,56,-25,-26,56,56,56,56,56,56,56,56,-35,-36,-49,56,-42,56,-37,-38,56,56,]),'GREATER':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[57,-17,-18,-19,-20,-41,-39,-40,-47,-48,57,57,57,57,57,57,-22,-21,57,57,57,57,-23,-24,-25,-26,None,None,None,None,None,None,-33,-34,-35,-36,-49,57,-42,57,-37,-38,57,57,]),'LESS':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[58,-17,-18,-19,-20,-41,-39,-40,-47,-48,58,58,58,58,58,58,-22,-21,58,58,58,58,-23,-24,-25,-26,None,None,None,None,None,None,-33,-34,-35,-36,-49,58,-42,58,-37,-38,58,58,]),'GREATER_EQUAL':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[59,-17,-18,-19,-20,-41,-39,-40,-47,-48,59,59,59,59,59,59,-22,-21,59,59,59,59,-23,-24,-25,-26,None,None,None,None,None,None,-33,-34,-35,-36,-49,59,-42,59,-37,-38,59,59,]),'LESS_EQUAL':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[60,-17,-18,-19,-20,-41,-39,-40,-47,-48,60,60,60,60,60,60,-22,-21,60,60,60,60,-23,-24,-25,-26,None,None,None,None,None,None,-33,-34,-35,-36,-49,60,-42,60,-37,-38,60,60,]),'EQUALS':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[61,-17,-18,-19,-20,-41,-39,-40,-47,-48,61,61,61,61,61,61,-22,-21,61,61,61,61,-23,-24,-25,-26,None,None,None,None,None,None,-33,-34,-35,-36,-49,61,-42,61,-37,-38,61,61,]),'NOT_EQUALS':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[62,-17,-18,-19,-20,-41,-39,-40,-47,-48,62,62,62,62,62,62,-22,-21,62,62,62,62,-23,-24,-25,-26,None,None,None,None,None,None,-33,-34,-35,-36,-49,62,-42,62,-37,-38,62,62,]),'DOT_PLUS':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[63,-17,-18,-19,-20,-41,-39,-40,-47,-48,63,63,63,63,63,63,-22,-21,63,63,63,63,-23,-24,-25,-26,63,63,63,63,63,63,-33,-34,-35,-36,-49,63,-42,63,-37,-38,63,63,]),'DOT_MINUS':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[64,-17,-18,-19,-20,-41,-39,-40,-47,-48,64,64,64,64,64,64,-22,-21,64,64,64,64,-23,-24,-25,-26,64,64,64,64,64,64,-33,-34,-35,-36,-49,64,-42,64,-37,-38,64,64,]),'DOT_TIMES':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[65,-17,-18,-19,-20,-41,-39,-40,-47,-48,65,65,65,65,65,65,-22,-21,65,65,65,65,65,65,-25,-26,65,65,65,65,65,65,65,65,-35,-36,-49,65,-42,65,-37,-38,65,65,]),'DOT_DIVIDE':([20,21,22,23,24,27,28,29,30,31,39,44,45,46,47,48,52,67,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,108,110,111,116,118,],[66,-17,-18,-19,-20,-41,-39,-40,-47,-48,66,66,66,66,66,66,-22,-21,66,66,66,66,66,66,-25,-26,66,66,66,66,66,66,66,66,-35,-36,-49,66,-42,66,-37,-38,66,66,]),'COLON':([21,22,23,24,27,28,29,30,31,42,52,67,76,85,86,87,88,89,90,91,92,93,94,95,96,97,98,101,104,105,106,110,111,],[-17,-18,-19,-20,-41,-39,-40,-47,-48,77,-22,-21,107,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-35,-36,-49,114,-42,77,-37,-38,]),'ELSE':([37,38,49,50,71,79,80,81,82,83,112,113,117,120,],[-10,-11,-8,-9,-12,-3,-4,-5,-6,-7,-13,-14,119,-16,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,4,],[1,18,]),'statement':([1,18,102,103,109,119,],[2,2,112,113,117,120,]),'variable':([1,5,8,13,14,15,16,17,18,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,102,103,106,107,109,114,119,],[3,29,29,29,29,29,29,29,3,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,3,3,29,29,3,29,3,]),'comma_list':([5,36,68,69,],[19,70,99,100,]),'expression':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[20,39,44,45,46,47,48,67,20,72,76,78,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,20,20,104,108,76,116,118,]),'bool':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,]),'function':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,]),'vector':([5,8,13,14,15,16,17,25,36,40,42,43,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,68,69,73,77,106,107,114,],[28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,]),'selector_list':([42,],[74,]),'selector_item':([42,106,],[75,115,]),'range':([73,],[103,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> <empty>','program',0,'p_program_head','MParser.py',32),
+  ('program -> program statement','program',2,'p_program_tail','MParser.py',36),
+  ('statement -> variable ASSIGN expression SEMICOLON','statement',4,'p_statement_assignment','MParser.py',45),
+  ('statement -> variable ASSIGN_PLUS expression SEMICOLON','statement',4,'p_statement_assignment_with_operator','MParser.py',50),
+  ('statement -> variable ASSIGN_MINUS expression SEMICOLON','statement',4,'p_statement_assignment_with_operator','MParser.py',51),
+  ('statement -> variable ASSIGN_TIMES expression SEMICOLON','statement',4,'p_statement_assignment_with_operator','MParser.py',52),
+  ('statement -> variable ASSIGN_DIVIDE expression SEMICOLON','statement',4,'p_statement_assignment_with_operator','MParser.py',53),
+  ('statement -> BRACKET_CURLY_L program BRACKET_CURLY_R','statement',3,'p_statement_block','MParser.py',58),
+  ('statement -> PRINT comma_list SEMICOLON','statement',3,'p_statement_print','MParser.py',63),
+  ('statement -> BREAK SEMICOLON','statement',2,'p_statement_break','MParser.py',67),
+  ('statement -> CONTINUE SEMICOLON','statement',2,'p_statement_continue','MParser.py',71),
+  ('statement -> RETURN expression SEMICOLON','statement',3,'p_statement_return','MParser.py',75),
+  ('statement -> WHILE BRACKET_ROUND_L expression BRACKET_ROUND_R statement','statement',5,'p_statement_while','MParser.py',79),
+  ('statement -> FOR ID ASSIGN range statement','statement',5,'p_statement_for','MParser.py',83),
+  ('statement -> IF BRACKET_ROUND_L expression BRACKET_ROUND_R statement','statement',5,'p_statement_if','MParser.py',87),
+  ('statement -> IF BRACKET_ROUND_L expression BRACKET_ROUND_R statement ELSE statement','statement',7,'p_statement_if','MParser.py',88),
+  ('expression -> INT','expression',1,'p_expression_constant','MParser.py',96),
+  ('expression -> FLOAT','expression',1,'p_expression_constant','MParser.py',97),
+  ('expression -> STRING','expression',1,'p_expression_constant','MParser.py',98),
+  ('expression -> bool','expression',1,'p_expression_constant','MParser.py',99),
+  ('expression -> MINUS expression','expression',2,'p_expression_unary_minus','MParser.py',104),
+  ('expression -> expression APOSTROPHE','expression',2,'p_expression_right_unary_operator','MParser.py',108),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binary_operator','MParser.py',112),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binary_operator','MParser.py',113),
+  ('expression -> expression TIMES expression','expression',3,'p_expression_binary_operator','MParser.py',114),
+  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binary_operator','MParser.py',115),
+  ('expression -> expression GREATER expression','expression',3,'p_expression_binary_operator','MParser.py',116),
+  ('expression -> expression LESS expression','expression',3,'p_expression_binary_operator','MParser.py',117),
+  ('expression -> expression GREATER_EQUAL expression','expression',3,'p_expression_binary_operator','MParser.py',118),
+  ('expression -> expression LESS_EQUAL expression','expression',3,'p_expression_binary_operator','MParser.py',119),
+  ('expression -> expression EQUALS expression','expression',3,'p_expression_binary_operator','MParser.py',120),
+  ('expression -> expression NOT_EQUALS expression','expression',3,'p_expression_binary_operator','MParser.py',121),
+  ('expression -> expression DOT_PLUS expression','expression',3,'p_expression_binary_operator','MParser.py',122),
+  ('expression -> expression DOT_MINUS expression','expression',3,'p_expression_binary_operator','MParser.py',123),
+  ('expression -> expression DOT_TIMES expression','expression',3,'p_expression_binary_operator','MParser.py',124),
+  ('expression -> expression DOT_DIVIDE expression','expression',3,'p_expression_binary_operator','MParser.py',125),
+  ('expression -> function BRACKET_ROUND_L comma_list BRACKET_ROUND_R','expression',4,'p_expression_function','MParser.py',130),
+  ('expression -> ID BRACKET_ROUND_L comma_list BRACKET_ROUND_R','expression',4,'p_expression_function','MParser.py',131),
+  ('expression -> vector','expression',1,'p_expression_vector','MParser.py',136),
+  ('expression -> variable','expression',1,'p_expression_variable','MParser.py',140),
+  ('variable -> ID','variable',1,'p_variable_id','MParser.py',147),
+  ('variable -> ID BRACKET_SQUARE_L selector_list BRACKET_SQUARE_R','variable',4,'p_variable_selector','MParser.py',151),
+  ('function -> EYE','function',1,'p_function','MParser.py',159),
+  ('function -> ZEROS','function',1,'p_function','MParser.py',160),
+  ('function -> ONES','function',1,'p_function','MParser.py',161),
+  ('function -> WHERE','function',1,'p_function','MParser.py',162),
+  ('bool -> TRUE','bool',1,'p_bool','MParser.py',167),
+  ('bool -> FALSE','bool',1,'p_bool','MParser.py',168),
+  ('vector -> BRACKET_SQUARE_L comma_list BRACKET_SQUARE_R','vector',3,'p_vector','MParser.py',173),
+  ('comma_list -> expression','comma_list',1,'p_comma_list_head','MParser.py',177),
+  ('comma_list -> comma_list COMMA expression','comma_list',3,'p_comma_list','MParser.py',181),
+  ('selector_list -> selector_item','selector_list',1,'p_selector_list_head','MParser.py',186),
+  ('selector_list -> selector_list COMMA selector_item','selector_list',3,'p_selector_list','MParser.py',190),
+  ('selector_item -> expression','selector_item',1,'p_selector_item','MParser.py',195),
+  ('selector_item -> expression COLON expression','selector_item',3,'p_selector_item_slice','MParser.py',199),
+  ('selector_item -> expression COLON','selector_item',2,'p_selector_item_slice','MParser.py',200),
+  ('selector_item -> COLON expression','selector_item',2,'p_selector_item_slice','MParser.py',201),
+  ('selector_item -> COLON','selector_item',1,'p_selector_item_slice','MParser.py',202),
+  ('range -> expression COLON expression','range',3,'p_range','MParser.py',209),
+]
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import List
 
+import numpy as np
 from colored import stylize, fg
 from tree_format import format_tree
 
@@ -44,6 +45,10 @@ class ASTPrinter:
     def _(self, node: AST.ConstantExpression) -> str:
         return str(node.value)
 
+    @_get_name.register
+    def _(self, node: AST.ConstantArrayExpression) -> str:
+        return ' '.join(np.array2string(node.value, separator=', ', threshold=16).split())
+
     @_get_name.register
     def _(self, node: AST.VectorExpression) -> str:
         return 'VECTOR'
@@ -52,6 +57,10 @@ class ASTPrinter:
     def _(self, node: AST.RangeExpression) -> str:
         return 'RANGE'
 
+    @_get_name.register
+    def _(self, node: AST.SliceExpression) -> str:
+        return 'SLICE'
+
     @_get_name.register
     def _(self, node: AST.OperatorExpression) -> str:
         return node.operator
@@ -60,6 +69,14 @@ class ASTPrinter:
     def _(self, node: AST.FunctionExpression) -> str:
         return node.name
 
+    @_get_name.register
+    def _(self, node: AST.FusedExpression) -> str:
+        return 'FUSED'
+
+    @_get_name.register
+    def _(self, node: AST.MatrixChainExpression) -> str:
+        return 'CHAIN'
+
     @_get_name.register
     def _(self, node: AST.Identifier) -> str:
         return node.name
@@ -92,6 +109,14 @@ class ASTPrinter:
     def _(self, node: AST.ForStatement) -> str:
         return 'FOR'
 
+    @_get_name.register
+    def _(self, node: AST.VectorizedForStatement) -> str:
+        return 'VECTORIZED'
+
+    @_get_name.register
+    def _(self, node: AST.ReleaseStatement) -> str:
+        return 'RELEASE'
+
     @_get_name.register
     def _(self, node: AST.IfStatement) -> str:
         return 'IF'
@@ -111,6 +136,10 @@ class ASTPrinter:
     def _(self, node: AST.ConstantExpression) -> List[AST.Node]:
         return []
 
+    @_get_children.register
+    def _(self, node: AST.ConstantArrayExpression) -> List[AST.Node]:
+        return []
+
     @_get_children.register
     def _(self, node: AST.VectorExpression) -> List[AST.Node]:
         return node.expressions
@@ -119,6 +148,10 @@ class ASTPrinter:
     def _(self, node: AST.RangeExpression) -> List[AST.Node]:
         return [node.begin, node.end]
 
+    @_get_children.register
+    def _(self, node: AST.SliceExpression) -> List[AST.Node]:
+        return [b for b in (node.begin, node.end) if b is not None]
+
     @_get_children.register
     def _(self, node: AST.OperatorExpression) -> List[AST.Node]:
         return node.expressions
@@ -127,6 +160,14 @@ class ASTPrinter:
     def _(self, node: AST.FunctionExpression) -> List[AST.Node]:
         return node.arguments
 
+    @_get_children.register
+    def _(self, node: AST.FusedExpression) -> List[AST.Node]:
+        return [node.expression]
+
+    @_get_children.register
+    def _(self, node: AST.MatrixChainExpression) -> List[AST.Node]:
+        return node.factors
+
     @_get_children.register
     def _(self, node: AST.Identifier) -> List[AST.Node]:
         return []
@@ -159,6 +200,14 @@ class ASTPrinter:
     def _(self, node: AST.ForStatement) -> List[AST.Node]:
         return [node.identifier, node.range, node.statement]
 
+    @_get_children.register
+    def _(self, node: AST.VectorizedForStatement) -> List[AST.Node]:
+        return [TmpNode(node.loop.line_span, ', '.join(node.kinds) or 'EMPTY', [node.loop])]
+
+    @_get_children.register
+    def _(self, node: AST.ReleaseStatement) -> List[AST.Node]:
+        return node.identifiers
+
     @_get_children.register
     def _(self, node: AST.IfStatement) -> List[AST.Node]:
         children = [node.condition, TmpNode(node.statement_then.line_span, 'THEN', [node.statement_then])]
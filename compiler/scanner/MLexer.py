@@ -1,9 +1,36 @@
+from functools import lru_cache
+
 import ply.lex as lex
 
 from compiler.utils import CompilerError
 
 
+# reserved keywords
+RESERVED = {
+    "if": "IF",
+    "else": "ELSE",
+    "for": "FOR",
+    "while": "WHILE",
+    "break": "BREAK",
+    "continue": "CONTINUE",
+    "return": "RETURN",
+    "eye": "EYE",
+    "zeros": "ZEROS",
+    "ones": "ONES",
+    "where": "WHERE",
+    "print": "PRINT",
+    "true": "TRUE",
+    "false": "FALSE"
+}
+
+
 def MLexer():
+    """ Returns new lexer cloned from the one built once per process """
+    return _build_lexer().clone()
+
+
+@lru_cache(maxsize=None)
+def _build_lexer():
 
     # operators
     t_PLUS = r"\+"
@@ -46,27 +73,10 @@ def MLexer():
     t_BRACKET_CURLY_L = r"{"
     t_BRACKET_CURLY_R = r"}"
 
-    # reserved keywords
-    reserved = {
-        "if": "IF",
-        "else": "ELSE",
-        "for": "FOR",
-        "while": "WHILE",
-        "break": "BREAK",
-        "continue": "CONTINUE",
-        "return": "RETURN",
-        "eye": "EYE",
-        "zeros": "ZEROS",
-        "ones": "ONES",
-        "print": "PRINT",
-        "true": "TRUE",
-        "false": "FALSE"
-    }
-
     # identifiers
     def t_ID(token):
         r"""[a-zA-Z_][a-zA-Z0-9_]*"""
-        token.type = reserved.get(token.value, 'ID')  # Check for reserved words
+        token.type = RESERVED.get(token.value, 'ID')  # Check for reserved words
         return token
 
     # strings
@@ -88,22 +98,25 @@ def MLexer():
         return token
 
     # generate list of tokens
-    tokens = list(map(lambda x: x[2:], filter(lambda x: x.startswith("t_"), dir()))) + list(reserved.values())
+    tokens = list(map(lambda x: x[2:], filter(lambda x: x.startswith("t_"), dir()))) + list(RESERVED.values())
 
     # ignored input
     t_ignore = ' \t'
     t_ignore_COMMENT = r'\#.*'
 
-    # new lines and line number handling
+    # new lines, line number and line start offset handling
     def t_newline(token):
         r"""\n+"""
         token.lexer.lineno += len(token.value)
+        token.lexer.linestart = token.lexpos + len(token.value)
 
     # errors handling
     def t_error(token):
         raise LexerError(token)
 
-    return lex.lex()
+    lexer = lex.lex()
+    lexer.linestart = 0
+    return lexer
 
 
 class LexerError(CompilerError):
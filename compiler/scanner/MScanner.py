@@ -1,22 +1,29 @@
-from compiler.scanner import MLexer
+from typing import Iterator
+
+from ply.lex import LexToken
+
+from compiler.scanner import LEXERS
 
 
 class MScanner:
 
-    def __init__(self):
+    def __init__(self, lexer: str = 'ply'):
 
-        # construct lexer
-        self.lexer = MLexer()
+        # construct lexer of given backend
+        self.lexer = LEXERS[lexer]()
 
     def tokenize(self, text):
-        output = []
+        return list(self.tokenize_iter(text))
+
+    def tokenize_iter(self, text) -> Iterator[LexToken]:
+        """ Lazily yields tokens, column is computed from offset of current line start maintained by lexer """
         self.lexer.input(text)
+        self.lexer.lineno = 1
+        self.lexer.linestart = 0
 
         while True:
             token = self.lexer.token()
             if not token:
                 break
-            token.columnno = token.lexpos - text.rfind('\n', 0, token.lexpos)
-            output.append(token)
-
-        return output
+            token.columnno = token.lexpos - self.lexer.linestart + 1
+            yield token
@@ -0,0 +1,304 @@
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from compiler.scanner.MLexer import LexerError, RESERVED
+
+
+class Token:
+    """ Compact token compatible with tokens produced by PLY lexer """
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'columnno', 'lexer')
+
+    def __init__(self, type: str, value: Any, lineno: int, lexpos: int):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f'LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})'
+
+
+# character classes
+_ERROR, _IGNORE, _NEWLINE, _COMMENT, _ID, _DIGIT, _DOT, _STRING, _OPERATOR = range(9)
+
+# operators by lexeme, longer lexemes take precedence just like in PLY lexer
+_OPERATORS_2: Dict[str, str] = {
+    '.+': 'DOT_PLUS',
+    '.-': 'DOT_MINUS',
+    '.*': 'DOT_TIMES',
+    './': 'DOT_DIVIDE',
+    '==': 'EQUALS',
+    '!=': 'NOT_EQUALS',
+    '>=': 'GREATER_EQUAL',
+    '<=': 'LESS_EQUAL',
+    '+=': 'ASSIGN_PLUS',
+    '-=': 'ASSIGN_MINUS',
+    '*=': 'ASSIGN_TIMES',
+    '/=': 'ASSIGN_DIVIDE',
+}
+
+_OPERATORS_1: Dict[str, str] = {
+    '+': 'PLUS',
+    '-': 'MINUS',
+    '*': 'TIMES',
+    '/': 'DIVIDE',
+    '>': 'GREATER',
+    '<': 'LESS',
+    '=': 'ASSIGN',
+    ';': 'SEMICOLON',
+    ',': 'COMMA',
+    '\'': 'APOSTROPHE',
+    ':': 'COLON',
+    '(': 'BRACKET_ROUND_L',
+    ')': 'BRACKET_ROUND_R',
+    '[': 'BRACKET_SQUARE_L',
+    ']': 'BRACKET_SQUARE_R',
+    '{': 'BRACKET_CURLY_L',
+    '}': 'BRACKET_CURLY_R',
+}
+
+
+def _build_classes() -> Dict[str, int]:
+    classes = {' ': _IGNORE, '\t': _IGNORE, '\n': _NEWLINE, '#': _COMMENT, '"': _STRING, '.': _DOT, '_': _ID}
+    for c in 'abcdefghijklmnopqrstuvwxyz':
+        classes[c] = classes[c.upper()] = _ID
+    for c in '0123456789':
+        classes[c] = _DIGIT
+    for c in '!' + ''.join(_OPERATORS_1):
+        classes[c] = _OPERATOR
+    return classes
+
+
+_CLASSES = _build_classes()
+
+
+def _build_byte_classes() -> List[int]:
+    classes = [_ERROR] * 256
+    for c, cls in _CLASSES.items():
+        classes[ord(c)] = cls
+
+    # text mode translates both CRLF and lone CR to new line, mapped source keeps them
+    classes[ord('\r')] = _NEWLINE
+    return classes
+
+
+_BYTE_CLASSES = _build_byte_classes()
+
+# operators of encoded source by encoded lexeme
+_BYTE_OPERATORS_2: Dict[bytes, Tuple[str, str]] = {k.encode(): (v, k) for k, v in _OPERATORS_2.items()}
+_BYTE_OPERATORS_1: Dict[int, Tuple[str, str]] = {ord(k): (v, k) for k, v in _OPERATORS_1.items()}
+
+# patterns of multi character tokens, anchored at current position
+_ID_RE = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+_FLOAT_RE = re.compile(r'((\d+\.\d*|\.\d+)([eE][-+]?\d+)?)|(\d+[eE][-+]?\d+)')
+_INT_RE = re.compile(r'\d+')
+_STRING_RE = re.compile(r'\"(\\.|[^\"])*\"')
+_IGNORE_RE = re.compile(r'[ \t]+')
+_NEWLINE_RE = re.compile(r'\n+')
+_COMMENT_RE = re.compile(r'\#.*')
+
+# the same patterns for UTF-8 encoded source, numbers with non ASCII digits are matched by decoding their run
+_BYTE_ID_RE = re.compile(_ID_RE.pattern.encode())
+_BYTE_FLOAT_RE = re.compile(_FLOAT_RE.pattern.encode())
+_BYTE_INT_RE = re.compile(_INT_RE.pattern.encode())
+_BYTE_STRING_RE = re.compile(_STRING_RE.pattern.encode())
+_BYTE_IGNORE_RE = re.compile(_IGNORE_RE.pattern.encode())
+_BYTE_NEWLINE_RE = re.compile(rb'[\r\n]+')
+_BYTE_COMMENT_RE = re.compile(rb'\#[^\r\n]*')
+_BYTE_NUMBER_RE = re.compile(rb'[0-9.eE+\-\x80-\xff]+')
+_BYTE_NON_ASCII_RE = re.compile(rb'[\x80-\xff]')
+
+
+class MTableLexer:
+    """
+    Lexer producing the same tokens as MLexer,
+    instead of trying alternatives of PLY master regex it dispatches on class of the first character,
+    besides str it reads UTF-8 encoded bytes like memory mapped file without decoding them as whole,
+    positions of tokens are byte offsets then
+    """
+
+    lextokens = frozenset(list(_OPERATORS_2.values()) + list(_OPERATORS_1.values()) +
+                          ['ID', 'STRING', 'FLOAT', 'INT'] + list(RESERVED.values()))
+
+    def __init__(self):
+        self.input('')
+
+    def input(self, text: Union[str, bytes]):
+        self.lexdata = text
+        self.lexpos = 0
+        self.lexlen = len(text)
+        self.lineno = 1
+        self.linestart = 0
+        self._binary = not isinstance(text, str)
+        self._extra_bytes = 0
+
+    def __iter__(self) -> Iterator[Token]:
+        return self
+
+    def __next__(self) -> Token:
+        token = self.token()
+        if token is None:
+            raise StopIteration
+        return token
+
+    def token(self) -> Optional[Token]:
+        if self._binary:
+            return self._token_binary()
+
+        text = self.lexdata
+        end = self.lexlen
+        pos = self.lexpos
+        classes = _CLASSES
+
+        while pos < end:
+            c = text[pos]
+            cls = classes.get(c, _ERROR)
+
+            if cls == _IGNORE:
+                pos = _IGNORE_RE.match(text, pos).end()
+                continue
+
+            if cls == _NEWLINE:
+                match_end = _NEWLINE_RE.match(text, pos).end()
+                self.lineno += match_end - pos
+                self.linestart = pos = match_end
+                continue
+
+            if cls == _COMMENT:
+                pos = _COMMENT_RE.match(text, pos).end()
+                continue
+
+            if cls == _ID:
+                value = _ID_RE.match(text, pos).group()
+                token = Token(RESERVED.get(value, 'ID'), value, self.lineno, pos)
+                self.lexpos = pos + len(value)
+                return token
+
+            # non ASCII decimal digits are matched by number patterns as well
+            if cls == _ERROR and c.isdecimal():
+                cls = _DIGIT
+
+            if cls == _DIGIT or cls == _DOT:
+                match = _FLOAT_RE.match(text, pos)
+                if match:
+                    self.lexpos = match.end()
+                    return Token('FLOAT', float(match.group()), self.lineno, pos)
+                if cls == _DIGIT:
+                    match = _INT_RE.match(text, pos)
+                    self.lexpos = match.end()
+                    return Token('INT', int(match.group()), self.lineno, pos)
+
+            if cls == _STRING:
+                match = _STRING_RE.match(text, pos)
+                if match:
+                    token = Token('STRING', match.group()[1:-1].replace('\\"', '"'), self.lineno, pos)
+                    self.lexpos = match.end()
+                    return token
+
+            elif cls != _ERROR:
+                lexeme = text[pos:pos + 2]
+                type = _OPERATORS_2.get(lexeme)
+                if type is None:
+                    lexeme = c
+                    type = _OPERATORS_1.get(c)
+                if type is not None:
+                    self.lexpos = pos + len(lexeme)
+                    return Token(type, lexeme, self.lineno, pos)
+
+            self.lexpos = pos
+            raise LexerError(Token('error', c, self.lineno, pos))
+
+        self.lexpos = pos
+        return None
+
+    def _token_binary(self) -> Optional[Token]:
+        # columns count characters like in decoded source, line start moves by extra bytes of encoded characters
+        # of the previous token only now, after its column was computed
+        self.linestart += self._extra_bytes
+        self._extra_bytes = 0
+
+        text = self.lexdata
+        end = self.lexlen
+        pos = self.lexpos
+        classes = _BYTE_CLASSES
+
+        while pos < end:
+            c = text[pos]
+            cls = classes[c]
+
+            if cls == _IGNORE:
+                pos = _BYTE_IGNORE_RE.match(text, pos).end()
+                continue
+
+            if cls == _NEWLINE:
+                newlines = _BYTE_NEWLINE_RE.match(text, pos).group()
+                self.lineno += newlines.count(b'\n') + newlines.count(b'\r') - newlines.count(b'\r\n')
+                self.linestart = pos = pos + len(newlines)
+                continue
+
+            if cls == _COMMENT:
+                # long comments are skipped without copying them, only those with non ASCII characters are decoded
+                match_end = _BYTE_COMMENT_RE.match(text, pos).end()
+                if _BYTE_NON_ASCII_RE.search(text, pos, match_end):
+                    comment = text[pos:match_end]
+                    self.linestart += len(comment) - len(comment.decode('utf-8', 'replace'))
+                pos = match_end
+                continue
+
+            if cls == _ID:
+                value = _BYTE_ID_RE.match(text, pos).group().decode('ascii')
+                token = Token(RESERVED.get(value, 'ID'), value, self.lineno, pos)
+                self.lexpos = pos + len(value)
+                return token
+
+            if cls == _DIGIT or cls == _DOT or c >= 0x80:
+                token = self._number_binary(text, pos)
+                if token is not None:
+                    return token
+
+            if cls == _STRING:
+                match = _BYTE_STRING_RE.match(text, pos)
+                if match:
+                    raw = match.group()
+                    value = raw.decode('utf-8', 'replace').replace('\r\n', '\n').replace('\r', '\n')
+                    self._extra_bytes = len(raw) - len(value)
+                    token = Token('STRING', value[1:-1].replace('\\"', '"'), self.lineno, pos)
+                    self.lexpos = match.end()
+                    return token
+
+            elif cls != _ERROR:
+                type, lexeme = _BYTE_OPERATORS_2.get(text[pos:pos + 2]) or _BYTE_OPERATORS_1.get(c, (None, None))
+                if type is not None:
+                    self.lexpos = pos + len(lexeme)
+                    return Token(type, lexeme, self.lineno, pos)
+
+            self.lexpos = pos
+            raise LexerError(Token('error', text[pos:pos + 4].decode('utf-8', 'replace')[0], self.lineno, pos))
+
+        self.lexpos = pos
+        return None
+
+    def _number_binary(self, text: bytes, pos: int) -> Optional[Token]:
+        start = pos
+        run = _BYTE_NUMBER_RE.match(text, pos).group()
+        if run.isascii():
+            float_re, int_re = _BYTE_FLOAT_RE, _BYTE_INT_RE
+        else:
+            # non ASCII decimal digits are matched by patterns of str in decoded run of characters of numbers
+            text, pos, float_re, int_re = run.decode('utf-8', 'replace'), 0, _FLOAT_RE, _INT_RE
+
+        match = float_re.match(text, pos)
+        if match:
+            type, value = 'FLOAT', float(match.group())
+        else:
+            match = int_re.match(text, pos)
+            if match is None:
+                return None
+            type, value = 'INT', int(match.group())
+
+        lexeme = match.group()
+        if isinstance(lexeme, str):
+            self._extra_bytes = len(lexeme.encode()) - len(lexeme)
+            lexeme = lexeme.encode()
+        self.lexpos = start + len(lexeme)
+        return Token(type, value, self.lineno, start)
@@ -1,2 +1,10 @@
 from .MLexer import MLexer, LexerError
+from .MTableLexer import MTableLexer
+
+# available lexer backends, both produce the same tokens
+LEXERS = {
+    'ply': MLexer,
+    'table': MTableLexer
+}
+
 from .MScanner import MScanner
@@ -1,9 +1,9 @@
 """ Type checker module """
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
 from compiler.parser import AST
 from compiler.types import MType
-from compiler.types.operations import OPERATIONS
+from compiler.types.operations import OPERATIONS, ELEMENTWISE_COMPARISONS, REDUCTIONS
 from compiler.utils import SymbolTable, CompilerError, method_dispatch
 
 
@@ -22,18 +22,29 @@ class TypeChecker:
 
         self.errors.append(err)
 
-    @method_dispatch
     def check(self, node: AST.Node) -> MType:
+        """ Checks given AST tree and returns its type, expressions and variables are annotated with their types """
+        mtype = self._check(node)
+        if isinstance(node, (AST.Expression, AST.Variable)):
+            node.mtype = mtype
+        return mtype
+
+    @method_dispatch
+    def _check(self, node: AST.Node) -> MType:
         raise NotImplementedError(f'There is no type check implemented for {node.__class__}')
 
     # ==============================================
     #   EXPRESSIONS
     # ==============================================
-    @check.register
+    @_check.register
     def _(self, node: AST.ConstantExpression) -> MType:
         return MType(type(node.value))
 
-    @check.register
+    @_check.register
+    def _(self, node: AST.ConstantArrayExpression) -> MType:
+        return MType({'b': bool, 'i': int}.get(node.value.dtype.kind, float), node.value.shape)
+
+    @_check.register
     def _(self, node: AST.VectorExpression) -> MType:
 
         # if its empty vector
@@ -48,7 +59,7 @@ class TypeChecker:
         # increase shape
         return MType(types[0].type, (len(node.expressions), ) + types[0].shape)
 
-    @check.register
+    @_check.register
     def _(self, node: AST.RangeExpression) -> MType:
 
         # check if begin and end are integers
@@ -59,7 +70,17 @@ class TypeChecker:
 
         return MType.INT
 
-    @check.register
+    @_check.register
+    def _(self, node: AST.SliceExpression) -> MType:
+
+        # check if given bounds are integers
+        for bound in (node.begin, node.end):
+            if bound is not None and self.check(bound) != MType.INT:
+                self._error(node.line_span, 'Bounds of slice have to be integers')
+
+        return MType(slice)
+
+    @_check.register
     def _(self, node: AST.InstructionStatement) -> MType:
 
         # for BREAK and CONTINUE check scope
@@ -74,6 +95,17 @@ class TypeChecker:
         return MType.NONE
 
     def _check_normal_operators(self, node: AST.OperatorExpression, types: List[MType]) -> MType:
+
+        # product of two matrices is matrix multiplication
+        if node.operator == '*' and not any(t.is_scalar() for t in types):
+            return self._check_product(node.line_span, 'Operator *', types)
+
+        # comparison of matrices is element wise, scalar is compared with every element
+        if node.operator in ELEMENTWISE_COMPARISONS and not all(t.is_scalar() for t in types):
+            shape = next(t.shape for t in types if not t.is_scalar())
+            types = [MType(t.type, shape) if t.is_scalar() else t for t in types]
+            return self._check_elementwise(node.line_span, node.operator, node.operator, types)
+
         types = tuple(types)
 
         # check if operator is applicable for these types
@@ -97,32 +129,46 @@ class TypeChecker:
         return MType(exp_type.type, exp_type.shape[::-1])
 
     def _check_matrix_operators(self, node: AST.OperatorExpression, types: List[MType]) -> MType:
+        return self._check_elementwise(node.line_span, node.operator, node.operator[1:], types)
+
+    def _check_elementwise(self, line_span: Tuple[int, int], name: str, operator: str, types: List[MType]) -> MType:
+        """ Checks elementwise operation of two matrices, 'name' is operator displayed in errors """
 
         # check if operator is applicable for that types
-        if (MType(types[0].type), MType(types[1].type)) not in OPERATIONS[node.operator[1:]]:
-            self._error(node.line_span,
-                        f'Operator {node.operator} is not applicable for types {types[0]} and {types[1]}')
+        if (MType(types[0].type), MType(types[1].type)) not in OPERATIONS[operator]:
+            self._error(line_span,
+                        f'Operator {name} is not applicable for types {types[0]} and {types[1]}')
             return MType.NONE
 
-        # check number of dimensions
-        if len(types[0].shape) != len(types[1].shape):
-            self._error(node.line_span,
-                        f'Operator {node.operator} is not applicable for types with different number of dimensions ({len(types[0].shape)} and {len(types[1].shape)})')
+        shape = self._merge_shapes(line_span, f'Operator {name}', [t.shape for t in types])
+        if shape is None:
             return MType.NONE
 
+        # get result type
+        res_type = OPERATIONS[operator][(MType(types[0].type), MType(types[1].type))]
+        return MType(res_type.type, shape)
+
+    def _merge_shapes(self, line_span: Tuple[int, int], name: str, shapes: List[tuple]) -> Optional[tuple]:
+        """ Checks that shapes of operands match and returns shape of result, 'name' is operation displayed in errors """
+
+        # check number of dimensions
+        if len({len(s) for s in shapes}) > 1:
+            self._error(line_span,
+                        f'{name} is not applicable for types with different number of dimensions ({" and ".join(str(len(s)) for s in shapes)})')
+            return None
+
         # check size of dimensions if available and merge dimensions
         dim = []
-        for i, (s1, s2) in enumerate(zip(iter(types[0].shape), iter(types[1].shape)), 1):
-            dim.append(s1 or s2)
-            if (s1 is not None) and (s2 is not None) and s1 != s2:
-                self._error(node.line_span,
-                            f'Operator {node.operator} is not applicable for types with different sizes of dimensions (dimension {i}: {s1} and {s2})')
+        for i, sizes in enumerate(zip(*shapes), 1):
+            known = {s for s in sizes if s is not None}
+            dim.append(known.pop() if len(known) == 1 else None)
+            if len(known) > 1:
+                self._error(line_span,
+                            f'{name} is not applicable for types with different sizes of dimensions (dimension {i}: {" and ".join(str(s) for s in sizes)})')
 
-        # get result type
-        res_type = OPERATIONS[node.operator[1:]][(MType(types[0].type), MType(types[1].type))]
-        return MType(res_type.type, tuple(dim))
+        return tuple(dim)
 
-    @check.register
+    @_check.register
     def _(self, node: AST.OperatorExpression) -> MType:
 
         # check arguments
@@ -148,10 +194,30 @@ class TypeChecker:
         self._error(node.line_span, f'Unexpected operator {node.operator}')
         return MType.NONE
 
-    @check.register
+    @_check.register
     def _(self, node: AST.FunctionExpression) -> MType:
         arg_types = [self.check(a) for a in node.arguments]
 
+        # function 'where' selects elements of matrices by condition
+        if node.name == 'where':
+            return self._check_where(node, arg_types)
+
+        # reductions of matrices
+        if node.name in REDUCTIONS:
+            return self._check_reduction(node, arg_types)
+
+        # products of matrices accept exactly two arguments
+        if node.name in ('dot', 'matmul'):
+            if len(arg_types) != 2:
+                self._error(node.line_span, f'Function {node.name} expects exactly two arguments, while {len(arg_types)} were found')
+                return MType.NONE
+            return self._check_product(node.line_span, f'Function {node.name}', arg_types)
+
+        # other functions initialize matrices
+        if node.name not in ('eye', 'zeros', 'ones'):
+            self._error(node.line_span, f'Function {node.name} is not defined')
+            return MType.NONE
+
         # function 'eye' accepts exactly two arguments
         if node.name == 'eye' and len(arg_types) != 2:
             self._error(node.line_span, f'Function eye expects exactly two arguments, while {len(arg_types)} were found')
@@ -163,10 +229,71 @@ class TypeChecker:
 
         return MType(float, (None, ) * len(node.arguments))
 
+    def _check_where(self, node: AST.FunctionExpression, types: List[MType]) -> MType:
+
+        # function 'where' accepts exactly three arguments
+        if len(types) != 3:
+            self._error(node.line_span, f'Function where expects exactly three arguments, while {len(types)} were found')
+            return MType.NONE
+
+        # condition has to be boolean, selected values of the same kind
+        elements = tuple(MType(t.type) for t in types)
+        if elements not in OPERATIONS['where']:
+            self._error(node.line_span, f'Function where is not applicable for types {types[0]}, {types[1]} and {types[2]}')
+            return MType.NONE
+
+        # scalars are broadcast to matrices
+        shapes = [t.shape for t in types if not t.is_scalar()]
+        shape = self._merge_shapes(node.line_span, 'Function where', shapes) if shapes else ()
+        if shape is None:
+            return MType.NONE
+
+        return MType(OPERATIONS['where'][elements].type, shape)
+
+    def _check_reduction(self, node: AST.FunctionExpression, types: List[MType]) -> MType:
+
+        # reduction accepts matrix and optionally axis along which it is reduced
+        if len(types) not in (1, 2):
+            self._error(node.line_span, f'Function {node.name} expects one or two arguments, while {len(types)} were found')
+            return MType.NONE
+
+        matrix = types[0]
+        if matrix.is_scalar() or (MType(matrix.type), ) not in OPERATIONS[node.name]:
+            self._error(node.line_span, f'Function {node.name} is not applicable for type {matrix}')
+            return MType.NONE
+
+        # whole matrix is reduced to scalar
+        res_type = OPERATIONS[node.name][(MType(matrix.type), )]
+        if len(types) == 1:
+            return res_type
+
+        # axis has to be known to determine shape of result
+        axis = node.arguments[1]
+        if not isinstance(axis, AST.ConstantExpression) or type(axis.value) is not int or axis.value >= len(matrix.shape):
+            self._error(node.line_span, f'Axis of function {node.name} has to be integer constant lower than {len(matrix.shape)}')
+            return MType.NONE
+
+        return MType(res_type.type, matrix.shape[:axis.value] + matrix.shape[axis.value + 1:])
+
+    def _check_product(self, line_span: Tuple[int, int], name: str, types: List[MType]) -> MType:
+        """ Checks matrix product of vectors and 2d matrices, 'name' is operation displayed in errors """
+        a, b = types
+
+        elements = (MType(a.type), MType(b.type))
+        if elements not in OPERATIONS['matmul'] or not 0 < len(a.shape) <= 2 or not 0 < len(b.shape) <= 2:
+            self._error(line_span, f'{name} is not applicable for types {a} and {b}')
+            return MType.NONE
+
+        # last dimension of first matrix is multiplied with first dimension of second one
+        if self._merge_shapes(line_span, name, [a.shape[-1:], b.shape[:1]]) is None:
+            return MType.NONE
+
+        return MType(OPERATIONS['matmul'][elements].type, a.shape[:-1] + b.shape[1:])
+
     # ==============================================
     #   VARIABLES
     # ==============================================
-    @check.register
+    @_check.register
     def _(self, node: AST.Identifier) -> MType:
 
         # check if exists
@@ -176,29 +303,71 @@ class TypeChecker:
 
         return self.symbol_table[node.name]
 
-    @check.register
+    @_check.register
     def _(self, node: AST.Selector) -> MType:
 
-        # check identifier and selector
+        # check identifier and items of selector
         var_type = self.check(node.identifier)
-        sel_type = self.check(node.selector)
+        items = node.selector.expressions
+        item_types = [self.check(e) for e in items]
+
+        # boolean matrix selects elements where it is true, their number is not known before execution
+        if any(t.type is bool and not t.is_scalar() for t in item_types):
+            mask = item_types[0]
+            if len(items) > 1 or mask.type is not bool or mask.is_scalar():
+                self._error(node.line_span, 'Mask has to be the only argument of selector')
+                return MType.NONE
+
+            if self._merge_shapes(node.line_span, 'Mask', [mask.shape, var_type.shape[:len(mask.shape)]]) is None:
+                return MType.NONE
+            return MType(var_type.type, (None, ) + var_type.shape[len(mask.shape):])
 
         # check selector type
-        if sel_type.type != int or len(sel_type.shape) != 1:
-            self._error(node.line_span, 'Selector has to be a list of integers')
+        if any(t not in (MType.INT, MType(slice)) for t in item_types):
+            self._error(node.line_span, 'Selector has to be a list of integers or slices or a mask')
             return MType.NONE
 
-        # check selector size if known at runtime
-        if sel_type.shape[0] is not None and sel_type.shape[0] > len(var_type.shape):
+        # check selector size
+        if len(items) > len(var_type.shape):
             self._error(node.line_span, f'Selector has more arguments than variable has dimensions')
             return MType.NONE
 
-        return MType(var_type.type, var_type.shape[sel_type.shape[0]:])
+        # integer removes dimension, slice keeps it with length known if its bounds and dimension are known
+        shape = []
+        for item, dim in zip(items, var_type.shape):
+            if isinstance(item, AST.SliceExpression):
+                shape.append(self._slice_length(item, dim))
+
+        return MType(var_type.type, tuple(shape) + var_type.shape[len(items):])
+
+    @staticmethod
+    def _slice_length(node: AST.SliceExpression, dim: Optional[int]) -> Optional[int]:
+        """ Returns length of slice of dimension or None if it is not known before execution """
+        if dim is None or any(b is not None and not isinstance(b, AST.ConstantExpression) for b in (node.begin, node.end)):
+            return None
+        bounds = [None if b is None else b.value for b in (node.begin, node.end)]
+        return len(range(dim)[slice(*bounds)])
+
+    @staticmethod
+    def _masked(node: AST.Variable) -> bool:
+        """ Checks if variable is selected by mask """
+        return isinstance(node, AST.Selector) and any(
+            getattr(e, 'mtype', MType.NONE).type is bool for e in node.selector.expressions)
+
+    @staticmethod
+    def _assignable(var_type: MType, exp_type: MType) -> bool:
+        """ Checks if value can be assigned to selected part of variable, scalar is broadcast into selected matrix """
+        if var_type.type != exp_type.type:
+            return False
+        if exp_type.is_scalar():
+            return True
+        return len(var_type.shape) == len(exp_type.shape) \
+            and all(a is None or b is None or a == b for a, b in zip(var_type.shape, exp_type.shape))
 
     # ==============================================
     #   STATEMENTS
     # ==============================================
-    @check.register
+    @_check.register
     def _(self, node: AST.ProgramStatement) -> MType:
         with self.symbol_table.context_scope('program'):
             for statement in node.statements:
@@ -206,7 +375,7 @@ class TypeChecker:
 
         return MType.NONE
 
-    @check.register
+    @_check.register
     def _(self, node: AST.AssignmentStatement) -> MType:
 
         # if its an assignment to identifier save to table
@@ -217,24 +386,44 @@ class TypeChecker:
         if isinstance(node.variable, AST.Selector):
             var_type = self.check(node.variable)
             exp_type = self.check(node.expression)
-            if var_type != exp_type:
+            if not self._assignable(var_type, exp_type):
                 self._error(node.line_span, f'Cannot assign value of type {exp_type} to index of type {var_type}')
 
         return MType.NONE
 
-    @check.register
+    @_check.register
     def _(self, node: AST.AssignmentWithOperatorStatement) -> MType:
 
         # get types
         types = (self.check(node.variable), self.check(node.expression))
+        node.inplace = False
+
+        # product of matrices is computed like the operator, its result is a new matrix
+        if node.operator == '*=' and not types[0].is_scalar() and not types[1].is_scalar():
+            res_type = self._check_product(node.line_span, f'Operator {node.operator}', list(types))
+            if res_type.type is None:
+                return MType.NONE
+
+        # matrix is updated element wise with scalar or matrix of the same shape, it keeps its shape
+        elif not types[0].is_scalar() and types[0].type is not None:
+            operand = MType(types[0].type) if types[1].is_scalar() else types[0]
+            res_type = self._check_elementwise(node.line_span, node.operator, node.operator[:-1], [operand, types[1]])
+
+            if res_type.type is None:
+                return MType.NONE
+            res_type = MType(res_type.type, types[0].shape)
+
+            # result that keeps type of elements can be written into buffer of matrix, elements selected by mask are a copy
+            node.inplace = res_type.type == types[0].type and not self._masked(node.variable)
 
         # check type compatibility
-        if types not in OPERATIONS[node.operator[:-1]]:
+        elif types not in OPERATIONS[node.operator[:-1]]:
             self._error(node.line_span, f'Operator {node.operator} is not applicable for types {types[0]} and {types[1]}')
             return MType.NONE
 
         # get type of result of operation
-        res_type = OPERATIONS[node.operator[:-1]][types]
+        else:
+            res_type = OPERATIONS[node.operator[:-1]][types]
 
         # if variable is identifier we can just set its type
         if isinstance(node.variable, AST.Identifier):
@@ -247,7 +436,7 @@ class TypeChecker:
 
         return MType.NONE
 
-    @check.register
+    @_check.register
     def _(self, node: AST.WhileStatement) -> MType:
 
         # condition
@@ -260,7 +449,7 @@ class TypeChecker:
 
         return MType.NONE
 
-    @check.register
+    @_check.register
     def _(self, node: AST.ForStatement) -> MType:
 
         # identifier and range
@@ -272,7 +461,7 @@ class TypeChecker:
 
         return MType.NONE
 
-    @check.register
+    @_check.register
     def _(self, node: AST.IfStatement) -> MType:
 
         # condition expression
@@ -70,14 +70,61 @@ GREATER = LESSER = GREATER_OR_EQUAL = LESSER_OR_EQUAL = {
     (MType.FLOAT,   MType.FLOAT):   MType.BOOL,
 }
 
+WHERE = {
+    (MType.BOOL,    MType.BOOL,     MType.BOOL):    MType.BOOL,
+    (MType.BOOL,    MType.INT,      MType.INT):     MType.INT,
+    (MType.BOOL,    MType.INT,      MType.FLOAT):   MType.FLOAT,
+    (MType.BOOL,    MType.FLOAT,    MType.INT):     MType.FLOAT,
+    (MType.BOOL,    MType.FLOAT,    MType.FLOAT):   MType.FLOAT,
+}
+
+# functions of matrices are typed by types of their elements
+SUM = {
+    (MType.BOOL, ):   MType.INT,
+    (MType.INT, ):    MType.INT,
+    (MType.FLOAT, ):  MType.FLOAT
+}
+
+MEAN = {
+    (MType.BOOL, ):   MType.FLOAT,
+    (MType.INT, ):    MType.FLOAT,
+    (MType.FLOAT, ):  MType.FLOAT
+}
+
+MIN = MAX = {
+    (MType.BOOL, ):   MType.BOOL,
+    (MType.INT, ):    MType.INT,
+    (MType.FLOAT, ):  MType.FLOAT
+}
+
+DOT = MATMUL = {
+    (MType.INT,     MType.INT):     MType.INT,
+    (MType.INT,     MType.FLOAT):   MType.FLOAT,
+    (MType.FLOAT,   MType.INT):     MType.FLOAT,
+    (MType.FLOAT,   MType.FLOAT):   MType.FLOAT,
+}
+
+# functions reducing matrix to scalar or along given axis
+REDUCTIONS = ('sum', 'mean', 'min', 'max')
+
+# comparisons applied to matrices element wise, scalar operand is compared with every element
+ELEMENTWISE_COMPARISONS = ('>', '<', '>=', '<=')
+
 OPERATIONS = {
-    'u-':   UNARY_MINUS,
-    '+':    PLUS,
-    '-':    MINUS,
-    '*':    TIMES,
-    '/':    DIVIDE,
-    '>':    GREATER,
-    '<':    LESSER,
-    '>=':   GREATER_OR_EQUAL,
-    '<=':   LESSER_OR_EQUAL
+    'u-':     UNARY_MINUS,
+    '+':      PLUS,
+    '-':      MINUS,
+    '*':      TIMES,
+    '/':      DIVIDE,
+    '>':      GREATER,
+    '<':      LESSER,
+    '>=':     GREATER_OR_EQUAL,
+    '<=':     LESSER_OR_EQUAL,
+    'where':  WHERE,
+    'sum':    SUM,
+    'mean':   MEAN,
+    'min':    MIN,
+    'max':    MAX,
+    'dot':    DOT,
+    'matmul': MATMUL
 }
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import pickle
+import sys
+import time
+from typing import Any, Optional, Union
+
+
+class ProgramCache:
+    """
+    On disk cache of checked programs, similar to __pycache__,
+    entries are keyed by hash of source code and compiler version
+    """
+
+    def __init__(self, directory: str, max_size: int = 256 * 2 ** 20, max_age: float = 30 * 24 * 60 * 60):
+        """ Creates cache in given directory which keeps at most 'max_size' bytes of entries used in last 'max_age' seconds """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_age = max_age
+
+    @staticmethod
+    def key(text: Union[str, bytes], *extra: str) -> str:
+        """
+        Returns key of given source, str or its encoded bytes like memory mapped file,
+        'extra' allows for distinguishing programs compiled with different options
+        """
+        from compiler import __version__
+
+        digest = hashlib.sha256()
+        for part in (__version__, '%d.%d' % sys.version_info[:2], *extra):
+            digest.update(part.encode())
+            digest.update(b'\0')
+        digest.update(text.encode() if isinstance(text, str) else text)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.pickle')
+
+    def load(self, text: Union[str, bytes], *extra: str) -> Optional[Any]:
+        """ Returns cached program for given source or None if there is no valid entry """
+        path = self._path(self.key(text, *extra))
+        try:
+            with open(path, 'rb') as file:
+                program = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # corrupted or incompatible entry
+            self._remove(path)
+            return None
+
+        # modification time marks last use of entry, entries of shared or read-only cache stay as they are
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return program
+
+    def store(self, text: Union[str, bytes], program: Any, *extra: str) -> bool:
+        """ Stores program for given source and evicts stale entries, returns if program was stored """
+        try:
+            data = pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL)
+        except (RecursionError, pickle.PicklingError):
+            return False
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+
+            # write atomically, so concurrent runs never read partially written entry
+            path = self._path(self.key(text, *extra))
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self):
+        """ Removes entries not used for longer than 'max_age' and then least recently used ones above 'max_size' """
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith('.pickle'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+
+        now = time.time()
+        size = 0
+        for mtime, entry_size, path in sorted(entries, reverse=True):
+            size += entry_size
+            if now - mtime > self.max_age or size > self.max_size:
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
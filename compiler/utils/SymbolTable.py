@@ -27,10 +27,12 @@ class SymbolTable:
 
     @contextmanager
     def context_scope(self, name: str):
-        """ Returns context manager that pushes new scope and then pops it """
+        """ Returns context manager that pushes new scope and then pops it, also when control flow exception is raised """
         self.push_scope(name)
-        yield self
-        self.pop_scope()
+        try:
+            yield self
+        finally:
+            self.pop_scope()
 
     def get_current_scope(self):
         """ Returns current scope, the scope as index -1 """
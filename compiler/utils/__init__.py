@@ -1,6 +1,8 @@
 from functools import singledispatch, update_wrapper
 
 from .SymbolTable import SymbolTable
+from .source import map_source, source_size
+from .ProgramCache import ProgramCache
 
 
 def method_dispatch(func):
@@ -0,0 +1,44 @@
+import codecs
+import io
+import mmap
+import os
+import stat
+from typing import IO, Optional, Tuple, Union
+
+
+def map_source(file: IO) -> Optional[mmap.mmap]:
+    """ Returns read-only memory map of given UTF-8 source file, None for streams, empty files and other encodings """
+    fileno = _fileno(file)
+    if fileno is None:
+        return None
+
+    status = os.fstat(fileno)
+    encoding = getattr(file, 'encoding', None) or 'utf-8'
+    if not stat.S_ISREG(status.st_mode) or status.st_size == 0 or codecs.lookup(encoding).name != 'utf-8':
+        return None
+
+    mapping = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    if hasattr(mapping, 'madvise'):
+        mapping.madvise(mmap.MADV_SEQUENTIAL)
+    return mapping
+
+
+def source_size(file: IO, source: Union[str, mmap.mmap]) -> Tuple[int, str]:
+    """ Returns size of given source and its unit, bytes of mapped or regular file, characters read from stream """
+    if not isinstance(source, str):
+        return len(source), 'bytes'
+
+    fileno = _fileno(file)
+    if fileno is not None:
+        status = os.fstat(fileno)
+        # special files may have zero size and content
+        if stat.S_ISREG(status.st_mode) and (status.st_size > 0 or not source):
+            return status.st_size, 'bytes'
+    return len(source), 'chars'
+
+
+def _fileno(file: IO):
+    try:
+        return file.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
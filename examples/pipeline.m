@@ -0,0 +1,11 @@
+# builds several large intermediate matrices one after another, each is needed only by the next steps
+n = 1000;
+
+A = ones(n, n);
+B = A .+ A;
+C = B' .- A;
+D = C .* C;
+E = D .+ B;
+
+s = sum(E);
+print s;
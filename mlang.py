@@ -1,63 +1,137 @@
+import os
+import time
+import tracemalloc
+from functools import wraps
+
 import click
 from tabulate import tabulate
 
-from compiler.utils import CompilerError
+from compiler.utils import CompilerError, map_source, source_size
 
 
 def _echo_error(err):
     click.echo(click.style(str(err), fg='red'), err=True)
 
 
+def source_command(func):
+    """
+    Decorates command with source file argument, replaces file with its content or its memory map
+    and reports throughput
+    """
+
+    @click.argument('file', type=click.File('r'))
+    @click.option('--mmap', 'use_mmap', is_flag=True,
+                  help='Scan memory mapped source file instead of reading it, requires table lexer')
+    @click.option('--stats', is_flag=True, help='Report source processing throughput')
+    @click.option('--lexer', type=click.Choice(['ply', 'table']), default='ply', help='Lexer backend')
+    @wraps(func)
+    def wrapper(file, use_mmap, stats, **kwargs):
+        # PLY lexer matches patterns of str, so only table lexer reads mapped bytes
+        if use_mmap and kwargs['lexer'] != 'table':
+            raise click.UsageError('Option --mmap requires --lexer table')
+
+        start = time.perf_counter()
+
+        # streams and files of other encodings than UTF-8 are read
+        mapping = map_source(file) if use_mmap else None
+        try:
+            source = mapping if mapping is not None else file.read()
+            result = func(source, **kwargs)
+
+            if stats:
+                size, unit = source_size(file, source)
+                elapsed = time.perf_counter() - start
+                click.echo(f'Processed {size} {unit} in {elapsed:.3f} s ({size / max(elapsed, 1e-9):.0f} {unit}/s)',
+                           err=True)
+        finally:
+            if mapping is not None:
+                mapping.close()
+
+        return result
+
+    return wrapper
+
+
+def cache_options(func):
+    """ Decorates command with options of cache of checked programs, replaces them with cache instance or None """
+
+    @click.option('--no-cache', is_flag=True, help='Do not use cache of checked programs')
+    @click.option('--cache-dir', type=click.Path(file_okay=False),
+                  help='Directory of cache of checked programs, __mcache__ next to source file by default')
+    @wraps(func)
+    def wrapper(*args, no_cache, cache_dir, **kwargs):
+        from compiler.utils import ProgramCache
+
+        # programs read from stdin are cached only in explicitly given directory
+        path = click.get_current_context().params['file'].name
+        if cache_dir is None and os.path.isfile(path):
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), '__mcache__')
+
+        cache = ProgramCache(cache_dir) if cache_dir and not no_cache else None
+        return func(*args, cache=cache, **kwargs)
+
+    return wrapper
+
+
 @click.group()
 def cli():
     pass
 
 
 @cli.command('scanner', short_help='Display table of tokens')
-@click.argument('file', type=click.File('r'))
-def scanner(file):
+@click.option('--stream', is_flag=True, help='Print tokens as they are scanned instead of table')
+@source_command
+def scanner(text, lexer, stream):
     """ Displays result of processing given fine by scanner in form of table of tokens """
     from compiler.scanner import MScanner
 
     # tokenize
     try:
-        tokens = MScanner().tokenize(file.read())
+        rows = ((t.lineno, t.columnno, t.type, t.value) for t in MScanner(lexer).tokenize_iter(text))
+
+        # stream rows without holding tokens
+        if stream:
+            for row in rows:
+                click.echo('\t'.join(map(str, row)))
+            return
+
+        rows = list(rows)
     except CompilerError as err:
         return _echo_error(err)
 
     # display table
     click.echo(tabulate(
-        [(t.lineno, t.columnno, t.type, t.value) for t in tokens],
+        rows,
         headers=("row", "col", "type", "value"),
         tablefmt="fancy_grid"
     ))
 
 
 @cli.command('parser', short_help='Run parser on given file')
-@click.argument('file', type=click.File('r'))
-def parser(file):
+@source_command
+def parser(text, lexer):
     """ Runs parser on given file and displays potential error """
     from compiler.parser import MParser
-    from compiler.scanner import MLexer
+    from compiler.scanner import LEXERS
 
     # parses file
     try:
-        MParser().parse(file.read(), lexer=MLexer())
+        MParser().parse(text, lexer=LEXERS[lexer]())
     except CompilerError as err:
         return _echo_error(err)
 
 
 @cli.command('ast', short_help='Display AST tree')
-@click.argument('file', type=click.File('r'))
-def ast(file):
+@source_command
+def ast(text, lexer):
     """ Displays AST tree that represents parser file """
     from compiler.parser import MParser
-    from compiler.scanner import MLexer
+    from compiler.scanner import LEXERS
     from compiler.printer import ASTPrinter
 
     # parse file
     try:
-        root = MParser().parse(file.read(), lexer=MLexer(), tracking=True)
+        root = MParser().parse(text, lexer=LEXERS[lexer](), tracking=True)
     except CompilerError as err:
         return _echo_error(err)
 
@@ -66,16 +140,21 @@ def ast(file):
 
 
 @cli.command('types', short_help='Performs type check')
-@click.argument('file', type=click.File('r'))
-def types(file):
+@source_command
+@cache_options
+def types(text, lexer, cache):
     """ Performs type check and displays possible errors """
     from compiler.types import TypeChecker
     from compiler.parser import MParser
-    from compiler.scanner import MLexer
+    from compiler.scanner import LEXERS
+
+    # program found in cache is already checked
+    if cache and cache.load(text) is not None:
+        return
 
     # parse file
     try:
-        root = MParser().parse(file.read(), lexer=MLexer(), tracking=True)
+        root = MParser().parse(text, lexer=LEXERS[lexer](), tracking=True)
     except CompilerError as err:
         return _echo_error(err)
 
@@ -87,25 +166,121 @@ def types(file):
     for err in checker.errors:
         _echo_error(err)
 
+    # cache only correct programs
+    if cache and not checker.errors:
+        cache.store(text, root)
+
+
+@cli.command('disassemble', short_help='Display bytecode of program')
+@source_command
+def disassemble(text, lexer):
+    """ Compiles checked program to bytecode of register machine and displays its listing """
+    from compiler.parser import MParser
+    from compiler.scanner import LEXERS
+    from compiler.types import TypeChecker
+    from compiler.interpreter import BytecodeCompiler, disassemble
+
+    # parse file and check types
+    try:
+        root = MParser().parse(text, lexer=LEXERS[lexer](), tracking=True)
+        TypeChecker().check(root)
+    except CompilerError as err:
+        return _echo_error(err)
+
+    # print listing
+    click.echo(disassemble(BytecodeCompiler().compile(root)))
+
 
 @cli.command('execute', short_help='Executes program')
-@click.argument('file', type=click.File('r'))
-def execute(file):
+@click.option('--engine', type=click.Choice(['tree', 'closure', 'vm']), default='tree', help='Execution engine')
+@click.option('-O', 'optimize', is_flag=True,
+              help='Fold constant expressions, remove branches with constant conditions, '
+                   'hoist loop invariants, reuse repeated subexpressions and release matrices no longer used')
+@click.option('--vectorize', is_flag=True, help='Execute elementwise for loops and reductions on whole arrays')
+@click.option('--vectorize-report', is_flag=True, help='Vectorize and report which loops were vectorized and why not')
+@click.option('--fuse', is_flag=True, help='Evaluate chains of element wise operators without full size temporaries')
+@click.option('--matrix-chain', is_flag=True, help='Multiply products of several matrices in the cheapest order')
+@click.option('--threads', type=click.IntRange(min=1), default=1,
+              help='Number of threads computing element wise operators and initialization of large matrices')
+@click.option('--parallel-threshold', type=click.IntRange(min=1), default=1 << 20,
+              help='Number of elements from which matrices are computed by multiple threads')
+@click.option('--buffer-pool', type=click.IntRange(min=0), default=0, metavar='MIB',
+              help='Size of pool of buffers reused by large matrices of the same shape, disabled by default')
+@click.option('--dump-ast', is_flag=True, help='Display AST tree after optimizations before executing it')
+@click.option('--memory-report', is_flag=True, help='Report peak memory allocated during execution')
+@source_command
+@cache_options
+def execute(text, lexer, cache, engine, optimize, vectorize, vectorize_report, fuse, matrix_chain, threads,
+            parallel_threshold, buffer_pool, dump_ast, memory_report):
     """ Performs parsing, scanning, type check and execution """
     from compiler.parser import MParser
-    from compiler.scanner import MLexer
+    from compiler.scanner import LEXERS
     from compiler.types import TypeChecker
-    from compiler.interpreter import Interpreter
+    from compiler.interpreter import (
+        Interpreter, ConstantFolder, RedundancyEliminator, Vectorizer, ExpressionFuser, MatrixChainOptimizer,
+        LivenessAnalyzer, buffers, parallel
+    )
+
+    parallel.configure(threads, parallel_threshold)
+    buffers.configure(buffer_pool << 20)
 
     try:
-        # parse file
-        root = MParser().parse(file.read(), lexer=MLexer(), tracking=True)
+        root = cache.load(text) if cache else None
 
-        # check types
-        TypeChecker().check(root)
+        if root is None:
+            # parse file
+            root = MParser().parse(text, lexer=LEXERS[lexer](), tracking=True)
+
+            # check types
+            TypeChecker().check(root)
+
+            if cache:
+                cache.store(text, root)
+
+        # optimize, every pass relies on types annotated by type checker, cached program stays as it was checked
+        if optimize:
+            root = ConstantFolder().optimize(root)
+
+        if vectorize or vectorize_report:
+            vectorizer = Vectorizer()
+            root = vectorizer.vectorize(root)
+
+            if vectorize_report:
+                for line, message in vectorizer.report:
+                    click.echo(f'Line {line}: {message}', err=True)
+
+        # temporaries would make loops look carried between iterations, so vectorized loops are left as they are
+        if optimize:
+            root = RedundancyEliminator().optimize(root)
+
+        if matrix_chain:
+            root = MatrixChainOptimizer().optimize(root)
+
+        if fuse:
+            root = ExpressionFuser().fuse(root)
+
+        # the last pass, it has to see all variables created by the other ones
+        if optimize:
+            root = LivenessAnalyzer().release(root)
+
+        if dump_ast:
+            from compiler.printer import ASTPrinter
+            click.echo(ASTPrinter().generate(root), err=True)
+
+        # execute, peak memory is measured by tracing allocations of python and numpy
+        if memory_report:
+            tracemalloc.start()
+
+        result = Interpreter(engine).execute_with_return(root)
+
+        if memory_report:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            click.echo(f'Peak memory: {peak / (1 << 20):.1f} MiB', err=True)
 
-        # execute
-        result = Interpreter().execute_with_return(root)
+            pool = buffers.pool()
+            if pool:
+                click.echo(f'Buffer pool: {pool.hits} hits, {pool.misses} misses, {pool.evictions} evictions', err=True)
 
     except CompilerError as err:
         return _echo_error(err)
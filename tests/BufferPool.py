@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+from compiler.interpreter import Interpreter, buffers
+from compiler.interpreter.buffers import BufferPool
+from compiler.interpreter.operations import make_writable, share
+from compiler.parser import MParser
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+
+
+class TestBufferPool(unittest.TestCase):
+
+    def tearDown(self):
+        buffers.configure()
+
+    def execute(self, program: str, engine: str = 'tree'):
+        root = MParser().parse(program, lexer=MLexer(), tracking=True)
+        TypeChecker().check(root)
+        return Interpreter(engine).execute_with_return(root)
+
+    def test_reuse(self):
+        pool = BufferPool(1 << 20)
+        a = pool.empty((4, 4), np.float64)
+        address = a.ctypes.data
+        del a
+
+        # buffer of dead matrix is reused by matrix of the same shape and type only
+        b = pool.empty((4, 4), np.float64)
+        self.assertEqual(b.ctypes.data, address)
+        pool.empty((4, 4), np.int64)
+        pool.empty((16, ), np.float64)
+        self.assertEqual((pool.hits, pool.misses), (1, 3))
+
+    def test_views(self):
+        pool = BufferPool(1 << 20)
+        a = pool.empty((4, 4), np.float64)
+        t = a.T
+        del a
+
+        # buffer viewed by other matrix is not reused
+        self.assertEqual(pool.size, 0)
+        b = pool.empty((4, 4), np.float64)
+        self.assertFalse(np.shares_memory(b, t))
+        self.assertEqual(pool.hits, 0)
+
+    def test_eviction(self):
+        nbytes = 8 * 16
+        pool = BufferPool(2 * nbytes)
+        for shape in [(16, ), (2, 8), (8, 2)]:
+            pool.empty(shape, np.float64)
+
+        # buffers returned least recently are dropped when pool is full
+        self.assertEqual((pool.size, pool.evictions), (2 * nbytes, 1))
+        pool.empty((16, ), np.float64)
+        pool.empty((8, 2), np.float64)
+        self.assertEqual((pool.hits, pool.misses), (1, 4))
+
+        # buffer larger than whole pool is never kept
+        pool.empty((64, ), np.float64)
+        self.assertEqual(pool.size, 2 * nbytes)
+
+    def test_shared(self):
+        pool = BufferPool(1 << 20)
+        a = pool.empty((2, 2), np.float64)
+        a.fill(0)
+        r = share(a[1])
+
+        # view of the same buffer shared by other variable is copied before writing
+        frame = [a]
+        del a
+        make_writable(frame, 0)[1, 0] = 5.
+        self.assertEqual(r.tolist(), [0., 0.])
+
+        # buffer made read-only by sharing is writable again once reused
+        del r, frame
+        self.assertTrue(pool.empty((2, 2), np.float64).flags.writeable)
+
+    def test_loop(self):
+        program = 'n = 100; A = ones(n, n); B = eye(n, n); C = zeros(n, n); k = 0; ' \
+                  'while (k < 10) { X = A .* B .+ C; C = X; k += 1; } return C;'
+        expected = self.execute(program)
+
+        for engine in Interpreter.ENGINES:
+            buffers.configure(1 << 24, 1)
+            np.testing.assert_equal(self.execute(program, engine), expected)
+
+            # matrices computed by the loop reuse a few buffers after the first iterations
+            pool = buffers.pool()
+            self.assertGreaterEqual(pool.hits, 15)
+            self.assertLessEqual(pool.misses, 8)
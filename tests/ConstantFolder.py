@@ -0,0 +1,60 @@
+from compiler.interpreter import ConstantFolder
+from compiler.parser import AST
+
+from passes import PassTestCase
+
+
+class TestConstantFolder(PassTestCase):
+
+    def transform(self, root: AST.Node) -> AST.Node:
+        return ConstantFolder().optimize(root)
+
+    def test_fold(self):
+        root = self.parse('x = 1; a = 2 * 3 + x; b = x + 2 * 3; c = zeros(2, 2); d = [1 + 1, 2] .* [3, 3]; '
+                          'e = "a" + 1; f = -2 > 1; g = d[1 - 1];', True)
+        _, a, b, c, d, e, f, g = [s.expression for s in root.statements]
+
+        self.assertEqual(a.expressions[0].value, 6)
+        self.assertEqual(b.expressions[1].value, 6)
+        self.assertIsInstance(c, AST.ConstantArrayExpression)
+        self.assertFalse(c.value.flags.writeable)
+        self.assertEqual(d.value.tolist(), [6, 6])
+        self.assertEqual(e.value, 'a1')
+        self.assertIs(f.value, False)
+
+        # selector stays vector of items
+        self.assertIsInstance(g.selector, AST.VectorExpression)
+        self.assertEqual(g.selector.expressions[0].value, 0)
+
+    def test_not_folded(self):
+        root = self.parse('a = 1 / 0; b = 1. / 0.; c = zeros(1000, 1000); d = sum([1, 2]);', True)
+
+        # failures are reported during execution, large matrices and numpy scalars are not kept in program
+        for statement in root.statements:
+            self.assertNotIsInstance(statement.expression, (AST.ConstantExpression, AST.ConstantArrayExpression))
+
+    def test_prune(self):
+        folder = ConstantFolder()
+        root = self.parse('a = 0; if (1 > 2) a = 1; else a = 2; if (true) a += 1; if (false) a = 5; '
+                          'while (false) a = 3; while (a > 5) a -= 1;', False)
+        _, then, other, empty, loop, kept = folder.optimize(root).statements
+
+        self.assertEqual(folder.pruned, 4)
+        self.assertEqual((then.variable.name, then.expression.value), ('a', 2))
+        self.assertIsInstance(other, AST.AssignmentWithOperatorStatement)
+        self.assertEqual((empty.statements, loop.statements), ([], []))
+        self.assertIsInstance(kept, AST.WhileStatement)
+
+    def test_shapes(self):
+        root = self.parse('A = zeros(2, 3); B = A .+ A; C = A\'; n = 2; D = ones(n, 3);', True)
+
+        # shapes of constant matrices are propagated to expressions using them
+        self.assertEqual([repr(s.expression.mtype) for s in root.statements],
+                         ['float[2,3]', 'float[2,3]', 'float[3,2]', 'int', 'float[*,*]'])
+
+    def test_results(self):
+        self.assertSameResult('s = 0; for i = 0:5 { s += 2 * 3 + i; if (2 > 1) s -= 1; } return s;')
+        self.assertSameResult('r = 0; for i = 0:3 { Z = zeros(2, 2); Z[0, 0] += i * 1.; r += Z[0, 0]; } return r;')
+        self.assertSameResult('A = [1, 2] .+ [3, 4] .* [2, 2]; A[0] = 0; return A;')
+        self.assertSameResult('return [[1., 2.], [3., 4.]] * [1, 1] .- [.5, .5];')
+        self.assertSameResult('return where([1, 2, 3] > 1, 1, 0);')
@@ -0,0 +1,64 @@
+import tracemalloc
+
+from compiler.interpreter import ExpressionFuser, Interpreter, fused
+from compiler.parser import AST
+
+from passes import PassTestCase
+
+
+class TestExpressionFuser(PassTestCase):
+
+    def setUp(self):
+        # small blocks so that short programs are evaluated in several of them
+        self.block_size = fused.BLOCK_SIZE
+        fused.BLOCK_SIZE = 5
+
+    def tearDown(self):
+        fused.BLOCK_SIZE = self.block_size
+
+    def transform(self, root: AST.Node) -> AST.Node:
+        return ExpressionFuser().fuse(root)
+
+    def test_fuse(self):
+        root = self.parse('A = ones(2, 2); D = A .* A .+ A ./ A; E = A .+ A; F = [A .- A .* A]; s = 1 + 2 * 3;', True)
+        _, d, e, f, s = root.statements
+
+        self.assertIsInstance(d.expression, AST.FusedExpression)
+        self.assertEqual([leaf.name for leaf in d.expression.leaves], ['A', 'A', 'A', 'A'])
+
+        # single operator and scalars are left as they are, trees nested in other expressions are fused
+        self.assertIsInstance(e.expression, AST.OperatorExpression)
+        self.assertIsInstance(f.expression.expressions[0], AST.FusedExpression)
+        self.assertIsInstance(s.expression, AST.OperatorExpression)
+
+    def test_results(self):
+        self.assertSameResult('A = [[1, 2, 3], [4, 5, 6], [7, 8, 9]]; B = A .* A; '
+                              'return A .* B .+ A ./ B .- A;')
+        self.assertSameResult('A = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]; B = [.5, 1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5, 8.5, 9.5, 10.5]; '
+                              'return A .* A .- B;')
+        self.assertSameResult('A = [[1, 2, 3], [4, 5, 6], [7, 8, 9]]; B = A\'; return A .- B .* A .+ B;')
+        self.assertSameResult('A = ones(4, 3); B = [[1, 2, 3], [4, 5, 6], [7, 8, 9], [1, 2, 3]]; '
+                              'C = zeros(4, 3); for i = 0:3 { C = C .+ A .* B; } return C;')
+
+    def test_fallback(self):
+        # matrices of unknown shape are broadcast like without fusion
+        self.assertSameResult('A = ones(3, 4); B = ones(1, 4); return A .+ B .* A;')
+
+    def test_allocations(self):
+        fused.BLOCK_SIZE = self.block_size
+        program = 'A = ones(500, 500); B = ones(500, 500); return A .* B .+ A .* B .- A ./ B;'
+        nbytes = 500 * 500 * 8
+
+        peaks = []
+        for fuse in (False, True):
+            root = self.parse(program, fuse)
+            tracemalloc.start()
+            try:
+                Interpreter().execute_with_return(root)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+            finally:
+                tracemalloc.stop()
+
+        # A, B and result, scratch buffers are small
+        self.assertGreater(peaks[0], 4.5 * nbytes)
+        self.assertLess(peaks[1], 3.5 * nbytes)
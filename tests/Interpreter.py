@@ -1,12 +1,15 @@
+import tracemalloc
 import unittest
 from typing import Any, List, Tuple
 
 import numpy as np
 
-from compiler.interpreter import Interpreter
+from compiler.interpreter import Interpreter, BytecodeCompiler, buffers, disassemble, opcodes, parallel
 from compiler.parser import MParser
 from compiler.scanner import MLexer
 from compiler.types import TypeChecker
+from compiler.types.TypeChecker import TypeCheckerError
+from compiler.utils import CompilerError
 
 
 class TestInterpreter(unittest.TestCase):
@@ -48,6 +51,15 @@ class TestInterpreter(unittest.TestCase):
             ('return [[[[1]]]];',   np.asarray([[[[1]]]])),
         )
 
+    def test_constant_arrays(self):
+        self.assertExecute(
+            ('return [1.5, 2.];',                                       np.asarray([1.5, 2.])),
+            ('return [[1, 2], [3, 4]] .+ [[1, 1], [1, 1]];',            np.asarray([[2, 3], [4, 5]])),
+            ('r = 0; for i = 0:3 { A = [1, 2]; r += A[0]; A[0] = 5; } return r;',    3),
+            ('r = 0; for i = 0:3 { A = [[1, 2]]; r += A[0, 1]; A[0, 1] *= 2; } return r;',    6),
+            ('A = [[1, 2], [3, 4]]; B = A\'; B[0, 1] = 9; return A;',  np.asarray([[1, 2], [3, 4]])),
+        )
+
     def test_operators(self):
         sA = '[[1, 2], [3, 4]]'
         sB = '[[5, 6], [7, 8]]'
@@ -129,6 +141,102 @@ class TestInterpreter(unittest.TestCase):
             ('c = 3; c /= 2; return c;',    3 / 2),
         )
 
+    def test_compound_assignment(self):
+        sA = '[[1, 2], [3, 4]]'
+        A = np.asarray([[1, 2], [3, 4]])
+
+        self.assertExecute(
+            (f'A = {sA}; A += 1; return A;',                    A + 1),
+            (f'A = {sA}; A *= A; return A;',                    A @ A),
+            (f'A = {sA}; A -= [[1, 1], [1, 1]]; return A;',     A - 1),
+            (f'A = {sA}; A[0] += [10, 20]; return A;',          np.asarray([[11, 22], [3, 4]])),
+            (f'A = [[1., 2.], [3., 4.]]; A[1] /= 2; return A;', np.asarray([[1, 2], [1.5, 2]])),
+
+            # result of other type than matrix is not written into its buffer
+            (f'A = {sA}; A /= 2; return A;',                    A / 2),
+            (f'A = {sA}; A += 1.5; return A;',                  A + 1.5),
+
+            # constant matrix is copied once and updated in place afterwards
+            (f'for i = 0:2 {{ A = {sA}; A += 1; }} return 0;',  0),
+            (f'r = 0; for i = 0:2 {{ A = {sA}; r += A[0, 0]; A += 1; }} return r;',  2),
+        )
+
+    def test_compound_assignment_allocations(self):
+        size = 500
+        nbytes = size * size * 8
+
+        for shape, statement in [(f'{size}, {size}', 'A += B;'), (f'1, {size}, {size}', 'A[0] -= B;')]:
+            with self.subTest(statement=statement):
+                program = f'A = zeros({shape}); B = ones({size}, {size}); for i = 0:5 {{ {statement} }} return 0;'
+
+                tracemalloc.start()
+                try:
+                    self.execute(program)
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+
+                # only A and B are allocated, copying update would need third matrix
+                self.assertLess(peak, 2.5 * nbytes)
+
+    def test_aliasing(self):
+        A = np.asarray([[1, 2], [3, 4]])
+
+        self.assertExecute(
+            # assigned matrix is a value, the variable written first gets its own copy
+            ('A = [[1, 2], [3, 4]]; B = A; B[0, 0] = 9; return A;',             A),
+            ('A = zeros(2); B = A; A[0] = 1.; return B;',                       np.zeros(2)),
+            ('A = zeros(2); B = A; C = B; C += 1.; return A .+ B;',             np.zeros(2)),
+            ('A = zeros(2); B = A; B[0] = 1.; B[1] = 2.; A[1] = 3.; return A .+ B;',  np.asarray([1, 5])),
+
+            # views selected from matrix and its transposition are values too
+            ('A = zeros(2, 2); r = A[1]; A[1, 0] = 5.; return r;',              np.zeros(2)),
+            ('A = zeros(2, 2); T = A\'; T[0, 1] = 5.; return A;',               np.zeros((2, 2))),
+            ('A = zeros(2, 2); T = A\'; A[0, 1] = 5.; return T;',               np.zeros((2, 2))),
+
+            # matrix shared in loop is copied by the iteration writing it
+            ('A = ones(3); for i = 0:3 { B = A; B[i] = 0.; } return A;',       np.ones(3)),
+            ('A = zeros(3); B = A; for i = 0:3 { A[i] = i * 1.; } return B;',  np.zeros(3)),
+            ('A = zeros(2); B = A; k = 0; while (k < 2) { B = A; A += 1.; k += 1; } return B;',  np.ones(2)),
+
+            # matrix no longer shared is written in place, the other variable keeps its own
+            ('A = zeros(2); B = A; B = ones(2); A[0] = 1.; return A .+ B;',    np.asarray([2, 1])),
+            ('A = zeros(2, 2); r = A[1]; r = ones(2); A[1, 0] = 5.; return A[1] .+ r;',  np.asarray([6, 1])),
+            ('A = zeros(2); B = A; C = B; B = ones(2); A += 1.; return A .+ C;',  np.ones(2)),
+        )
+
+    def test_aliasing_allocations(self):
+        size = 500
+        nbytes = size * size * 8
+        program = f'A = zeros({size}, {size}); for i = 0:5 {{ B = A; C = B\'; r = A[0]; }} A[0, 0] = 1.; return 0;'
+
+        tracemalloc.start()
+        try:
+            self.execute(program)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # assignments share matrix, it is copied once by the first write
+        self.assertLess(peak, 2.5 * nbytes)
+
+    def test_aliasing_released(self):
+        size = 500
+        nbytes = size * size * 8
+        program = f'A = zeros({size}, {size}); k = 0; while (k < 5) {{ B = A; r = A[0]; s = sum(B) + sum(r); ' \
+                  f'B = ones(1, 1); r = ones(1); A[0, 0] = s + 1.; A += 1.; k += 1; }} return A[0, 0];'
+
+        tracemalloc.start()
+        try:
+            result = self.execute(program)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # variable and view sharing matrix are reassigned before it is written, so it is never copied
+        self.assertEqual(result, 6513010.)
+        self.assertLess(peak, 1.5 * nbytes)
+
     def test_selectors(self):
         sA = '[[1, 2], [3, 4]]'
         A = np.asarray([[1, 2], [3, 4]])
@@ -140,6 +248,128 @@ class TestInterpreter(unittest.TestCase):
             (f'A = {sA}; return A[1, 1];',    A[1, 1]),
         )
 
+    def test_slices(self):
+        sA = '[[1, 2, 3], [4, 5, 6], [7, 8, 9]]'
+        A = np.asarray([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+
+        self.assertExecute(
+            (f'A = {sA}; return A[1:3, :];',                    A[1:3, :]),
+            (f'A = {sA}; j = 2; return A[:, j];',               A[:, 2]),
+            (f'A = {sA}; n = 2; return A[:n, 1:];',             A[:2, 1:]),
+            (f'A = {sA}; return A[5:];',                        A[5:]),
+            (f'A = {sA}; A[0:2, 0] = [10, 40]; return A;',      np.asarray([[10, 2, 3], [40, 5, 6], [7, 8, 9]])),
+            (f'A = {sA}; A[1:, :] = 0; return A;',              np.asarray([[1, 2, 3], [0, 0, 0], [0, 0, 0]])),
+            (f'A = {sA}; A[:, 1:] *= 2; return A;',             np.asarray([[1, 4, 6], [4, 10, 12], [7, 16, 18]])),
+
+            # slices assigned to variables are values, writes through them are not seen by sliced matrix
+            ('A = zeros(2, 3); B = A[0, :]; B[1] = 5.; return A;',      np.asarray([[0, 0, 0], [0, 0, 0]])),
+            ('A = zeros(3, 3); c = A[:, 2]; c += 1.; return A[:, 2];',  np.asarray([0, 0, 0])),
+            ('A = zeros(3, 3); c = A[:, 2]; c += 1.; return c;',        np.asarray([1, 1, 1])),
+        )
+
+    def test_slice_types(self):
+        root = self.parser.parse('A = zeros(2, 3); B = [[1, 2, 3], [4, 5, 6]]; n = 1; '
+                                 'a = B[0:1, :]; b = B[:, 1]; c = B[n:, -1:]; d = A[1:2];', lexer=self.lexer, tracking=True)
+        self.checker.check(root)
+        self.assertEqual([repr(s.expression.mtype) for s in root.statements[3:]],
+                         ['int[1,3]', 'int[2]', 'int[*,*]', 'float[*,*]'])
+
+        for program in ['A = [1, 2]; b = A[0.5:];', 'A = [1, 2]; b = A[:, 0];', 'A = [[1, 2]]; A[0:1, :] = [1, 2];']:
+            with self.subTest(program=program), self.assertRaises(TypeCheckerError):
+                self.execute(program)
+
+    def test_masks(self):
+        sA = '[[1, -2, 3], [-4, 5, -6]]'
+        A = np.asarray([[1, -2, 3], [-4, 5, -6]])
+
+        self.assertExecute(
+            (f'A = {sA}; return A < 0;',                        A < 0),
+            (f'A = {sA}; return 0 <= A;',                       0 <= A),
+            (f'A = {sA}; return A >= A .- {sA};',               A >= 0),
+            (f'A = {sA}; return A[A > 0];',                     np.asarray([1, 3, 5])),
+            (f'A = {sA}; return A[A[:, 0] > 0];',               np.asarray([[1, -2, 3]])),
+            (f'A = {sA}; A[A < 0] = 0; return A;',              np.asarray([[1, 0, 3], [0, 5, 0]])),
+            (f'A = {sA}; A[A < 0] = [7, 8, 9]; return A;',      np.asarray([[1, 7, 3], [8, 5, 9]])),
+            (f'A = {sA}; A[A > 0] *= 10; return A;',            np.asarray([[10, -2, 30], [-4, 50, -6]])),
+            (f'A = {sA}; return where(A > 0, A, 0);',           np.asarray([[1, 0, 3], [0, 5, 0]])),
+            (f'A = {sA}; return where(A > 0, 1, A .* A);',      np.asarray([[1, 4, 1], [16, 1, 36]])),
+            ('return where(1 > 2, 1, 2.5);',                    2.5),
+        )
+
+    def test_mask_types(self):
+        root = self.parser.parse('A = zeros(2, 3); B = [[1, 2, 3], [4, 5, 6]]; '
+                                 'a = A > 1.; b = B[B > 2]; c = A[A[:, 0] > 0.]; d = where(a, 1, B); e = where(true, 1, 2.);',
+                                 lexer=self.lexer, tracking=True)
+        self.checker.check(root)
+        self.assertEqual([repr(s.expression.mtype) for s in root.statements[2:]],
+                         ['bool[*,*]', 'int[*]', 'float[*,*]', 'int[2,3]', 'float'])
+
+        for program in ['A = [1, 2]; b = A[A > 1, 0];', 'A = [1, 2]; b = A[[true, false, true]];',
+                        'A = [1, 2]; b = A > [1, 2, 3];', 'A = [1, 2]; b = where(A, 1, 2);',
+                        'A = [1, 2]; b = where(A > 1, A, [1, 2, 3]);', 'b = where(true, 1);']:
+            with self.subTest(program=program), self.assertRaises(TypeCheckerError):
+                self.execute(program)
+
+    def test_reductions(self):
+        sA = '[[1., -2., 3.], [-4., 5., -6.]]'
+        A = np.asarray([[1., -2., 3.], [-4., 5., -6.]])
+
+        self.assertExecute(
+            (f'A = {sA}; return sum(A);',                       A.sum()),
+            (f'A = {sA}; return sum(A, 0);',                    A.sum(0)),
+            (f'A = {sA}; return mean(A, 1);',                   A.mean(1)),
+            (f'A = {sA}; return [min(A), max(A)];',             np.asarray([-6., 5.])),
+            (f'A = {sA}; return max(A, 1);',                    A.max(1)),
+            (f'A = {sA}; return sum(A > 0.);',                  3),
+            ('v = [1, 2, 3]; return sum(v, 0);',                6),
+
+            # builtins do not shadow variables of the same name
+            ('max = 2; return max([max, 3]);',                  3),
+        )
+
+    def test_products(self):
+        sA = '[[1, 2], [3, 4], [5, 6]]'
+        A = np.asarray([[1, 2], [3, 4], [5, 6]])
+        B = np.asarray([[1., 0., 2.], [0., 1., 3.]])
+
+        self.assertExecute(
+            (f'A = {sA}; B = [[1., 0., 2.], [0., 1., 3.]]; return A * B;',  A @ B),
+            (f'A = {sA}; B = [[1., 0., 2.], [0., 1., 3.]]; return B * A;',  B @ A),
+            (f'A = {sA}; return A * [1, -1];',                              A @ [1, -1]),
+            (f'A = {sA}; return [1, 0, 1] * A;',                            np.asarray([1, 0, 1]) @ A),
+            ('return [1, 2] * [3, 4];',                                     11),
+            ('return dot([1., 2.], [3, 4]);',                               11.),
+            (f'A = {sA}; return matmul(A\', A);',                           A.T @ A),
+            ('a = 2; b = 3; return a * b;',                                 6),
+
+            # compound assignment multiplies matrices like the operator
+            ('A = [[1, 2], [3, 4]]; B = A; A *= B; return A;',              np.asarray([[7, 10], [15, 22]])),
+            (f'A = {sA}; B = [[1., 0., 2.], [0., 1., 3.]]; A *= B; return A;',  A @ B),
+            (f'A = {sA}; A[0] *= [[1, 0], [1, 1]]; return A;',              np.asarray([[3, 2], [3, 4], [5, 6]])),
+            (f'A = {sA}; A *= 2; return A;',                                A * 2),
+        )
+
+        # matrix updated with product has the same value as assigned product
+        for program in ['A = [[1, 2], [3, 4]]; B = [[0, 1], [1, 1]]; ', 'A = [[1., 2.]]; B = [[1.], [2.]]; ']:
+            with self.subTest(program=program):
+                np.testing.assert_equal(self.execute(program + 'A *= B; return A;'),
+                                        self.execute(program + 'A = A * B; return A;'))
+
+    def test_builtin_types(self):
+        root = self.parser.parse('A = zeros(2, 3); B = [[1, 2, 3], [4, 5, 6]]; '
+                                 'a = sum(B); b = mean(B, 1); c = max(A > 1., 0); d = A * B\'; e = B * [1, 2, 3]; f = dot(A, B\');',
+                                 lexer=self.lexer, tracking=True)
+        self.checker.check(root)
+        self.assertEqual([repr(s.expression.mtype) for s in root.statements[2:]],
+                         ['int', 'float[2]', 'bool[*]', 'float[*,2]', 'int[2]', 'float[*,2]'])
+
+        for program in ['a = sum(1);', 'A = [1, 2]; b = sum(A, 1);', 'A = [1, 2]; n = 0; b = sum(A, n);',
+                        'A = ["a", "b"]; b = min(A);', 'a = sum([1, 2], 0, 0);', 'a = [1, 2] * [1, 2, 3];',
+                        'a = [[1, 2]] * [[1, 2]];', 'A = [[1, 2, 3], [4, 5, 6]]; A *= A;',
+                        'A = [[1, 2], [3, 4]]; A[0, 0] *= A;', 'a = dot([1, 2]);', 'a = [true] * [true];', 'a = foo(1);']:
+            with self.subTest(program=program), self.assertRaises(TypeCheckerError):
+                self.execute(program)
+
     def test_if(self):
         self.assertExecute(
             ('if (true) return 1; return 2;',      1),
@@ -165,14 +395,134 @@ class TestInterpreter(unittest.TestCase):
     def test_break(self):
         self.assertExecute(
             ('a = 0; while(true) { a += 1; if(a>5) break; } return a;',      6),
+            ('s = 0; for i = 0:3 { for j = 0:3 { if (j > i) break; s += 1; } } return s;',   6),
         )
 
     def test_continue(self):
         self.assertExecute(
             ('a = 0; for i = 0:6 { if(i<3) continue; a += i; } return a;',   sum(range(3,6))),
+            ('s = 0; i = 0; while (i < 5) { i += 1; { if (i == 2) continue; } s += i; } return s;',  13),
         )
 
     def test_return(self):
         self.assertExecute(
             ('a = 0; while(true) { a += 1; if(a>5) return a; }',      6),
+            ('for i = 0:10 { for j = 0:10 { if (i * j == 12) return j; } } return 0;',    6),
+            ('print 1; return 2;',                                    2),
+        )
+
+    def test_scopes(self):
+        self.assertExecute(
+            ('for i = 0:3 { x = i; } return i;',                               None),
+            ('for i = 0:3 { if (i == 1) break; } return i;',                   None),
+            ('i = 7; for i = 0:3 { if (i == 1) break; } return i;',            1),
+            ('a = 0; for i = 0:3 { x = 5; if (i > 0) continue; a += x; } x = 1; return a + x;',    6),
+            ('x = 1; if (true) { x = 2; y = 3; } return x;',                   2),
+            ('s = 0; for i = 0:3 { for j = 0:2 { t = i; s += t; } } return s;', 6),
+            ('i = 0; while (i < 3) { i += 1; j = i; } return i;',                3),
+        )
+
+
+class TestInterpreterClosure(TestInterpreter):
+
+    def setUp(self):
+        super().setUp()
+        self.interpreter = Interpreter('closure')
+
+
+class TestInterpreterParallel(TestInterpreter):
+
+    def setUp(self):
+        super().setUp()
+
+        # every matrix is split into blocks of two elements computed by four threads
+        self.block_size = parallel.BLOCK_SIZE
+        parallel.BLOCK_SIZE = 2
+        parallel.configure(4, 1)
+
+    def tearDown(self):
+        parallel.configure()
+        parallel.BLOCK_SIZE = self.block_size
+
+    def test_compound_assignment_allocations(self):
+        # large matrices would be split into too many tasks
+        parallel.BLOCK_SIZE = self.block_size
+        super().test_compound_assignment_allocations()
+
+    def test_aliasing_allocations(self):
+        parallel.BLOCK_SIZE = self.block_size
+        super().test_aliasing_allocations()
+
+    def test_aliasing_released(self):
+        parallel.BLOCK_SIZE = self.block_size
+        super().test_aliasing_released()
+
+    def test_blocks(self):
+        A = np.arange(12).reshape(3, 4)
+
+        self.assertExecute(
+            ('A = [[0, 1, 2], [3, 4, 5]]; return A\' .* A\' .- A\';',   np.asarray([[0, 6], [0, 12], [2, 20]])),
+            ('return eye(3, 4) .+ ones(3, 4) .- zeros(3, 4);',          np.eye(3, 4) + 1),
+            ('return eye(4, 2);',                                       np.eye(4, 2)),
+            ('return [1, 2, 3] ./ [2, 2, 2];',                          np.asarray([.5, 1, 1.5])),
+            ('A = zeros(1, 4); B = ones(3, 4); return B .+ A;',         np.ones((3, 4))),
         )
+        np.testing.assert_equal(parallel.elementwise(np.add)(A, A[::-1]), A + A[::-1])
+
+    def test_result_dtype(self):
+        # numpy without ufunc.resolve_dtypes gets types from ufunc applied to empty arrays
+        for ufunc in (np.add, np.true_divide):
+            for a, b in [(np.int64, np.int64), (np.int64, np.float64), (np.bool_, np.bool_)]:
+                with self.subTest(ufunc=ufunc.__name__, a=a, b=b):
+                    expected = ufunc(np.ones(1, a), np.ones(1, b)).dtype
+                    self.assertEqual(parallel.result_dtype(ufunc, np.dtype(a), np.dtype(b)), expected)
+                    self.assertEqual(parallel.result_dtype(lambda *x: ufunc(*x), np.dtype(a), np.dtype(b)), expected)
+
+
+class TestInterpreterBuffers(TestInterpreter):
+
+    def setUp(self):
+        super().setUp()
+
+        # every matrix is taken from pool of buffers
+        buffers.configure(1 << 24, 1)
+
+    def tearDown(self):
+        buffers.configure()
+
+    @unittest.skip('pool refers to buffers it lent, so matrices of shared buffers are always copied')
+    def test_aliasing_released(self):
+        pass
+
+
+class TestInterpreterVM(TestInterpreter):
+
+    def setUp(self):
+        super().setUp()
+        self.interpreter = Interpreter('vm')
+
+    def compile(self, program: str) -> List[str]:
+        root = self.parser.parse(program, lexer=self.lexer, tracking=True)
+        self.checker.check(root)
+        return [opcodes.NAMES[i[0]] for i in BytecodeCompiler().compile(root).code]
+
+    def test_superinstructions(self):
+        self.assertEqual(self.compile('s = 0; A = [1, 2]; for i = 0:2 { s += A[i] * 2; if (s > 3) break; }'), [
+            'MOVE', 'MOVE', 'MOVE', 'MOVE', 'FOR_NEXT', 'INDEX1', 'OPK', 'OP2', 'JUMP_IF_NOT_OP', 'JUMP', 'JUMP', 'RETURN'
+        ])
+
+    def test_disassemble(self):
+        root = self.parser.parse('a = 1; a += 2; return a;', lexer=self.lexer, tracking=True)
+        listing = disassemble(BytecodeCompiler().compile(root)).splitlines()
+
+        self.assertEqual([line.split(None, 2) for line in listing], [
+            ['0', 'MOVE', 'a, 1'],
+            ['1', 'OPK', 'a, +, a, 2'],
+            ['2', 'RETURN', 'a'],
+            ['3', 'RETURN', 'None'],
+        ])
+
+    def test_break_outside_loop(self):
+        # type checker rejects such programs, unchecked ones are not compiled either
+        root = self.parser.parse('a = 1; break;', lexer=self.lexer, tracking=True)
+        self.assertRaisesRegex(CompilerError, 'outside of a loop', BytecodeCompiler().compile, root)
@@ -0,0 +1,77 @@
+import tracemalloc
+
+from compiler.interpreter import Interpreter, LivenessAnalyzer, Vectorizer
+from compiler.parser import AST
+
+from passes import PassTestCase
+
+
+class TestLivenessAnalyzer(PassTestCase):
+
+    def transform(self, root: AST.Node) -> AST.Node:
+        return LivenessAnalyzer().release(root)
+
+    def released(self, node: AST.Statement) -> list:
+        return [i.name for i in node.identifiers] if isinstance(node, AST.ReleaseStatement) else None
+
+    def test_release(self):
+        root = self.parse('n = 3; A = ones(n); B = A .+ A; C = B .- A; print n; s = sum(C); print s;', True)
+        names = [self.released(s) for s in root.statements]
+
+        # matrices are released after their last use, scalars are kept
+        self.assertEqual(names, [None, None, None, None, ['A', 'B'], None, None, ['C'], None])
+
+    def test_small(self):
+        root = self.parse('A = [1., 2., 3.]; B = ones(64, 64); n = 3; C = ones(n, 2); x = A[0] + B[0, 0] + C[0, 0];',
+                          True)
+
+        # matrices of known shape are released only when they are large
+        self.assertEqual(self.released(root.statements[-1]), ['B', 'C'])
+
+    def test_loops(self):
+        root = self.parse('n = 3; A = ones(n); s = 0.; for i = 0:n { B = A .* A; s += sum(B); } print s;', True)
+        loop, release = root.statements[3:5]
+
+        # variable read in every iteration is live until the loop ends, temporary one is released in its body
+        self.assertEqual(self.released(release), ['A'])
+        self.assertEqual(self.released(loop.statement.statements[-1]), ['B'])
+
+        root = self.parse('n = 3; A = ones(n); k = 0; while (k < n) { B = A; k += 1; if (k > 1) break; A = B .+ B; } '
+                          'print k;', True)
+        loop = root.statements[3]
+
+        # value assigned at the end of iteration is read by the next one, previous one is dead after it is copied
+        self.assertEqual([self.released(s) for s in loop.statement.statements], [None, ['A'], None, None, None, ['B']])
+
+    def test_vectorized(self):
+        root = self.parse('n = 3; A = ones(n); B = zeros(n); for i = 0:n { B[i] = A[i] * 2.; } print B;', False)
+        root = LivenessAnalyzer().release(Vectorizer().vectorize(root))
+
+        # bodies of vectorized loops are kept so the loop can be executed as whole array operations
+        loop = root.statements[3]
+        self.assertIsInstance(loop, AST.VectorizedForStatement)
+        self.assertFalse(any(isinstance(s, AST.ReleaseStatement) for s in loop.loop.statement.statements))
+        self.assertEqual(self.released(root.statements[4]), ['A'])
+
+    def test_peak(self):
+        program = 'n = 500; A = ones(n, n); B = A .+ A; C = B .- A; D = C .* C; E = D .+ C; return sum(E);'
+
+        def peak(optimize: bool) -> int:
+            root = self.parse(program, optimize)
+            tracemalloc.start()
+            Interpreter().execute_with_return(root)
+            _, result = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return result
+
+        # at most three matrices are alive at once instead of all five
+        self.assertLess(peak(True), peak(False) * 0.8)
+
+    def test_results(self):
+        self.assertSameResult('n = 3; A = ones(n, n); B = A * A; C = B .- A; return sum(C);')
+        self.assertSameResult('n = 4; A = ones(n); s = 0.; for i = 0:n { B = A .* A; A = B .+ B; s += sum(A); } '
+                              'return s;')
+        self.assertSameResult('n = 2; A = ones(n); B = A; k = 0; while (true) { k += 1; if (k > 3) { B = A; break; } '
+                              'A = A .+ A; } return B;')
+        self.assertSameResult('n = 3; A = ones(n); B = A; if (n > 2) { C = A .+ B; A = C; } else B = A; return A;')
+        self.assertSameResult('n = 3; A = ones(n); for i = 0:n { if (i == 1) continue; A[i] = 2.; } return A;')
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import time
+import unittest
+
+from compiler.parser import MParser, AST
+from compiler.parser import parsetab
+from compiler.parser.MParser import _build_parser
+from compiler.scanner import MLexer
+
+
+class TestMParser(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = MParser()
+
+    def parse(self, program: str) -> AST.Node:
+        return self.parser.parse(program, lexer=MLexer(), tracking=True)
+
+    def test_cached(self):
+        self.assertIs(MParser(), MParser())
+        self.assertIsNot(MLexer(), MLexer())
+
+    def test_shipped_tables(self):
+        # tables are taken from shipped module only if they match grammar
+        self.assertIs(self.parser.action, parsetab._lr_action)
+        self.assertIs(self.parser.goto, parsetab._lr_goto)
+
+    def test_no_files_written(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                _build_parser.__wrapped__()
+                _build_parser.__wrapped__(tabmodule='compiler.parser.missing_parsetab')
+                self.assertEqual(os.listdir(tmp), [])
+            finally:
+                os.chdir(cwd)
+
+    def test_cold_start(self):
+        def measure(**kwargs):
+            start = time.perf_counter()
+            for _ in range(5):
+                _build_parser.__wrapped__(**kwargs)
+            return time.perf_counter() - start
+
+        generated = measure(tabmodule='compiler.parser.missing_parsetab')
+        precomputed = measure()
+
+        self.assertLess(precomputed * 2, generated)
+
+    def test_parse(self):
+        root = self.parse('a = 1; b = a + 2;')
+
+        self.assertIsInstance(root, AST.ProgramStatement)
+        self.assertEqual(len(root.statements), 2)
+
+    def test_linear_scaling(self):
+        def measure(program: str) -> float:
+            times = []
+            for _ in range(3):
+                start = time.perf_counter()
+                self.parse(program)
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        generators = [
+            lambda n: 'a = 1;\n' * n,
+            lambda n: 'A = [' + ', '.join(['1'] * n) + '];',
+        ]
+
+        for generate in generators:
+            small = measure(generate(4000))
+            large = measure(generate(32000))
+
+            # 8 times larger input, quadratic parsing would take about 64 times longer
+            self.assertLess(large / small, 16)
+
+    def test_lists_order(self):
+        root = self.parse('a = 1; print 1, 2, 3; { c = 2; d = 3; }')
+
+        self.assertSequenceEqual([s.__class__ for s in root.statements],
+                                 [AST.AssignmentStatement, AST.InstructionStatement, AST.ProgramStatement])
+        self.assertSequenceEqual([e.value for e in root.statements[1].arguments], [1, 2, 3])
+        self.assertSequenceEqual([s.variable.name for s in root.statements[2].statements], ['c', 'd'])
+
+    def test_constant_arrays(self):
+        root = self.parse('A = [[1, 2], [3, 4]]; B = [1., 2.]; C = [1, 2.]; D = [[1], [a]]; E = [true];')
+        A, B, C, D, E = [s.expression for s in root.statements]
+
+        self.assertIsInstance(A, AST.ConstantArrayExpression)
+        self.assertEqual(A.value.tolist(), [[1, 2], [3, 4]])
+        self.assertFalse(A.value.flags.writeable)
+        self.assertIsInstance(B, AST.ConstantArrayExpression)
+        self.assertEqual(B.value.dtype, float)
+
+        # mixed types, non constant elements and non numeric constants are left for type checker
+        self.assertIsInstance(C, AST.VectorExpression)
+        self.assertIsInstance(D, AST.VectorExpression)
+        self.assertIsInstance(D.expressions[0], AST.ConstantArrayExpression)
+        self.assertIsInstance(E, AST.VectorExpression)
+
+    def test_slices(self):
+        root = self.parse('a = A[1:5, :]; b = A[:, j]; c = A[2:]; d = A[:n, 0]; e = A[1:n - 1];')
+        a, b, c, d, e = [s.expression.selector.expressions for s in root.statements]
+
+        self.assertIsInstance(a[0], AST.SliceExpression)
+        self.assertEqual((a[0].begin.value, a[0].end.value), (1, 5))
+        self.assertEqual((a[1].begin, a[1].end), (None, None))
+        self.assertIsInstance(b[1], AST.Identifier)
+        self.assertEqual((c[0].begin.value, c[0].end), (2, None))
+        self.assertIsNone(d[0].begin)
+        self.assertIsInstance(d[0].end, AST.Identifier)
+        self.assertIsInstance(e[0].end, AST.OperatorExpression)
+
+    def test_functions(self):
+        root = self.parse('a = zeros(2, 3); b = sum(A, 0); min = max(A);')
+        a, b, c = root.statements
+
+        self.assertEqual((a.expression.name, len(a.expression.arguments)), ('zeros', 2))
+        self.assertEqual((b.expression.name, len(b.expression.arguments)), ('sum', 2))
+
+        # names of builtins are not reserved
+        self.assertEqual((c.variable.name, c.expression.name), ('min', 'max'))
@@ -1,4 +1,8 @@
+import glob
+import os
+import random
 import unittest
+from typing import Union
 
 from compiler.scanner import MScanner, LexerError
 
@@ -74,9 +78,9 @@ class TestMScanner(unittest.TestCase):
         self.assertEqual(tokens[28].value, '}')
 
     def test_reserved(self):
-        tokens = self.scanner.tokenize("if else for while break continue return eye zeros ones print true false")
+        tokens = self.scanner.tokenize("if else for while break continue return eye zeros ones print true false where")
 
-        self.assertEqual(len(tokens), 13)
+        self.assertEqual(len(tokens), 14)
 
         self.assertEqual(tokens[0].type, 'IF')
         self.assertEqual(tokens[1].type, 'ELSE')
@@ -91,6 +95,7 @@ class TestMScanner(unittest.TestCase):
         self.assertEqual(tokens[10].type, 'PRINT')
         self.assertEqual(tokens[11].type, 'TRUE')
         self.assertEqual(tokens[12].type, 'FALSE')
+        self.assertEqual(tokens[13].type, 'WHERE')
 
         self.assertEqual(tokens[0].value, 'if')
         self.assertEqual(tokens[1].value, 'else')
@@ -105,6 +110,7 @@ class TestMScanner(unittest.TestCase):
         self.assertEqual(tokens[10].value, 'print')
         self.assertEqual(tokens[11].value, 'true')
         self.assertEqual(tokens[12].value, 'false')
+        self.assertEqual(tokens[13].value, 'where')
 
     def test_id(self):
         tokens = self.scanner.tokenize('abc1 ABC2 aBc3 _0abc _a_b_1')
@@ -177,3 +183,81 @@ class TestMScanner(unittest.TestCase):
         self.assertRaises(LexerError, self.scanner.tokenize, "!")
         self.assertRaises(LexerError, self.scanner.tokenize, "$")
         self.assertRaises(LexerError, self.scanner.tokenize, "^")
+
+    def test_columns(self):
+        tokens = self.scanner.tokenize("a = 1;\n  b\n\n\tc = [1, 2];")
+
+        self.assertSequenceEqual([(t.lineno, t.columnno) for t in tokens], [
+            (1, 1), (1, 3), (1, 5), (1, 6),
+            (2, 3),
+            (4, 2), (4, 4), (4, 6), (4, 7), (4, 8), (4, 10), (4, 11), (4, 12)
+        ])
+
+    def test_tokenize_iter(self):
+        tokens = self.scanner.tokenize_iter("a b\nc %")
+
+        self.assertEqual(next(tokens).value, 'a')
+        self.assertEqual(next(tokens).value, 'b')
+        self.assertEqual(next(tokens).columnno, 1)
+        self.assertRaises(LexerError, next, tokens)
+
+    def test_reuse(self):
+        self.scanner.tokenize("a\nb\nc")
+        tokens = self.scanner.tokenize("a b")
+
+        self.assertSequenceEqual([(t.lineno, t.columnno) for t in tokens], [(1, 1), (1, 3)])
+
+
+class TestMScannerTable(TestMScanner):
+
+    def setUp(self):
+        self.scanner = MScanner('table')
+
+
+class TestLexersConformance(unittest.TestCase):
+
+    def setUp(self):
+        self.scanners = [MScanner('ply'), MScanner('table')]
+
+    def scan(self, scanner: MScanner, source) -> Union[list, str]:
+        try:
+            return [(t.type, t.value, t.lineno, t.lexpos, t.columnno) for t in scanner.tokenize(source)]
+        except LexerError as err:
+            return str(err)
+
+    def assertConform(self, text: str, encoded: bytes = None):
+        results = [self.scan(scanner, text) for scanner in self.scanners]
+        self.assertEqual(results[0], results[1], f'Lexers differ for input {text!r}')
+
+        # table lexer reads encoded source as well, offsets of its tokens are offsets of bytes
+        binary = self.scan(self.scanners[1], encoded or text.encode())
+        if isinstance(binary, list) and isinstance(results[1], list):
+            results[1], binary = [t[:3] + t[4:] for t in results[1]], [t[:3] + t[4:] for t in binary]
+        self.assertEqual(results[1], binary, f'Lexers differ for encoded input {text!r}')
+
+    def test_binary(self):
+        # mapped source keeps CRLF and lone CR which text mode translates to new lines
+        self.assertConform('a = 1;\nb = 2;\n\nc', b'a = 1;\r\nb = 2;\r\rc')
+        self.assertConform('s = "a\nb";\n# c\nd', b's = "a\r\nb";\r\n# c\r\nd')
+
+        # columns count characters of strings, comments and numbers with more bytes in UTF-8
+        self.assertConform('s = "żółw" + 1; # ü\nx = ١٢ + 1; y = 1e٣; z')
+        self.assertConform('a = 1 é')
+
+        # offsets of tokens are offsets of their bytes
+        tokens = self.scanners[1].tokenize('s = "ż"; t'.encode())
+        self.assertEqual([t.lexpos for t in tokens], [0, 2, 4, 8, 10])
+
+    def test_examples(self):
+        examples = os.path.join(os.path.dirname(__file__), '..', 'examples', '*.m')
+        for path in glob.glob(examples):
+            with open(path) as file:
+                self.assertConform(file.read())
+
+    def test_random(self):
+        fragments = ['a', 'if', 'ones', '_x1', '1', '12', '.', '.5', '1.', '1e', 'E', '+', '-', '*', '/', '=', '!',
+                     '>', '<', ';', ',', '\'', ':', '(', ')', '[', ']', '{', '}', '"', '\\', ' ', '\t', '\n', '#']
+
+        rand = random.Random(0)
+        for _ in range(2000):
+            self.assertConform(''.join(rand.choice(fragments) for _ in range(rand.randint(1, 20))))
@@ -0,0 +1,70 @@
+import numpy as np
+
+from compiler.interpreter import MatrixChainOptimizer
+from compiler.interpreter.matrix_chain import chain_dimensions, chain_order, evaluate_chain
+from compiler.parser import AST
+
+from passes import PassTestCase
+
+
+class TestMatrixChainOptimizer(PassTestCase):
+
+    def transform(self, root: AST.Node) -> AST.Node:
+        return MatrixChainOptimizer().optimize(root)
+
+    def assertResultEqual(self, result, expected):
+        # products multiplied in other order round differently
+        np.testing.assert_allclose(result, expected)
+
+    def test_order(self):
+        # textbook chain of six matrices
+        order, cost = chain_order([30, 35, 15, 5, 10, 20, 25])
+        self.assertEqual(order, ((0, (1, 2)), ((3, 4), 5)))
+        self.assertEqual(cost, 15125)
+
+        # matrix times matrix times vector multiplies the vector first, ties keep order of source
+        self.assertEqual(chain_order(chain_dimensions([(10, 10), (10, 10), (10, )]))[0], (0, (1, 2)))
+        self.assertEqual(chain_order([2, 2, 2, 2])[0], ((0, 1), 2))
+
+        # row and column vectors at both ends
+        self.assertEqual(chain_dimensions([(3, ), (3, 4), (4, )]), [1, 3, 4, 1])
+        self.assertIsNone(chain_dimensions([(3, None), (None, 4)]))
+
+    def test_optimize(self):
+        root = self.parse('A = [[1, 2], [3, 4]]; B = ones(2, 2); v = [1, 2]; '
+                          'a = A * A * v; b = A * B * A; c = A * v * A; d = A * A;', True)
+        a, b, c, d = [s.expression for s in root.statements[3:]]
+
+        # static shapes give plan before execution
+        self.assertIsInstance(a, AST.MatrixChainExpression)
+        self.assertEqual(a.plan, (((2, 2), (2, 2), (2, )), (0, (1, 2))))
+
+        # unknown shapes are resolved at runtime
+        self.assertIsInstance(b, AST.MatrixChainExpression)
+        self.assertFalse(hasattr(b, 'plan'))
+
+        # vector inside of chain and single product are left as they are
+        self.assertIsInstance(c, AST.OperatorExpression)
+        self.assertIsInstance(d, AST.OperatorExpression)
+
+    def test_results(self):
+        self.assertSameResult('A = [[1, 2], [3, 4], [5, 6]]; B = [[1., 0., 2.], [0., 1., 3.]]; v = [1, -1]; '
+                              'return A * B * A * v;')
+        self.assertSameResult('A = ones(3, 4); B = ones(4, 2); u = [1., 2., 3.]; return u * A * B * [1., 1.];')
+        self.assertSameResult('A = [[1, 2], [3, 4]]; r = A; for i = 0:3 { r = r * A * A\' * A; } return r;')
+
+    def test_plan_cache(self):
+        chain = AST.MatrixChainExpression((1, 1), [])
+        A, v = np.ones((20, 20)), np.ones(20)
+
+        np.testing.assert_allclose(evaluate_chain(chain, [A, A, v]), A @ A @ v)
+        plan = chain.plan
+        self.assertEqual(plan[1], (0, (1, 2)))
+
+        # the same shapes reuse plan, different ones replace it
+        evaluate_chain(chain, [A, A, v])
+        self.assertIs(chain.plan, plan)
+
+        row = np.ones((1, 20))
+        np.testing.assert_allclose(evaluate_chain(chain, [row, A, A]), row @ A @ A)
+        self.assertEqual(chain.plan[1], ((0, 1), 2))
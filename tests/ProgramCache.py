@@ -0,0 +1,89 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from compiler.interpreter import Interpreter
+from compiler.parser import MParser, AST
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+from compiler.utils import ProgramCache
+
+
+class TestProgramCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ProgramCache(os.path.join(self.tmp.name, '__mcache__'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def check(self, program: str) -> AST.Node:
+        root = MParser().parse(program, lexer=MLexer(), tracking=True)
+        TypeChecker().check(root)
+        return root
+
+    def entries(self):
+        return sorted(os.listdir(self.cache.directory))
+
+    def test_roundtrip(self):
+        program = 'r = 0; for i = 0:3 { A = [1, 2]; r += A[0]; A[0] = 5; } return r;'
+
+        self.assertIsNone(self.cache.load(program))
+        self.assertTrue(self.cache.store(program, self.check(program)))
+
+        root = self.cache.load(program)
+        self.assertIsInstance(root, AST.ProgramStatement)
+        self.assertEqual(Interpreter().execute_with_return(root), 3)
+
+    def test_key(self):
+        self.cache.store('return 1;', self.check('return 1;'))
+
+        self.assertIsNone(self.cache.load('return 2;'))
+        self.assertIsNone(self.cache.load('return 1;', 'other options'))
+        with mock.patch('compiler.__version__', '0.0.0'):
+            self.assertIsNone(self.cache.load('return 1;'))
+
+        # memory mapped source is keyed by its bytes
+        self.assertIsNotNone(self.cache.load(b'return 1;'))
+
+    def test_corrupted(self):
+        self.cache.store('return 1;', self.check('return 1;'))
+        path, = self.entries()
+        with open(os.path.join(self.cache.directory, path), 'wb') as file:
+            file.write(b'garbage')
+
+        self.assertIsNone(self.cache.load('return 1;'))
+        self.assertEqual(self.entries(), [])
+
+    def test_read_only(self):
+        self.cache.store('return 1;', self.check('return 1;'))
+
+        # entry owned by other user cannot be marked as used, it is loaded anyway
+        with mock.patch('os.utime', side_effect=PermissionError):
+            self.assertIsInstance(self.cache.load('return 1;'), AST.ProgramStatement)
+        self.assertEqual(len(self.entries()), 1)
+
+    def test_evict_age(self):
+        self.cache.store('return 1;', self.check('return 1;'))
+        path = os.path.join(self.cache.directory, self.entries()[0])
+        os.utime(path, (time.time() - 2 * self.cache.max_age, ) * 2)
+
+        self.cache.store('return 2;', self.check('return 2;'))
+        self.assertEqual(self.entries(), [ProgramCache.key('return 2;') + '.pickle'])
+
+    def test_evict_size(self):
+        programs = [f'return {i};' for i in range(3)]
+        for i, program in enumerate(programs):
+            self.cache.store(program, self.check(program))
+            path = os.path.join(self.cache.directory, ProgramCache.key(program) + '.pickle')
+            os.utime(path, (time.time() - 10 + i, ) * 2)
+
+        # keep space only for two entries, least recently used is evicted
+        self.cache.max_size = 2 * os.path.getsize(path)
+        self.cache.load(programs[0])
+        self.cache.evict()
+
+        self.assertEqual(self.entries(), sorted(ProgramCache.key(p) + '.pickle' for p in (programs[0], programs[2])))
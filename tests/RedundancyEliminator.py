@@ -0,0 +1,100 @@
+from compiler.interpreter import RedundancyEliminator
+from compiler.interpreter.assignments import Assignments
+from compiler.parser import AST
+
+from passes import PassTestCase
+
+
+class TestRedundancyEliminator(PassTestCase):
+
+    def transform(self, root: AST.Node) -> AST.Node:
+        return RedundancyEliminator().optimize(root)
+
+    def test_assignments(self):
+        root = self.parse('A = ones(3); B = A; n = 3; m = n; s = 0; for i = 0:n { s += i; if (s > 1) B[i] = 2.; }', False)
+        assignments = Assignments(root.statements[5])
+        self.assertEqual(assignments.names, {'i', 's', 'B'})
+        self.assertTrue(assignments.elements)
+
+        # elements written through one variable may change matrix of another one
+        n, a = root.statements[3].expression, root.statements[1].expression
+        self.assertFalse(assignments.changes(n))
+        self.assertTrue(assignments.changes(a))
+
+        # matrices updated in place change their elements too
+        root = self.parse('A = ones(3); x = 1; while (x < 3) { x += 1; A += 1.; }', False)
+        self.assertTrue(Assignments(root.statements[2]).elements)
+
+    def test_hoist(self):
+        root = self.parse('n = 3; s = 0.; A = ones(n); for i = 0:n { s += n * 2 + A[i]; C = ones(n, n)\'; C[i, i] = s; '
+                          'A[i] = n - 1 * s; s += n * 2; }', True)
+        guarded = root.statements[3]
+
+        # loop over range of unknown length is executed only when it is not empty
+        self.assertIsInstance(guarded, AST.IfStatement)
+        self.assertEqual(guarded.condition.operator, '<')
+        first, second, loop = guarded.statement_then.statements
+
+        self.assertEqual((first.variable.name, first.expression.operator), ('$1', '*'))
+        self.assertEqual((second.variable.name, second.expression.name), ('$2', 'freeze'))
+        self.assertIsInstance(second.expression.arguments[0], AST.OperatorExpression)
+
+        # repeated invariant shares temporary, expression reading variable assigned in loop stays in it
+        body = loop.statement.statements
+        self.assertEqual(body[0].expression.expressions[0].name, '$1')
+        self.assertEqual(body[1].expression.name, '$2')
+        self.assertIsInstance(body[3].expression, AST.OperatorExpression)
+        self.assertEqual(body[4].expression.name, '$1')
+
+    def test_not_hoisted(self):
+        root = self.parse('n = 3; A = ones(n, n); B = A; for i = 0:3 { B[i, i] = 0.; x = A\'; y = sum(A); } '
+                          'while (n > 0) { n -= 1; if (n > 1) print n * 2; m = n * 2; }', True)
+
+        # matrix written through other variable and view of matrix are not invariant
+        self.assertIsInstance(root.statements[3], AST.ForStatement)
+
+        # expressions after other statements than assignments may not be evaluated in every iteration
+        self.assertIsInstance(root.statements[4], AST.WhileStatement)
+
+    def test_guard(self):
+        root = self.parse('x = 0; for i = 0:3 { x += 2 * 3; } while (true) { x += 2 * 3; break; }', True)
+        self.assertIsInstance(root.statements[1], AST.ProgramStatement)
+        self.assertIsInstance(root.statements[2], AST.ProgramStatement)
+
+        # hoisted expressions are not evaluated when loop is not executed
+        self.assertSameResult('n = 0; x = 1; for i = 0:n { x = x / n; } while (n > 0) { x = 1 / n; } return x;')
+
+    def test_eliminate(self):
+        root = self.parse('a = 2; b = 3; x = a * b + 1; y = a * b + 1; z = a * b; a = 1; w = a * b;', True)
+        statements = root.statements[2:]
+        names = [s.variable.name for s in statements[:7]]
+        self.assertEqual(names, ['$2', '$1', 'x', 'y', 'z', 'a', 'w'])
+
+        # larger subexpression is computed from the smaller one
+        self.assertEqual(statements[1].expression.expressions[0].name, '$2')
+        self.assertEqual([statements[i].expression.name for i in (2, 3, 4)], ['$1', '$1', '$2'])
+
+        # product is not reused after assignment of its operand
+        self.assertIsInstance(statements[6].expression, AST.OperatorExpression)
+
+        # single statement becomes block assigning temporary before it
+        root = self.parse('a = 2; if (a > 1) x = a * 2 - a * 2;', True)
+        block = root.statements[1].statement_then
+        self.assertIsInstance(block, AST.ProgramStatement)
+        self.assertEqual([s.variable.name for s in block.statements], ['$1', 'x'])
+
+    def test_aliasing(self):
+        # temporaries of matrices are copied when variable sharing them is written
+        self.assertSameResult('A = ones(2); B = ones(2); X = A .+ B; Y = A .+ B; X[0] = 5.; return Y;')
+        self.assertSameResult('r = 0.; for i = 0:3 { C = ones(2, 2)\'; C[0, 0] += i * 1.; r += C[0, 0] + C[1, 1]; } '
+                              'return r;')
+        self.assertSameResult('A = ones(2, 2); for i = 0:2 { B = A\'; B[i, 0] = 3.; } return A;')
+
+    def test_results(self):
+        self.assertSameResult('n = 5; s = 0; for i = 0:n { s += n * n + i; s -= n * n; } return s;')
+        self.assertSameResult('n = 4; A = zeros(n); for i = 0:n { A[i] = i * 1. / n * 2.; A[i] += 1. / n * 2.; } '
+                              'return A;')
+        self.assertSameResult('k = 0; n = 3; while (k < n * 3) { k += n - 1; if (k > 4) break; } return k;')
+        self.assertSameResult('n = 2; M = ones(n, n); s = 0.; for i = 0:n { for j = 0:n { s += sum(M * M) + i + j; } } '
+                              'return s;')
+        self.assertSameResult('a = 1; b = 2; c = a + b * a + b; a = a + b; return c + a + b * a + b;')
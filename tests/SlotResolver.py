@@ -0,0 +1,50 @@
+import unittest
+from typing import List, Tuple
+
+from compiler.interpreter import SlotResolver
+from compiler.parser import MParser, AST
+from compiler.scanner import MLexer
+
+
+class TestSlotResolver(unittest.TestCase):
+
+    def resolve(self, program: str) -> Tuple[AST.ProgramStatement, List[str]]:
+        root = MParser().parse(program, lexer=MLexer(), tracking=True)
+        resolver = SlotResolver()
+        resolver.resolve(root)
+        return root, resolver.names
+
+    def test_declarations(self):
+        root, names = self.resolve('a = 1; b = a; a += b;')
+        s1, s2, s3 = root.statements
+
+        self.assertEqual(names, ['a', 'b'])
+        self.assertEqual([s1.variable.slot, s2.expression.slot, s3.variable.slot], [0, 0, 0])
+        self.assertEqual([s2.variable.slot, s3.expression.slot], [1, 1])
+
+    def test_scopes(self):
+        root, names = self.resolve('x = 0; for i = 0:2 { y = i; x = y; } if (true) y = 1; else y = 2; y = 3;')
+        _, loop, branch, last = root.statements
+        body = loop.statement.statements
+
+        # variables of every scope get their own slots, assignment to existing variable reuses its slot
+        self.assertEqual(names, ['x', 'i', 'y', 'y', 'y', 'y'])
+        self.assertEqual([loop.identifier.slot, body[0].variable.slot, body[1].variable.slot], [1, 2, 0])
+        self.assertEqual([branch.statement_then.variable.slot, branch.statement_else.variable.slot], [3, 4])
+        self.assertEqual(last.variable.slot, 5)
+
+    def test_undefined(self):
+        root, names = self.resolve('for i = 0:2 { } return i + i;')
+        loop, ret = root.statements
+
+        # variable of loop is gone after it, reads are resolved to slot that is never written
+        self.assertEqual(names, ['i', 'i'])
+        self.assertEqual(loop.identifier.slot, 0)
+        self.assertEqual([e.slot for e in ret.arguments[0].expressions], [1, 1])
+
+    def test_loop_variable_updates_existing(self):
+        root, names = self.resolve('i = 7; for i = 0:2 { } return i;')
+
+        self.assertEqual(names, ['i'])
+        self.assertEqual(root.statements[1].identifier.slot, 0)
+        self.assertEqual(root.statements[2].arguments[0].slot, 0)
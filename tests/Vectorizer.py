@@ -0,0 +1,90 @@
+from typing import List, Tuple
+
+from compiler.interpreter import Vectorizer
+from compiler.parser import AST
+
+from passes import PassTestCase
+
+
+class TestVectorizer(PassTestCase):
+
+    def transform(self, root: AST.Node) -> AST.Node:
+        vectorizer = Vectorizer()
+        root = vectorizer.vectorize(root)
+        self.report = vectorizer.report
+        return root
+
+    def vectorize(self, program: str) -> Tuple[AST.Node, List[Tuple[int, str]]]:
+        return self.parse(program, True), self.report
+
+    def assertSameResult(self, program: str):
+        """ Program with all loops vectorized returns the same result on every engine """
+        _, report = self.vectorize(program)
+        self.assertTrue(all('not' not in r for _, r in report), report)
+        super().assertSameResult(program)
+
+    def test_map(self):
+        self.assertSameResult('A = [1, 2, 3, 4]; B = [.5, 1., 2., 4.]; C = zeros(4); k = 2;'
+                              'for i = 0:4 { C[i] = A[i] .+ B[i] * k; } return C;')
+        self.assertSameResult('A = [1, 2, 3, 4]; for i = 1:3 { A[i] += i * 10; } return A;')
+        self.assertSameResult('A = [1., 2., 3.]; B = zeros(3); for i = 0:3 { B[i] = A[i] * 2; A[i] = B[i] - 1; } return A;')
+        self.assertSameResult('A = [1, 2, 3]; for i = 0:3 { A[i] = i; } return i;')
+
+    def test_masked_map(self):
+        self.assertSameResult('A = [1, -2, 3, -4]; for i = 0:4 { if (A[i] < 0) A[i] = 0; } return A;')
+        self.assertSameResult('A = [1., -2., 3., -4.]; B = [0., 1., 0., 2.]; for i = 0:4 { if (B[i] > 0.) A[i] /= B[i]; } return A;')
+        self.assertSameResult('A = [1, 2, 3, 4]; B = zeros(4); for i = 0:4 { if (A[i] > 1) { B[i] = A[i] * 2.; } } return B;')
+
+    def test_reductions(self):
+        self.assertSameResult('A = [1, 2, 3, 4]; s = 0; for i = 0:4 s += A[i] * 2; return s;')
+        self.assertSameResult('A = [.1, .2, .3, .4]; s = 0.; for i = 0:4 s -= A[i]; return s;')
+        self.assertSameResult('s = 0; for i = 0:10 s += i; return s;')
+        self.assertSameResult('A = [1, 5, 3, 8]; c = 0; for i = 0:4 { if (A[i] > 2) c += 1; } return c;')
+        self.assertSameResult('A = [1, 5, 3, 8]; s = 0; for i = 0:4 { if (A[i] > 2) s += A[i]; } return s;')
+        self.assertSameResult('A = [3, 5, 1, 8]; m = 0; n = 9; for i = 0:4 { if (A[i] > m) m = A[i]; '
+                              'if (n >= A[i]) n = A[i]; } return [m, n];')
+
+    def test_float_count(self):
+        # constant added to float is summed in order, multiplying it by count would round differently
+        self.assertSameResult('A = ones(10); s = 0.; for i = 0:10 { if (A[i] > 0) s += 0.1; } return s;')
+        self.assertSameResult('A = ones(10); s = 0.1; for i = 0:10 { if (A[i] > 0) s -= 1; } return s;')
+
+        _, report = self.vectorize('A = ones(10); s = 0.; for i = 0:10 { if (A[i] > 0) s += 0.1; }')
+        self.assertEqual(report, [(1, 'loop over i vectorized (masked_sum)')])
+
+    def test_empty_and_fallback(self):
+        self.assertSameResult('A = [1, 2]; s = 0; for i = 5:2 s += A[i]; return s;')
+        self.assertSameResult('i = 7; A = [1, 2]; s = 0; for i = 3:3 s += A[i]; return i;')
+
+        # negative indices wrap around, loop is executed iteration by iteration
+        self.assertSameResult('A = [1, 2, 3]; s = 0; for i = -2:2 s += A[i]; return s;')
+
+        # arrays sharing memory are written in the loop
+        self.assertSameResult('A = [1, 2, 3]; B = A; for i = 0:3 { B[i] = A[i] + 1; } return A;')
+
+    def test_not_vectorized(self):
+        for program, reason in [
+            ('A = [1, 2, 3]; for i = 1:3 { A[i] = A[i - 1]; }',                 'not indexed by loop variable'),
+            ('s = 0; for i = 0:3 { s += i; s += 1; }',                          'more than one statement'),
+            ('s = 0; t = 0; for i = 0:3 { s += i; t += s; }',                   'reduced and read'),
+            ('s = 0; for i = 0:3 { s = i; }',                                   'carried between iterations'),
+            ('s = 1; for i = 0:3 { s *= 2; }',                                  'not a sum reduction'),
+            ('for i = 0:3 { print i; }',                                        'print instruction'),
+            ('for i = 0:3 { if (i > 1) break; }',                               'not a reduction'),
+            ('A = eye(3, 3); for i = 0:3 { A[i, i] = 2.; }',                    'not indexed by loop variable'),
+            ('s = ""; for i = 0:3 { s += "a"; }',                               'not numeric'),
+        ]:
+            with self.subTest(program=program):
+                _, report = self.vectorize(program)
+                self.assertIn(reason, report[0][1])
+
+    def test_report(self):
+        root, report = self.vectorize('A = [0, 0, 0, 0];\nfor i = 0:4 {\n for j = 0:4\n  A[j] = j; }\nreturn A;')
+
+        # outer loop stays, inner loop is vectorized
+        self.assertEqual(report, [
+            (2, 'loop over i not vectorized: nested for loop at line 3 cannot be vectorized'),
+            (3, 'loop over j vectorized (map)'),
+        ])
+        self.assertIsInstance(root.statements[1], AST.ForStatement)
+        self.assertIsInstance(root.statements[1].statement.statements[0], AST.VectorizedForStatement)
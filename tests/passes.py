@@ -0,0 +1,34 @@
+import unittest
+
+import numpy as np
+
+from compiler.interpreter import Interpreter
+from compiler.parser import MParser, AST
+from compiler.scanner import MLexer
+from compiler.types import TypeChecker
+
+
+class PassTestCase(unittest.TestCase):
+    """ Base of tests of optimization passes, subclasses apply their pass to checked program in 'transform' """
+
+    def transform(self, root: AST.Node) -> AST.Node:
+        raise NotImplementedError
+
+    def parse(self, program: str, optimize: bool) -> AST.Node:
+        root = MParser().parse(program, lexer=MLexer(), tracking=True)
+        TypeChecker().check(root)
+        return self.transform(root) if optimize else root
+
+    def assertResultEqual(self, result, expected):
+        np.testing.assert_equal(result, expected)
+        self.assertEqual(type(result), type(expected))
+        if isinstance(expected, np.ndarray):
+            self.assertEqual(result.dtype, expected.dtype)
+
+    def assertSameResult(self, program: str):
+        """ Program returns the same result with and without the pass on every engine """
+        expected = Interpreter().execute_with_return(self.parse(program, False))
+
+        for engine in Interpreter.ENGINES:
+            result = Interpreter(engine).execute_with_return(self.parse(program, True))
+            self.assertResultEqual(result, expected)
@@ -0,0 +1,70 @@
+import io
+import os
+import tempfile
+import unittest
+
+from compiler.utils import map_source, source_size
+
+
+class TestSource(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, data: bytes) -> str:
+        path = os.path.join(self.tmp.name, 'program.m')
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def test_file(self):
+        path = self.write(b'a = 1;\nprint a;\n')
+        with open(path) as file:
+            with map_source(file) as mapping:
+                self.assertEqual(mapping[:], b'a = 1;\nprint a;\n')
+                self.assertEqual(source_size(file, mapping), (16, 'bytes'))
+
+            # file read as text has size of the file as well
+            self.assertEqual(source_size(file, file.read()), (16, 'bytes'))
+
+    def test_crlf(self):
+        path = self.write(b'a = 1;\r\nprint a;\r\n')
+
+        # mapping keeps newlines which text mode translates
+        with open(path) as file:
+            with map_source(file) as mapping:
+                self.assertEqual(mapping[:], b'a = 1;\r\nprint a;\r\n')
+                self.assertEqual(source_size(file, mapping), (18, 'bytes'))
+
+            text = file.read()
+            self.assertEqual(text, 'a = 1;\nprint a;\n')
+            self.assertEqual(source_size(file, text), (18, 'bytes'))
+
+    def test_stdin(self):
+        # pipe cannot be mapped and has no size, characters are counted instead
+        read, write = os.pipe()
+        os.write(write, b'a = 1;\r\nprint a;\r\n')
+        os.close(write)
+
+        with open(read) as file:
+            self.assertIsNone(map_source(file))
+            text = file.read()
+            self.assertEqual(text, 'a = 1;\nprint a;\n')
+            self.assertEqual(source_size(file, text), (16, 'chars'))
+
+        # stream without file descriptor
+        stream = io.TextIOWrapper(io.BytesIO(b'print 1;\r\n'))
+        self.assertIsNone(map_source(stream))
+        self.assertEqual(source_size(stream, stream.read()), (9, 'chars'))
+
+    def test_not_mapped(self):
+        # empty file cannot be mapped, other encodings than UTF-8 are decoded when read
+        with open(self.write(b'')) as file:
+            self.assertIsNone(map_source(file))
+            self.assertEqual(source_size(file, file.read()), (0, 'bytes'))
+
+        with open(self.write(b's = "\xe9";'), encoding='latin-1') as file:
+            self.assertIsNone(map_source(file))